@@ -0,0 +1,15 @@
+from core.security import is_admin
+from fastapi import Header, HTTPException
+from starlette.status import HTTP_403_FORBIDDEN
+
+
+def require_admin(x_admin_token: str = Header(None)) -> None:
+    """
+    Dependency restricting an endpoint to staff holding ADMIN_API_TOKEN.
+
+    Raises:
+        HTTPException: If the X-Admin-Token header is missing or wrong
+        (status code 403).
+    """
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Admin access denied.")
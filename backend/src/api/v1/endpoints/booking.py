@@ -0,0 +1,44 @@
+from uuid import UUID
+
+
+from crud.booking import BookingRepository
+from database.routing import get_read_db
+from database.session import get_db
+from fastapi import APIRouter, Depends, Header
+from schemas.booking import BookingResponse, CheckoutRequest
+from sqlalchemy.orm import Session
+from utils.profiling import route_class
+
+router = APIRouter(route_class=route_class)
+
+
+@router.post("/checkout", response_model=BookingResponse, status_code=202)
+def checkout(
+    request: CheckoutRequest,
+    idempotency_key: str = Header(..., alias="Idempotency-Key", min_length=8),
+    db: Session = Depends(get_db),
+):
+    """
+    Create a pending booking; the payment is charged in the background.
+
+    - **request**: Car, track date, laps and package.
+    - **Idempotency-Key**: Header identifying this checkout. Retries with the
+      same key return the original booking and never charge twice.
+
+    Returns:
+        BookingResponse: The pending booking.
+    """
+    booking_repo = BookingRepository(db_session=db)
+    return booking_repo.checkout(request=request, idempotency_key=idempotency_key)
+
+
+@router.get("/{booking_id}", response_model=BookingResponse, status_code=200)
+def get_booking(booking_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Retrieve a booking by its ID, e.g. to poll for payment confirmation.
+
+    Returns:
+        BookingResponse: The booking object.
+    """
+    booking_repo = BookingRepository(db_session=db)
+    return booking_repo.get(booking_id=booking_id)
@@ -1,19 +1,21 @@
-from typing import List
+from typing import Annotated, List
 from uuid import UUID
 
 
 from crud.cars import CarRepository
+from database.routing import get_read_db
 from database.session import get_db
-from fastapi import APIRouter, Depends
-from models.car import Car
+from fastapi import APIRouter, Depends, Query
 from schemas.car import (
     CarCreate,
     CarResponse,
+    CarSearch,
     CarUpdate,
 )
 from sqlalchemy.orm import Session
+from utils.profiling import route_class
 
-router = APIRouter()
+router = APIRouter(route_class=route_class)
 
 
 @router.post("/", response_model=CarResponse, status_code=200)
@@ -27,8 +29,24 @@ def create_car(car: CarCreate, db: Session = Depends(get_db)):
     return car_repo.create(entity=car)
 
 
+@router.get("/search", response_model=List[CarResponse], status_code=200)
+def search_cars(
+    search: Annotated[CarSearch, Query()], db: Session = Depends(get_read_db)
+):
+    """
+    Filter, sort and rank cars by their specs for the car picker.
+
+    - **min_<spec>/max_<spec>**: Inclusive ranges for hp, nm, acceleration,
+      weight, price_for_lap and power_to_weight (hp per tonne)
+    - **drive/gearbox/rollcage_type**: Allowed values, repeat for several
+    - **sort_by/descending/limit**: Order and top-k size
+    """
+    car_repo = CarRepository(db_session=db)
+    return car_repo.search(search=search)
+
+
 @router.get("/{car_id}", response_model=CarResponse, status_code=200)
-def _get_car_by_id(car_id: UUID, db: Session = Depends(get_db)):
+def _get_car_by_id(car_id: UUID, db: Session = Depends(get_read_db)):
     """
     Retrieve a car by its unique ID.
 
@@ -36,21 +54,19 @@ def _get_car_by_id(car_id: UUID, db: Session = Depends(get_db)):
         CarResponse: The car object.
     """
     car_repo = CarRepository(db_session=db)
-    return car_repo.get_car_by_id(entity_id=car_id)
+    return car_repo.get(entity_id=car_id)
 
 
 @router.get("/", response_model=List[CarResponse], status_code=200)
-def get_all_cars(db: Session = Depends(get_db)):
+def get_all_cars(db: Session = Depends(get_read_db)):
     """
     Retrieve all cars stored in the database.
 
     Returns:
         List[CarResponse]: A list of CarResponse objects.
     """
-    _car_repo = CarRepository(db_session=db)
-    db_cars = db.query(Car).all()
-
-    return [CarResponse.model_validate(car) for car in db_cars]
+    car_repo = CarRepository(db_session=db)
+    return car_repo.get_all()
 
 
 @router.patch("/{car_id}", response_model=CarResponse, status_code=200)
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+from utils.events import TooManyClientsError, broadcaster
+from utils.profiling import route_class
+
+router = APIRouter(route_class=route_class)
+
+
+@router.get("/", status_code=200)
+async def stream_changes(last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of calendar and availability changes.
+
+    - **calendar**: The upcoming track events changed; refetch `/events`.
+    - **availability**: Maintenance windows, cars or bookings changed.
+    - **resync**: Changes were missed; refetch everything.
+
+    EventSource reconnects with the `Last-Event-ID` header and gets the
+    events it missed. A comment line is sent as heartbeat while idle.
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = 0  # Unknown ID: the client gets a resync event.
+
+    try:
+        stream = broadcaster.subscribe(resume_from)
+    except TooManyClientsError as e:
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams.",
+            headers={"Retry-After": "5"},
+        ) from e
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream, media_type="text/event-stream", headers=headers)
@@ -0,0 +1,75 @@
+from datetime import date
+from typing import Optional
+
+
+from api.deps import require_admin
+from crud.dashboard import DashboardRepository
+from database.routing import get_read_db
+from fastapi import APIRouter, Depends
+from schemas.dashboard import (
+    RevenueResponse,
+    UtilisationResponse,
+    VoucherLiabilityResponse,
+)
+from sqlalchemy.orm import Session
+from utils.profiling import route_class
+
+router = APIRouter(route_class=route_class)
+
+
+@router.get(
+    "/revenue",
+    response_model=RevenueResponse,
+    status_code=200,
+    dependencies=[Depends(require_admin)],
+)
+def get_revenue(
+    start: date, end: date, group_by: str = "day", db: Session = Depends(get_read_db)
+):
+    """
+    Revenue between two track days, grouped by day, car or package.
+    Staff only: needs the X-Admin-Token header.
+
+    Returns:
+        RevenueResponse: Bookings, laps and revenue per group.
+    """
+    dashboard_repo = DashboardRepository(db_session=db)
+    return dashboard_repo.get_revenue(start=start, end=end, group_by=group_by)
+
+
+@router.get(
+    "/vouchers",
+    response_model=VoucherLiabilityResponse,
+    status_code=200,
+    dependencies=[Depends(require_admin)],
+)
+def get_voucher_liability(
+    as_of: Optional[date] = None, db: Session = Depends(get_read_db)
+):
+    """
+    Voucher amounts issued, redeemed and expired, and the outstanding liability.
+    Staff only: needs the X-Admin-Token header.
+
+    Returns:
+        VoucherLiabilityResponse: Voucher totals up to `as_of`, or up to now if omitted.
+    """
+    dashboard_repo = DashboardRepository(db_session=db)
+    return dashboard_repo.get_voucher_liability(as_of=as_of)
+
+
+@router.get(
+    "/utilisation",
+    response_model=UtilisationResponse,
+    status_code=200,
+    dependencies=[Depends(require_admin)],
+)
+def get_utilisation(start: date, end: date, db: Session = Depends(get_read_db)):
+    """
+    Share of the fleet booked on each day between two dates, at most
+    DASHBOARD_MAX_RANGE_DAYS apart. Staff only: needs the X-Admin-Token header.
+
+    Returns:
+        UtilisationResponse: Booked cars and utilisation per day.
+    """
+    dashboard_repo = DashboardRepository(db_session=db)
+    return dashboard_repo.get_utilisation(start=start, end=end)
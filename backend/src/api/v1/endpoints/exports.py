@@ -0,0 +1,48 @@
+from api.deps import require_admin
+from database.routing import read_engine
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+from utils.exports import (
+    EXPORT_FORMATS,
+    EXPORTABLE_TABLES,
+    ExportFormatUnavailableError,
+    iter_export,
+)
+from utils.profiling import route_class
+
+router = APIRouter(route_class=route_class)
+
+
+@router.get("/{table}", status_code=200, dependencies=[Depends(require_admin)])
+def export_table(table: str, format: str = "csv", gzip: bool = False):
+    """
+    Stream a whole table for accounting. Staff only: needs the X-Admin-Token
+    header.
+
+    - **table**: users, vouchers or bookings.
+    - **format**: csv, ndjson or parquet.
+    - **gzip**: Compress the stream on the fly.
+
+    Rows are read from a server-side cursor and written out batch by batch,
+    so memory use does not grow with the table size.
+    """
+    if table not in EXPORTABLE_TABLES:
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND, detail=f"Table {table} cannot be exported."
+        )
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}.",
+        )
+
+    try:
+        chunks = iter_export(read_engine(), table, format, gzip=gzip)
+    except ExportFormatUnavailableError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    filename = f"{table}.{format}" + (".gz" if gzip else "")
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    media_type = "application/gzip" if gzip else EXPORT_FORMATS[format]
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Annotated, List
+from uuid import UUID
+
+
+from crud.maintenance import MaintenanceRepository
+from database.routing import get_read_db
+from database.session import get_db
+from fastapi import APIRouter, Depends, Path
+from schemas.maintenance import (
+    FleetAvailabilityResponse,
+    MaintenanceCreate,
+    MaintenanceResponse,
+    MonthAvailabilityResponse,
+)
+from sqlalchemy.orm import Session
+from utils.profiling import route_class
+
+router = APIRouter(route_class=route_class)
+
+
+@router.post("/maintenance", response_model=MaintenanceResponse, status_code=200)
+def add_maintenance_window(window: MaintenanceCreate, db: Session = Depends(get_db)):
+    """
+    Mark a car as unavailable for a time range.
+
+    - **window**: Car ID, start, end and optional reason.
+    """
+    maintenance_repo = MaintenanceRepository(db_session=db)
+    return maintenance_repo.add(window=window)
+
+
+@router.get(
+    "/maintenance/car/{car_id}",
+    response_model=List[MaintenanceResponse],
+    status_code=200,
+)
+def get_car_maintenance_windows(car_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Retrieve all maintenance windows of a car, ordered by start.
+    """
+    maintenance_repo = MaintenanceRepository(db_session=db)
+    return maintenance_repo.get_for_car(car_id=car_id)
+
+
+@router.delete("/maintenance/{window_id}", status_code=200)
+def delete_maintenance_window(window_id: UUID, db: Session = Depends(get_db)):
+    """
+    Delete a maintenance window.
+    """
+    maintenance_repo = MaintenanceRepository(db_session=db)
+    return maintenance_repo.delete(window_id=window_id)
+
+
+@router.get("/available", response_model=FleetAvailabilityResponse, status_code=200)
+def get_available_cars(
+    starts_at: datetime, ends_at: datetime, db: Session = Depends(get_read_db)
+):
+    """
+    Retrieve the cars that are free for the whole period.
+
+    Returns:
+        FleetAvailabilityResponse: IDs of the available cars.
+    """
+    maintenance_repo = MaintenanceRepository(db_session=db)
+    return maintenance_repo.get_available_cars(starts_at=starts_at, ends_at=ends_at)
+
+
+@router.get(
+    "/availability/{year}/{month}",
+    response_model=MonthAvailabilityResponse,
+    status_code=200,
+)
+def get_month_availability(
+    year: Annotated[int, Path(ge=2000, le=2100)],
+    month: int,
+    db: Session = Depends(get_read_db),
+):
+    """
+    Retrieve the free cars for every day of a month, for the booking page.
+
+    - **year**: 2000-2100; other years are rejected with status code 422.
+
+    Returns:
+        MonthAvailabilityResponse: Free car IDs per day.
+    """
+    maintenance_repo = MaintenanceRepository(db_session=db)
+    return maintenance_repo.get_month_availability(year=year, month=month)
@@ -1,25 +1,39 @@
+from datetime import date, datetime, timedelta
 from typing import List
 from uuid import UUID
 
 
+from api.deps import require_admin
+from core.config import HOTEL_AVAILABILITY_MAX_DAYS_AHEAD
 from crud.hotels import HotelRepository
+from crud.maintenance import TRACK_TZ
+from database.routing import get_read_db
 from database.session import get_db
-from fastapi import APIRouter, Depends
-from models.hotel import Hotel
+from fastapi import APIRouter, Depends, HTTPException, Query
 from schemas.hotel import (
     AddHotel,
+    HotelAvailabilityResponse,
     HotelResponse,
     UpdateHotel,
 )
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.status import HTTP_400_BAD_REQUEST
+from utils.hotel_availability import hotel_availability
+from utils.profiling import route_class
 
-router = APIRouter()
+router = APIRouter(route_class=route_class)
 
 
-@router.post("/", response_model=HotelResponse, status_code=200)
+@router.post(
+    "/",
+    response_model=HotelResponse,
+    status_code=200,
+    dependencies=[Depends(require_admin)],
+)
 def add_hotel(hotel: AddHotel, db: Session = Depends(get_db)):
     """
-    Create a new hotel.
+    Create a new hotel. Staff only: needs the X-Admin-Token header.
 
     - **hotel**: Hotel data to be created.
 
@@ -34,8 +48,37 @@ def add_hotel(hotel: AddHotel, db: Session = Depends(get_db)):
     return hotel_repo.add(hotel=hotel)
 
 
+@router.get("/availability", response_model=HotelAvailabilityResponse, status_code=200)
+async def get_hotel_availability(
+    track_date: date = Query(alias="date"), db: Session = Depends(get_read_db)
+):
+    """
+    Rooms and prices of all partner hotels for a track date.
+
+    Every partner is asked at the same time, so the search takes as long as
+    the slowest one, at most a few seconds. Partners that do not answer in
+    time are listed with status "timeout" and `complete` is false.
+
+    - **date**: Track date, from today up to a year ahead.
+
+    Returns:
+        HotelAvailabilityResponse: Availability per hotel.
+    """
+    today = datetime.now(TRACK_TZ).date()
+    last_day = today + timedelta(days=HOTEL_AVAILABILITY_MAX_DAYS_AHEAD)
+    if not today <= track_date <= last_day:
+        raise HTTPException(
+            status_code=HTTP_400_BAD_REQUEST,
+            detail=f"date must be between {today} and {last_day}.",
+        )
+
+    hotel_repo = HotelRepository(db_session=db)
+    hotels = await run_in_threadpool(hotel_repo.get_all)
+    return await hotel_availability.search(hotels, track_date)
+
+
 @router.get("/{hotel_id}", response_model=HotelResponse, status_code=200)
-def get_hotel_by_id(hotel_id: UUID, db: Session = Depends(get_db)):
+def get_hotel_by_id(hotel_id: UUID, db: Session = Depends(get_read_db)):
     """
     Get a hotel by its ID.
 
@@ -50,11 +93,11 @@ def get_hotel_by_id(hotel_id: UUID, db: Session = Depends(get_db)):
         HTTPException: If the hotel with the given ID is not found.
     """
     hotel_repo = HotelRepository(db_session=db)
-    return hotel_repo.get_hotel_by_id(hotel_id=hotel_id)
+    return hotel_repo.get(hotel_id=hotel_id)
 
 
 @router.get("/", response_model=List[HotelResponse], status_code=200)
-def get_all_hotels(db: Session = Depends(get_db)):
+def get_all_hotels(db: Session = Depends(get_read_db)):
     """
     Get a list of all hotels in the database.
 
@@ -64,16 +107,19 @@ def get_all_hotels(db: Session = Depends(get_db)):
     Returns:
         List[HotelResponse]: A list of all hotels in the database.
     """
-    _hotel_repo = HotelRepository(db_session=db)
-    db_hotels = db.query(Hotel).all()
-
-    return [HotelResponse.model_validate(hotel) for hotel in db_hotels]
+    hotel_repo = HotelRepository(db_session=db)
+    return hotel_repo.get_all()
 
 
-@router.patch("/{hotel_id}", response_model=HotelResponse, status_code=200)
+@router.patch(
+    "/{hotel_id}",
+    response_model=HotelResponse,
+    status_code=200,
+    dependencies=[Depends(require_admin)],
+)
 def update_hotel(hotel_id: UUID, hotel: UpdateHotel, db: Session = Depends(get_db)):
     """
-    Update a hotel by its ID.
+    Update a hotel by its ID. Staff only: needs the X-Admin-Token header.
 
     - **hotel_id**: ID of the hotel to be updated.
     - **hotel**: Updated data for the hotel.
@@ -93,10 +139,10 @@ def update_hotel(hotel_id: UUID, hotel: UpdateHotel, db: Session = Depends(get_d
     return hotel_repo.update(hotel_id=hotel_id, hotel=hotel)
 
 
-@router.delete("/{hotel_id}", status_code=200)
+@router.delete("/{hotel_id}", status_code=200, dependencies=[Depends(require_admin)])
 def delete_hotel(hotel_id: UUID, db: Session = Depends(get_db)):
     """
-    Delete a hotel by its ID.
+    Delete a hotel by its ID. Staff only: needs the X-Admin-Token header.
 
     - **hotel_id**: ID of the hotel to be deleted.
 
@@ -0,0 +1,38 @@
+from typing import List
+from uuid import UUID
+
+
+from crud.payments import PaymentRepository
+from database.routing import get_read_db
+from fastapi import APIRouter, Depends
+from schemas.payments import PaymentResponse
+from sqlalchemy.orm import Session
+from utils.profiling import route_class
+
+router = APIRouter(route_class=route_class)
+
+
+@router.get("/{payment_id}", response_model=PaymentResponse, status_code=200)
+def get_payment(payment_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Retrieve a payment by its ID.
+
+    Returns:
+        PaymentResponse: The payment object.
+    """
+    payment_repo = PaymentRepository(db_session=db)
+    return payment_repo.get(payment_id=payment_id)
+
+
+@router.get(
+    "/booking/{booking_id}", response_model=List[PaymentResponse], status_code=200
+)
+def get_booking_payments(booking_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Retrieve all payments of a booking.
+
+    Returns:
+        List[PaymentResponse]: The booking's payments, oldest first.
+    """
+    payment_repo = PaymentRepository(db_session=db)
+    return payment_repo.get_for_booking(booking_id=booking_id)
@@ -0,0 +1,62 @@
+from typing import List, Optional
+from uuid import UUID
+
+
+from api.deps import require_admin
+from crud.users import UserRepository
+from database.routing import get_read_db
+from fastapi import APIRouter, Depends, HTTPException
+from schemas.user import UserResponse
+from sqlalchemy.orm import Session
+from starlette.status import HTTP_400_BAD_REQUEST
+from utils.profiling import route_class
+
+router = APIRouter(route_class=route_class)
+
+
+@router.get(
+    "/lookup",
+    response_model=List[UserResponse],
+    status_code=200,
+    dependencies=[Depends(require_admin)],
+)
+def lookup_users(
+    email: Optional[str] = None,
+    phone_number: Optional[str] = None,
+    country_code: str = "+359",
+    db: Session = Depends(get_read_db),
+):
+    """
+    Find customers by email (any letter case) or phone number (any notation).
+    Staff only: needs the X-Admin-Token header.
+
+    - **email**: Email address
+    - **phone_number**: National or international number
+    - **country_code**: Country code of a national number
+    """
+    user_repo = UserRepository(db_session=db)
+    if email:
+        db_user = user_repo.find_by_email(email)
+        return [db_user] if db_user else []
+    if phone_number:
+        return user_repo.find_by_phone(phone_number, country_code)
+    raise HTTPException(
+        status_code=HTTP_400_BAD_REQUEST, detail="Pass an email or a phone_number."
+    )
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserResponse,
+    status_code=200,
+    dependencies=[Depends(require_admin)],
+)
+def get_user(user_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Retrieve a customer by ID. Staff only: needs the X-Admin-Token header.
+
+    Returns:
+        UserResponse: The user object.
+    """
+    user_repo = UserRepository(db_session=db)
+    return user_repo.get_user_by_id(user_id)
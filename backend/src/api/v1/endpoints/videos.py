@@ -0,0 +1,118 @@
+from uuid import UUID
+
+
+from crud.videos import VideoRepository
+from database.routing import get_read_db
+from database.session import get_db
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request
+from schemas.video import (
+    UploadedPart,
+    UploadProgressResponse,
+    VideoLinksResponse,
+    VideoResponse,
+    VideoUploadCreate,
+)
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.status import HTTP_400_BAD_REQUEST
+from utils.profiling import route_class
+from utils.storage import MAX_PARTS, spool_stream
+
+router = APIRouter(route_class=route_class)
+
+
+@router.post("/", response_model=VideoResponse, status_code=201)
+def start_video_upload(video: VideoUploadCreate, db: Session = Depends(get_db)):
+    """
+    Start a resumable upload of a booking's lap video.
+
+    Returns the part layout: send `part_count` parts of `part_size` bytes
+    (the last one shorter) to `PUT /videos/{id}/parts/{n}`.
+    """
+    video_repo = VideoRepository(db_session=db)
+    return video_repo.start_upload(video=video)
+
+
+@router.put(
+    "/{video_id}/parts/{part_number}", response_model=UploadedPart, status_code=200
+)
+async def upload_video_part(
+    request: Request,
+    video_id: UUID,
+    part_number: int = Path(ge=1, le=MAX_PARTS),
+    content_length: int = Header(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload one part of a video as the raw request body.
+
+    The body is streamed into a temporary file that keeps at most a few
+    MiB in memory, then sent to S3; a whole part is never held in memory.
+    Parts may be sent in parallel and retried.
+    """
+    video_repo = VideoRepository(db_session=db)
+    db_video = await run_in_threadpool(
+        video_repo.check_part, video_id, part_number, content_length
+    )
+    # Give the connection back to the pool while the body streams in.
+    await run_in_threadpool(db.close)
+
+    body, size, md5 = await spool_stream(request.stream())
+    try:
+        if size != content_length:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"Expected {content_length} bytes, received {size}.",
+            )
+        return await run_in_threadpool(
+            video_repo.upload_part, db_video, part_number, body, size, md5
+        )
+    finally:
+        body.close()
+
+
+@router.get("/{video_id}/parts", response_model=UploadProgressResponse, status_code=200)
+def get_video_upload_progress(video_id: UUID, db: Session = Depends(get_db)):
+    """
+    List the parts received so far, to resume an interrupted upload.
+    """
+    video_repo = VideoRepository(db_session=db)
+    return video_repo.get_progress(video_id=video_id)
+
+
+@router.post("/{video_id}/complete", response_model=VideoResponse, status_code=200)
+def complete_video_upload(video_id: UUID, db: Session = Depends(get_db)):
+    """
+    Assemble the uploaded parts and queue transcoding and the thumbnail.
+    """
+    video_repo = VideoRepository(db_session=db)
+    return video_repo.complete_upload(video_id=video_id)
+
+
+@router.delete("/{video_id}", status_code=200)
+def abort_video_upload(video_id: UUID, db: Session = Depends(get_db)):
+    """
+    Cancel an unfinished upload and discard its parts.
+    """
+    video_repo = VideoRepository(db_session=db)
+    return video_repo.abort_upload(video_id=video_id)
+
+
+@router.get("/{video_id}", response_model=VideoResponse, status_code=200)
+def get_video(video_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Retrieve a video and its processing status.
+    """
+    video_repo = VideoRepository(db_session=db)
+    return video_repo.get(video_id=video_id)
+
+
+@router.get("/{video_id}/links", response_model=VideoLinksResponse, status_code=200)
+def get_video_links(video_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Presigned download links for the original, the transcoded video and
+    the thumbnail. They accept range requests, so players can seek and
+    interrupted downloads can resume.
+    """
+    video_repo = VideoRepository(db_session=db)
+    return video_repo.get_links(video_id=video_id)
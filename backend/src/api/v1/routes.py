@@ -1,10 +1,26 @@
 from fastapi import APIRouter
 from api.v1.endpoints import (
+    booking,
     cars,
+    changes,
+    dashboard,
+    exports,
+    fleet,
     hotels,
+    payments,
+    users,
+    videos,
 )
 
 api_router = APIRouter()
 
 api_router.include_router(cars.router, prefix="/cars", tags=["cars"])
-api_router.include_router(hotels.router, prefix="/hotels", tags=["hotels"])
\ No newline at end of file
+api_router.include_router(hotels.router, prefix="/hotels", tags=["hotels"])
+api_router.include_router(fleet.router, prefix="/fleet", tags=["fleet"])
+api_router.include_router(booking.router, prefix="/booking", tags=["booking"])
+api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
+api_router.include_router(changes.router, prefix="/changes", tags=["changes"])
+api_router.include_router(videos.router, prefix="/videos", tags=["videos"])
+api_router.include_router(users.router, prefix="/users", tags=["users"])
@@ -9,3 +9,183 @@ DB_PASSWORD = quote_plus(os.getenv("DB_PASSWORD", ""))
 
 if not DB_URL:
     DB_URL = f"postgresql://{os.getenv('DB_USER')}:{DB_PASSWORD}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}?sslmode=require"
+
+# Cross-worker cache invalidation ("postgres" uses LISTEN/NOTIFY, "memory" stays in-process)
+CACHE_TRANSPORT = os.getenv("CACHE_TRANSPORT", "postgres")
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "nurblife_cache")
+
+# Admission control for the Google Calendar backed routes (/events, /check-date)
+CALENDAR_CONCURRENCY_LIMIT = int(os.getenv("CALENDAR_CONCURRENCY_LIMIT", "4"))
+CALENDAR_QUEUE_LIMIT = int(os.getenv("CALENDAR_QUEUE_LIMIT", "16"))
+CALENDAR_QUEUE_TIMEOUT = float(os.getenv("CALENDAR_QUEUE_TIMEOUT", "2"))
+CALENDAR_RATE_LIMIT = float(os.getenv("CALENDAR_RATE_LIMIT", "20"))
+CALENDAR_RATE_BURST = int(os.getenv("CALENDAR_RATE_BURST", "40"))
+CALENDAR_BREAKER_FAILURES = int(os.getenv("CALENDAR_BREAKER_FAILURES", "5"))
+CALENDAR_BREAKER_RESET_SECONDS = float(os.getenv("CALENDAR_BREAKER_RESET_SECONDS", "30"))
+CALENDAR_SLOW_CALL_SECONDS = float(os.getenv("CALENDAR_SLOW_CALL_SECONDS", "5"))
+# Last good answers served while Google Calendar is down, per query
+CALENDAR_SNAPSHOT_TTL_SECONDS = int(os.getenv("CALENDAR_SNAPSHOT_TTL_SECONDS", "86400"))
+CALENDAR_SNAPSHOT_MAX_ENTRIES = int(os.getenv("CALENDAR_SNAPSHOT_MAX_ENTRIES", "1000"))
+
+# SQL statement caching. Server-side prepared statements need the psycopg (3)
+# driver, e.g. DATABASE_URL=postgresql+psycopg://...; psycopg2 ignores this.
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+DB_PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+
+# Read replicas for read-only endpoints: comma separated database URLs, picked
+# "round_robin" or by "least_connections". A replica lagging more than
+# DB_REPLICA_MAX_LAG_SECONDS is skipped; a client that wrote is pinned to the
+# primary for DB_READ_YOUR_WRITES_SECONDS.
+DB_REPLICA_URLS = [url for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url]
+DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+DB_REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", "2"))
+DB_READ_YOUR_WRITES_SECONDS = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "10"))
+
+# Payments and the transactional outbox dispatcher. There is no default
+# provider: checkout answers 503 until one is configured. The "fake" provider
+# accepts every charge, so it also needs ALLOW_FAKE_PAYMENTS=true and is
+# meant for development and tests only.
+PAYMENT_PROVIDER = os.getenv("PAYMENT_PROVIDER")
+ALLOW_FAKE_PAYMENTS = os.getenv("ALLOW_FAKE_PAYMENTS", "false").lower() == "true"
+PAYMENT_CURRENCY = os.getenv("PAYMENT_CURRENCY", "EUR")
+# Price of each package in euros, charged once per booking on top of the laps.
+PACKAGE_PRICES = {
+    "base_package": int(os.getenv("BASE_PACKAGE_PRICE", "0")),
+    "premium_package": int(os.getenv("PREMIUM_PACKAGE_PRICE", "0")),
+}
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "1"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+
+# Outgoing mail. For local development run aiosmtpd as the SMTP server:
+#   python -m aiosmtpd -n -l localhost:8025
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "8025"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+MAIL_FROM = os.getenv("MAIL_FROM", "bookings@nurblife.bg")
+NOTIFICATION_WORKERS = int(os.getenv("NOTIFICATION_WORKERS", "4"))
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+
+# Dashboard rollups
+ROLLUP_INTERVAL_SECONDS = int(os.getenv("ROLLUP_INTERVAL_SECONDS", "300"))
+# Each run re-reads the source changes of this many seconds before the
+# previous run, so transactions that commit late with an older timestamp are
+# still picked up. Must exceed the longest write transaction.
+ROLLUP_RECOMPUTE_WINDOW_SECONDS = int(
+    os.getenv("ROLLUP_RECOMPUTE_WINDOW_SECONDS", "3600")
+)
+# Longest start..end range a dashboard query may span; utilisation is
+# computed per day.
+DASHBOARD_MAX_RANGE_DAYS = int(os.getenv("DASHBOARD_MAX_RANGE_DAYS", "366"))
+
+# Staff-only endpoints (exports, customer lookup, dashboard) require the header
+# "X-Admin-Token: <ADMIN_API_TOKEN>"; without a token they are closed.
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+# Streaming exports: rows fetched from the server-side cursor per batch
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+# On-demand request profiling. A request is profiled when it carries
+# "X-Profile: <PROFILING_ADMIN_TOKEN>" or is picked by PROFILING_SAMPLE_RATE.
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN")
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL_SECONDS = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.002"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", "/tmp/nurblife-profiles")
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "200"))
+
+# Logging: JSON lines written by a background thread. Repeats of the same
+# message beyond LOG_RATE_LIMIT per LOG_RATE_WINDOW_SECONDS are dropped and
+# counted in the next message that gets through.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "10"))
+LOG_RATE_WINDOW_SECONDS = float(os.getenv("LOG_RATE_WINDOW_SECONDS", "10"))
+
+# Server-Sent Events: change notifications pushed to the frontend. The last
+# EVENTS_HISTORY_SIZE events are kept per worker to resume from Last-Event-ID.
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_HISTORY_SIZE = int(os.getenv("EVENTS_HISTORY_SIZE", "1000"))
+EVENTS_CLIENT_QUEUE_SIZE = int(os.getenv("EVENTS_CLIENT_QUEUE_SIZE", "100"))
+EVENTS_MAX_CLIENTS = int(os.getenv("EVENTS_MAX_CLIENTS", "10000"))
+# How often one of the workers re-reads the calendar to detect changes
+CALENDAR_SYNC_SECONDS = int(os.getenv("CALENDAR_SYNC_SECONDS", "60"))
+
+# Warm-up retries the database this often; the worker is not ready before.
+WARMUP_DB_RETRY_SECONDS = float(os.getenv("WARMUP_DB_RETRY_SECONDS", "2"))
+
+# Production server (server.py). WEB_CONCURRENCY defaults to the usable CPU
+# cores. Keep-alive should outlast the load balancer's idle timeout (60 s on
+# most) so it never reuses a connection the worker just closed.
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "0"))
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "65"))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "10000"))
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "1000"))
+SERVER_GRACEFUL_TIMEOUT = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+# Proxies trusted to set X-Forwarded-For/-Proto (comma-separated IPs or
+# CIDRs): the load balancer's addresses, never "*" when the port is reachable
+# from elsewhere, or any client could pick the IP the rate limits see.
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+# Lap video storage (S3 or a compatible store such as MinIO via S3_ENDPOINT_URL)
+S3_BUCKET = os.getenv("S3_BUCKET", "nurblife-lap-videos")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+S3_REGION = os.getenv("S3_REGION", "eu-central-1")
+# Clients upload in parts of this size; S3 needs at least 5 MiB per part.
+VIDEO_PART_SIZE = int(os.getenv("VIDEO_PART_SIZE", str(64 * 1024 * 1024)))
+VIDEO_MAX_SIZE = int(os.getenv("VIDEO_MAX_SIZE", str(50 * 1024**3)))
+# Bytes of a part kept in memory before it spills to a temporary file
+VIDEO_SPOOL_MAX_MEMORY = int(os.getenv("VIDEO_SPOOL_MAX_MEMORY", str(8 * 1024 * 1024)))
+VIDEO_URL_EXPIRES_SECONDS = int(os.getenv("VIDEO_URL_EXPIRES_SECONDS", "3600"))
+VIDEO_WORKERS = int(os.getenv("VIDEO_WORKERS", "2"))
+# A claimed job is handed to another worker if it has not finished within
+# this time, e.g. because its worker died. Must exceed the longest encode.
+VIDEO_LEASE_SECONDS = int(os.getenv("VIDEO_LEASE_SECONDS", "3600"))
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+VIDEO_THUMBNAIL_WIDTH = int(os.getenv("VIDEO_THUMBNAIL_WIDTH", "640"))
+
+# Partner hotel availability: every source gets HOTEL_SOURCE_TIMEOUT_SECONDS,
+# answers are cached per hotel and date for HOTEL_AVAILABILITY_TTL_SECONDS.
+# The HTTP request itself may run up to HOTEL_SOURCE_REQUEST_TIMEOUT_SECONDS,
+# so an answer arriving after the search gave up still serves the next one.
+HOTEL_SOURCE_TIMEOUT_SECONDS = float(os.getenv("HOTEL_SOURCE_TIMEOUT_SECONDS", "2"))
+HOTEL_SOURCE_REQUEST_TIMEOUT_SECONDS = float(
+    os.getenv("HOTEL_SOURCE_REQUEST_TIMEOUT_SECONDS", "10")
+)
+HOTEL_AVAILABILITY_TTL_SECONDS = int(os.getenv("HOTEL_AVAILABILITY_TTL_SECONDS", "120"))
+HOTEL_SOURCE_CONCURRENCY = int(os.getenv("HOTEL_SOURCE_CONCURRENCY", "64"))
+# Sources that failed or timed out are not asked again for this long.
+HOTEL_SOURCE_FAILURE_TTL_SECONDS = int(
+    os.getenv("HOTEL_SOURCE_FAILURE_TTL_SECONDS", "15")
+)
+# Searches are answered for dates from today up to this many days ahead.
+HOTEL_AVAILABILITY_MAX_DAYS_AHEAD = int(
+    os.getenv("HOTEL_AVAILABILITY_MAX_DAYS_AHEAD", "365")
+)
+# Admission control for the availability search (GET /hotels/availability)
+HOTEL_AVAILABILITY_CONCURRENCY_LIMIT = int(
+    os.getenv("HOTEL_AVAILABILITY_CONCURRENCY_LIMIT", "16")
+)
+HOTEL_AVAILABILITY_QUEUE_LIMIT = int(os.getenv("HOTEL_AVAILABILITY_QUEUE_LIMIT", "32"))
+HOTEL_AVAILABILITY_QUEUE_TIMEOUT = float(
+    os.getenv("HOTEL_AVAILABILITY_QUEUE_TIMEOUT", "2")
+)
+HOTEL_AVAILABILITY_RATE_LIMIT = float(os.getenv("HOTEL_AVAILABILITY_RATE_LIMIT", "20"))
+HOTEL_AVAILABILITY_RATE_BURST = int(os.getenv("HOTEL_AVAILABILITY_RATE_BURST", "40"))
+
+# In-memory columnar copy of the cars table that answers GET /cars/search.
+# Needs numpy; without it (or when disabled) the search runs in SQL.
+FLEET_INDEX_ENABLED = os.getenv("FLEET_INDEX_ENABLED", "true").lower() == "true"
+
+# Schema migrations (database/migrations.py). DDL gives up instead of queueing
+# behind long transactions, which would block every query on the table.
+MIGRATION_LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+# Monthly partitions of bookings and transactions are created this many
+# months ahead, checked daily.
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
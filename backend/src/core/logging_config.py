@@ -0,0 +1,158 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from core.config import LOG_FORMAT, LOG_LEVEL, LOG_RATE_LIMIT, LOG_RATE_WINDOW_SECONDS
+from utils.request_id import get_request_id
+
+# Attributes of every LogRecord; anything else was passed through `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `limit` records per message template and window.
+
+    Records are keyed by logger, level and the unformatted message, so
+    "Car with ID %s does not exist." counts as one message whatever the ID.
+    The first record let through after a window with drops carries the
+    number of dropped records in its `suppressed` attribute.
+    """
+
+    def __init__(
+        self, limit: int = LOG_RATE_LIMIT, window: float = LOG_RATE_WINDOW_SECONDS
+    ):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self._counters: Dict[Tuple[str, int, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+
+        with self._lock:
+            if len(self._counters) > 10_000:
+                # Unbounded keys mean f-string messages; start over.
+                self._counters.clear()
+            counter = self._counters.get(key)
+            if counter is None or now - counter[0] >= self.window:
+                suppressed = counter[2] if counter else 0
+                self._counters[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+
+            if counter[1] < self.limit:
+                counter[1] += 1
+                return True
+
+            counter[2] += 1
+            return False
+
+
+class RequestQueueHandler(QueueHandler):
+    """
+    QueueHandler stamping the request ID on records before queueing them.
+
+    Like the stdlib QueueHandler, `msg % args` is formatted and the
+    traceback rendered on the calling thread: the arguments may be mutated
+    afterwards or be ORM objects that must not be read from another thread,
+    and the traceback would keep the frames alive. The request ID lives in
+    a context variable and cannot be read later either. JSON encoding and
+    the write happen in the listener thread.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if getattr(record, "request_id", None) is None:
+            record.request_id = get_request_id()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exception_formatter.formatException(
+                    record.exc_info
+                )
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> None:
+    """
+    Route the root logger through a queue to a background writer thread.
+
+    Safe to call more than once; only the first call installs the handlers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+            )
+        )
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = RequestQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(lambda: _listener.stop())
+
+    def restart_in_child():
+        # The writer thread does not survive fork() (e.g. a preloading
+        # server forking its workers); give the child its own queue and thread.
+        global _listener
+        child_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler.queue = child_queue
+        _listener = QueueListener(
+            child_queue, stream_handler, respect_handler_level=True
+        )
+        _listener.start()
+
+    os.register_at_fork(after_in_child=restart_in_child)
@@ -0,0 +1,12 @@
+import hmac
+from typing import Optional
+
+from core.config import ADMIN_API_TOKEN
+
+
+def is_admin(token: Optional[str], expected: Optional[str] = ADMIN_API_TOKEN) -> bool:
+    """
+    Check a staff token. Compared in constant time; with no token configured
+    nobody is admin.
+    """
+    return bool(expected) and bool(token) and hmac.compare_digest(token, expected)
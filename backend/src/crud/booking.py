@@ -0,0 +1,192 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from fastapi import HTTPException
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
+
+from core.config import PACKAGE_PRICES
+from crud.cars import CarRepository
+from crud.hotels import HotelRepository
+from crud.payments import PAYMENT_CHARGE_TOPIC, get_payment_provider
+from crud.users import UserRepository
+from models.booking import Booking, BookingIdempotencyKey
+from models.enums import BookingStatus, PaymentStatusEnum
+from models.payments import Payments
+from schemas.booking import BookingResponse, CheckoutRequest
+from schemas.user import UserCreate
+from utils.invalidation import invalidation_bus
+from utils.outbox import enqueue
+from utils.transaction_context import transaction_context
+
+logger = logging.getLogger(__name__)
+
+
+class BookingRepository:
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get_booking_by_id(self, booking_id: UUID) -> Booking:
+        db_booking = self.db.get(Booking, booking_id)
+
+        if not db_booking:
+            error_message = f"Booking with ID {booking_id} does not exist."
+            logger.warning("Booking with ID %s does not exist.", booking_id)
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_message)
+
+        return db_booking
+
+    def get(self, booking_id: UUID) -> BookingResponse:
+        return BookingResponse.model_validate(self.get_booking_by_id(booking_id))
+
+    def _get_by_idempotency_key(self, idempotency_key: str):
+        # A primary key lookup instead of a scan of every booking partition
+        return self.db.scalars(
+            select(Booking)
+            .join(BookingIdempotencyKey)
+            .where(BookingIdempotencyKey.key == idempotency_key)
+        ).first()
+
+    @staticmethod
+    def _replay(db_booking: Booking, request: CheckoutRequest) -> BookingResponse:
+        """Return the booking of an earlier checkout made with the same key."""
+        # Built from the row, not from a BookingResponse: validating a
+        # subclass instance returns it unchanged, server fields included.
+        original = CheckoutRequest.model_validate(db_booking)
+        if request.model_dump() != original.model_dump():
+            raise HTTPException(
+                status_code=HTTP_409_CONFLICT,
+                detail="Idempotency key was already used for a different checkout.",
+            )
+        return BookingResponse.model_validate(db_booking)
+
+    def _total_amount(self, request: CheckoutRequest) -> int:
+        """Laps in the car, plus the package and the hotel night if booked."""
+        db_car = CarRepository(db_session=self.db).get_car_by_id(request.car_id)
+        total_amount = db_car.price_for_lap * request.laps
+        total_amount += PACKAGE_PRICES[request.package.value]
+
+        if request.hotel_id:
+            db_hotel = HotelRepository(db_session=self.db).get_hotel_by_id(
+                request.hotel_id
+            )
+            if db_hotel.price_per_night is None:
+                raise HTTPException(
+                    status_code=HTTP_400_BAD_REQUEST,
+                    detail=f"Hotel with ID {request.hotel_id} cannot be booked.",
+                )
+            total_amount += db_hotel.price_per_night
+
+        return total_amount
+
+    def checkout(
+        self, request: CheckoutRequest, idempotency_key: str
+    ) -> BookingResponse:
+        """
+        Method for creating a pending booking and its payment.
+
+        The booking, the payment and the outbox message that charges it are
+        written in one transaction; the charge itself runs in the background,
+        so checkout does not wait on the payment provider. Repeating a
+        checkout with the same idempotency key returns the original booking.
+        With customer details, the booking is linked to the customer with the
+        checkout email, who is created if new.
+
+        The total covers the laps, the package and, with a hotel, its price
+        for the night.
+
+        Args:
+            request (CheckoutRequest): Booked car, date, laps, package and
+                optional hotel.
+            idempotency_key (str): Client supplied key of this checkout.
+
+        Returns:
+            BookingResponse: The pending booking.
+
+        Raises:
+            HTTPException: If the car or the hotel does not exist (status code
+            404), the hotel has no price (status code 400), the key was used
+            for a different checkout (status code 409), no payment provider is
+            configured (status code 503) or a general database error occurs
+            (status code 500).
+        """
+        existing = self._get_by_idempotency_key(idempotency_key)
+        if existing:
+            return self._replay(existing, request)
+
+        # Fails before anything is written if payments cannot be charged.
+        get_payment_provider()
+        total_amount = self._total_amount(request)
+
+        try:
+            with transaction_context(self.db):
+                user_id = None
+                if request.customer:
+                    customer = UserCreate(
+                        email=request.email, **request.customer.model_dump()
+                    )
+                    user_repo = UserRepository(db_session=self.db)
+                    user_id = user_repo.find_or_create(customer).id
+
+                db_booking = Booking(
+                    **request.model_dump(),
+                    user_id=user_id,
+                    total_amount=total_amount,
+                    status=BookingStatus.PENDING,
+                    idempotency_key=idempotency_key,
+                )
+                self.db.add(db_booking)
+                self.db.flush()
+                # Fails for a key taken by any booking, in any partition.
+                self.db.add(
+                    BookingIdempotencyKey(key=idempotency_key, booking_id=db_booking.id)
+                )
+                self.db.flush()
+
+                db_payment = Payments(
+                    booking_id=db_booking.id,
+                    amount=total_amount,
+                    status=PaymentStatusEnum.PENDING,
+                    idempotency_key=f"payment:{db_booking.id}",
+                )
+                self.db.add(db_payment)
+                self.db.flush()
+
+                enqueue(
+                    self.db,
+                    topic=PAYMENT_CHARGE_TOPIC,
+                    payload={"payment_id": str(db_payment.id)},
+                    idempotency_key=db_payment.idempotency_key,
+                )
+                # Lets clients watching the track day refresh its availability.
+                invalidation_bus.publish(
+                    "booking", db_booking.track_date.isoformat(), db=self.db
+                )
+
+            return BookingResponse.model_validate(db_booking)
+
+        except IntegrityError as e:
+            # A concurrent retry with the same key committed first.
+            existing = self._get_by_idempotency_key(idempotency_key)
+            if existing:
+                return self._replay(existing, request)
+
+            logger.error("Integrity error creating booking: %s", e)
+            raise HTTPException(
+                status_code=HTTP_409_CONFLICT,
+                detail="Integrity error: Duplicate entry or constraint violation.",
+            ) from e
+
+        except SQLAlchemyError as e:
+            logger.error("Database error creating booking: %s", e)
+            raise HTTPException(
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error.",
+            ) from e
@@ -1,7 +1,8 @@
 import logging
-from functools import lru_cache
 from abc import ABC, abstractmethod
+from typing import Iterable, List
 from uuid import UUID
+from sqlalchemy import Float, cast, func, lambda_stmt, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from fastapi import HTTPException
@@ -11,11 +12,65 @@ from starlette.status import (
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 from models.car import Car
-from schemas.car import CarCreate, CarResponse, CarUpdate
+from schemas.car import CarCreate, CarResponse, CarSearch, CarUpdate
+from utils.cache import ALL_KEY, entity_cache
+from utils.fleet_index import fleet_index
+from utils.invalidation import invalidation_bus
+from utils.loader import fetch_by_ids
 from utils.transaction_context import transaction_context
 
 logger = logging.getLogger(__name__)
 
+# Built once; SQLAlchemy caches its compiled form for every later execution.
+SELECT_ALL_CARS = select(Car)
+
+
+def select_car_by_id(entity_id: UUID):
+    # lambda_stmt caches the construct by code location and binds `entity_id`
+    # as a parameter, so the lookup skips statement building and compilation.
+    return lambda_stmt(lambda: select(Car).where(Car.id == entity_id))
+
+
+SPEC_COLUMNS = {
+    "hp": Car.hp,
+    "nm": Car.nm,
+    "acceleration": Car.acceleration,
+    "weight": Car.weight,
+    "price_for_lap": Car.price_for_lap,
+    # Double precision like the index, so both compare the same values.
+    # NULL for a car without a weight, where the index has NaN.
+    "power_to_weight": cast(Car.hp, Float) * 1000 / func.nullif(Car.weight, 0),
+}
+
+
+def select_cars_matching(search: CarSearch):
+    """SQL form of a car picker query, with the same results as FleetIndex.query."""
+    statement = select(Car)
+    for spec, low, high in search.ranges():
+        if low is not None:
+            statement = statement.where(SPEC_COLUMNS[spec] >= low)
+        if high is not None:
+            statement = statement.where(SPEC_COLUMNS[spec] <= high)
+    if search.drive:
+        statement = statement.where(Car.drive.in_(search.drive))
+    if search.gearbox:
+        statement = statement.where(Car.gearbox.in_(search.gearbox))
+    if search.rollcage_type:
+        statement = statement.where(Car.rollcage_type.in_(search.rollcage_type))
+    if search.available_only:
+        statement = statement.where(Car.in_repair_shop.is_(False))
+
+    if search.sort_by:
+        column = SPEC_COLUMNS[search.sort_by]
+        order = column.desc() if search.descending else column.asc()
+        # NULLs last in both directions, where NumPy sorts NaN.
+        statement = statement.order_by(order.nulls_last())
+    # Ties in id order, like the index
+    statement = statement.order_by(Car.id)
+    if search.limit:
+        statement = statement.limit(search.limit)
+    return statement
+
 
 class BaseRepository(ABC):
     @abstractmethod
@@ -26,6 +81,10 @@ class BaseRepository(ABC):
     def get(self, entity_id):
         pass
 
+    @abstractmethod
+    def get_many(self, entity_ids):
+        pass
+
     @abstractmethod
     def update(self, entity_id, entity):
         pass
@@ -39,7 +98,6 @@ class CarRepository(BaseRepository):
     def __init__(self, db_session: Session):
         self.db = db_session
 
-    @lru_cache(maxsize=25)
     def get_car_by_id(self, entity_id: UUID) -> Car:
         """
         Method to get the car by ID.
@@ -53,11 +111,11 @@ class CarRepository(BaseRepository):
         Raises:
             HTTPException: If car not found.
         """
-        db_car = self.db.query(Car).filter(Car.id == entity_id).first()
+        db_car = self.db.scalars(select_car_by_id(entity_id)).first()
 
         if not db_car:
             error_message = f"Car with ID {entity_id} does not exist."
-            logger.error(error_message)
+            logger.warning("Car with ID %s does not exist.", entity_id)
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_message)
 
         return db_car
@@ -81,6 +139,8 @@ class CarRepository(BaseRepository):
             with transaction_context(self.db):
                 db_car = Car(**entity.model_dump())
                 self.db.add(db_car)
+                self.db.flush()
+                invalidation_bus.publish("car", db_car.id, db=self.db)
                 self.db.refresh(db_car)
 
             return CarResponse.model_validate(db_car)
@@ -100,20 +160,67 @@ class CarRepository(BaseRepository):
             ) from e
 
     def get(self, entity_id: UUID) -> CarResponse:
-        db_car = self.get_car_by_id(entity_id)
+        return entity_cache.get_or_load(
+            "car",
+            entity_id,
+            lambda: CarResponse.model_validate(self.get_car_by_id(entity_id)),
+            max_staleness=self.db.info.get("max_staleness", 0.0),
+        )
+
+    def get_all(self) -> List[CarResponse]:
+        return entity_cache.get_or_load(
+            "car",
+            ALL_KEY,
+            lambda: [
+                CarResponse.model_validate(car)
+                for car in self.db.scalars(SELECT_ALL_CARS)
+            ],
+            max_staleness=self.db.info.get("max_staleness", 0.0),
+        )
+
+    def search(self, search: CarSearch) -> List[CarResponse]:
+        """
+        Method for the car picker: filter, sort and top-k over the car specs.
 
-        return CarResponse.model_validate(db_car)
+        Answered from the in-memory fleet index when it is enabled, otherwise
+        with a single SQL query.
+
+        Args:
+            search (CarSearch): Spec ranges, enum values, sort and limit.
+
+        Returns:
+            List[CarResponse]: The matching cars in the requested order.
+        """
+        if fleet_index.enabled:
+            return fleet_index.query(search)
+        return [
+            CarResponse.model_validate(car)
+            for car in self.db.scalars(select_cars_matching(search))
+        ]
+
+    def get_many(self, entity_ids: Iterable[UUID]) -> List[Car]:
+        """
+        Method to get several cars with a single query.
+
+        Args:
+            entity_ids (Iterable[UUID]): IDs of the cars.
+
+        Returns:
+            List[Car]: The cars found, missing IDs are skipped.
+        """
+        return fetch_by_ids(self.db, Car, entity_ids)
 
     def update(self, entity_id: UUID, entity: CarUpdate):
         try:
             with transaction_context(self.db):
-                self.get_car_by_id.cache_clear()  # инвалидираме кеша, за да сме сигурни-
-                #че няма да получим стари данни.
                 db_car = self.get_car_by_id(entity_id)
 
                 for key, value in entity.model_dump(exclude_unset=True).items():
                     setattr(db_car, key, value)
 
+                # Delivered to every worker's cache once the transaction commits.
+                invalidation_bus.publish("car", entity_id, db=self.db)
+
             return CarUpdate.model_validate(db_car)
 
         except SQLAlchemyError as e:
@@ -129,6 +236,7 @@ class CarRepository(BaseRepository):
                 db_car = self.get_car_by_id(entity_id)
 
                 self.db.delete(db_car)
+                invalidation_bus.publish("car", entity_id, db=self.db)
             return {"detail": f"Car with ID {entity_id} deleted successfully."}
 
         except SQLAlchemyError as e:
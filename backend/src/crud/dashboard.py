@@ -0,0 +1,149 @@
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from starlette.status import HTTP_400_BAD_REQUEST
+
+from core.config import DASHBOARD_MAX_RANGE_DAYS
+from crud.cars import CarRepository
+from models.rollups import RevenueRollup, VoucherRollup
+from schemas.dashboard import (
+    RevenueResponse,
+    RevenueRow,
+    UtilisationResponse,
+    UtilisationRow,
+    VoucherLiabilityResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+REVENUE_GROUPS = {
+    "day": RevenueRollup.day,
+    "car": RevenueRollup.car_id,
+    "package": RevenueRollup.package,
+}
+
+
+class DashboardRepository:
+    """
+    Owner's dashboard figures, read from the precomputed rollup tables only.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    @staticmethod
+    def _validate_range(start: date, end: date) -> None:
+        if end < start:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST, detail="end must not be before start."
+            )
+        if (end - start).days >= DASHBOARD_MAX_RANGE_DAYS:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"The range must not exceed {DASHBOARD_MAX_RANGE_DAYS} days.",
+            )
+
+    def get_revenue(self, start: date, end: date, group_by: str) -> RevenueResponse:
+        self._validate_range(start, end)
+        if group_by not in REVENUE_GROUPS:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"group_by must be one of: {', '.join(REVENUE_GROUPS)}.",
+            )
+
+        key = REVENUE_GROUPS[group_by]
+        rows = self.db.execute(
+            select(
+                key,
+                func.sum(RevenueRollup.bookings_count),
+                func.sum(RevenueRollup.laps),
+                func.sum(RevenueRollup.revenue),
+            )
+            .where(RevenueRollup.day.between(start, end))
+            .group_by(key)
+            .order_by(key)
+        ).all()
+
+        revenue_rows = [
+            RevenueRow(
+                key=getattr(value, "value", str(value)),
+                bookings_count=bookings_count,
+                laps=laps,
+                revenue=revenue,
+            )
+            for value, bookings_count, laps, revenue in rows
+        ]
+        return RevenueResponse(
+            start=start,
+            end=end,
+            group_by=group_by,
+            total_revenue=sum(row.revenue for row in revenue_rows),
+            rows=revenue_rows,
+        )
+
+    def get_voucher_liability(
+        self, as_of: Optional[date] = None
+    ) -> VoucherLiabilityResponse:
+        statement = select(
+            func.coalesce(func.sum(VoucherRollup.issued_count), 0),
+            func.coalesce(func.sum(VoucherRollup.issued_amount), 0),
+            func.coalesce(func.sum(VoucherRollup.redeemed_amount), 0),
+            func.coalesce(func.sum(VoucherRollup.expired_amount), 0),
+        )
+        if as_of:
+            statement = statement.where(VoucherRollup.day <= as_of)
+
+        issued_count, issued, redeemed, expired = self.db.execute(statement).one()
+        return VoucherLiabilityResponse(
+            as_of=as_of,
+            issued_count=issued_count,
+            issued_amount=issued,
+            redeemed_amount=redeemed,
+            expired_amount=expired,
+            outstanding_amount=issued - redeemed - expired,
+        )
+
+    def get_utilisation(self, start: date, end: date) -> UtilisationResponse:
+        """
+        Share of the fleet booked on each day of the range.
+        """
+        self._validate_range(start, end)
+        booked = dict(
+            self.db.execute(
+                select(
+                    RevenueRollup.day, func.count(func.distinct(RevenueRollup.car_id))
+                )
+                .where(
+                    RevenueRollup.day.between(start, end),
+                    RevenueRollup.bookings_count > 0,
+                )
+                .group_by(RevenueRollup.day)
+            ).all()
+        )
+        fleet_size = len(CarRepository(db_session=self.db).get_all())
+
+        days = []
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            booked_cars = booked.get(day, 0)
+            days.append(
+                UtilisationRow(
+                    day=day,
+                    booked_cars=booked_cars,
+                    fleet_size=fleet_size,
+                    utilisation=booked_cars / fleet_size if fleet_size else 0.0,
+                )
+            )
+
+        return UtilisationResponse(
+            start=start,
+            end=end,
+            average_utilisation=(
+                sum(row.utilisation for row in days) / len(days) if days else 0.0
+            ),
+            days=days,
+        )
@@ -1,6 +1,8 @@
 import logging
 from abc import ABC, abstractmethod
+from typing import Iterable, List
 from uuid import UUID
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from fastapi import HTTPException
@@ -12,10 +14,20 @@ from starlette.status import (
 
 from models.hotel import Hotel
 from schemas.hotel import AddHotel, HotelResponse, UpdateHotel
+from utils.cache import ALL_KEY, entity_cache
+from utils.invalidation import invalidation_bus
+from utils.loader import fetch_by_ids
 from utils.transaction_context import transaction_context
 
 logger = logging.getLogger(__name__)
 
+# Cached statements for the hot queries, see crud.cars for the details.
+SELECT_ALL_HOTELS = select(Hotel)
+
+
+def select_hotel_by_id(hotel_id: UUID):
+    return lambda_stmt(lambda: select(Hotel).where(Hotel.id == hotel_id))
+
 
 class BaseRepository(ABC):
     @abstractmethod
@@ -26,6 +38,10 @@ class BaseRepository(ABC):
     def get(self, hotel_id):
         pass
 
+    @abstractmethod
+    def get_many(self, hotel_ids):
+        pass
+
     @abstractmethod
     def update(self, hotel_id, hotel):
         pass
@@ -52,11 +68,11 @@ class HotelRepository(BaseRepository):
         Raises:
             HTTPException: If hotel not found.
         """
-        db_hotel = self.db.query(Hotel).filter(Hotel.id == hotel_id).first()
+        db_hotel = self.db.scalars(select_hotel_by_id(hotel_id)).first()
 
         if not db_hotel:
             error_message = f"Hotel with ID {hotel_id} does not exists."
-            logger.error(error_message)
+            logger.warning("Hotel with ID %s does not exists.", hotel_id)
             raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_message)
 
         return db_hotel
@@ -67,6 +83,8 @@ class HotelRepository(BaseRepository):
             with transaction_context(self.db):
                 db_hotel = Hotel(**hotel.model_dump())
                 self.db.add(db_hotel)
+                self.db.flush()
+                invalidation_bus.publish("hotel", db_hotel.id, db=self.db)
                 self.db.refresh(db_hotel)
 
             return HotelResponse.model_validate(db_hotel)
@@ -86,9 +104,35 @@ class HotelRepository(BaseRepository):
             ) from e
 
     def get(self, hotel_id: UUID) -> HotelResponse:
-        db_hotel = self.get_hotel_by_id(hotel_id)
+        return entity_cache.get_or_load(
+            "hotel",
+            hotel_id,
+            lambda: HotelResponse.model_validate(self.get_hotel_by_id(hotel_id)),
+            max_staleness=self.db.info.get("max_staleness", 0.0),
+        )
+
+    def get_all(self) -> List[HotelResponse]:
+        return entity_cache.get_or_load(
+            "hotel",
+            ALL_KEY,
+            lambda: [
+                HotelResponse.model_validate(hotel)
+                for hotel in self.db.scalars(SELECT_ALL_HOTELS)
+            ],
+            max_staleness=self.db.info.get("max_staleness", 0.0),
+        )
+
+    def get_many(self, hotel_ids: Iterable[UUID]) -> List[Hotel]:
+        """
+        Method to get several hotels with a single query.
+
+        Args:
+            hotel_ids (Iterable[UUID]): IDs of the hotels.
 
-        return HotelResponse.model_validate(db_hotel)
+        Returns:
+            List[Hotel]: The hotels found, missing IDs are skipped.
+        """
+        return fetch_by_ids(self.db, Hotel, hotel_ids)
 
     def update(self, hotel_id: UUID, hotel: UpdateHotel):
         try:
@@ -98,6 +142,9 @@ class HotelRepository(BaseRepository):
                 for key, value in hotel.model_dump(exclude_unset=True).items():
                     setattr(db_hotel, key, value)
 
+                # Delivered to every worker's cache once the transaction commits.
+                invalidation_bus.publish("hotel", hotel_id, db=self.db)
+
             return UpdateHotel.model_validate(db_hotel)
 
         except SQLAlchemyError as e:
@@ -113,6 +160,7 @@ class HotelRepository(BaseRepository):
                 db_hotel = self.get_hotel_by_id(hotel_id)
 
                 self.db.delete(db_hotel)
+                invalidation_bus.publish("hotel", hotel_id, db=self.db)
             return {"detail": f"Hotel with ID {hotel_id} deleted successfully."}
         except SQLAlchemyError as e:
             logger.error("Datbase error deleting hotel: %s", e)
@@ -0,0 +1,278 @@
+import calendar
+import logging
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from psycopg2.errorcodes import FOREIGN_KEY_VIOLATION
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import Range
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
+    HTTP_422_UNPROCESSABLE_ENTITY,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+)
+
+from crud.cars import CarRepository
+from models.car import Car
+from models.maintenance import CarMaintenance
+from schemas.maintenance import (
+    FleetAvailabilityResponse,
+    MaintenanceCreate,
+    MaintenanceResponse,
+    MonthAvailabilityResponse,
+)
+from utils.cache import entity_cache
+from utils.invalidation import invalidation_bus
+from utils.transaction_context import transaction_context
+
+logger = logging.getLogger(__name__)
+
+# Track days start and end at midnight local time at the Nürburgring.
+TRACK_TZ = ZoneInfo("Europe/Berlin")
+
+# Name of the exclusion constraint rejecting overlapping windows of a car.
+NO_OVERLAP_CONSTRAINT = "carmaintenance_no_overlap"
+
+# Track day the cached month views were computed on.
+_availability_day: Dict[str, date] = {}
+
+
+def _range(starts_at: datetime, ends_at: datetime):
+    return func.tstzrange(starts_at, ends_at, "[)")
+
+
+def select_busy_car_ids(starts_at: datetime, ends_at: datetime):
+    """Cars with a maintenance window overlapping [starts_at, ends_at)."""
+    return select(CarMaintenance.car_id).where(
+        CarMaintenance.period.overlaps(_range(starts_at, ends_at))
+    )
+
+
+def _evict_availability(namespace: str, key: str):
+    # Month availability depends on the fleet as well as on the windows.
+    if namespace in ("car", "*"):
+        entity_cache.evict_namespace("availability")
+
+
+invalidation_bus.subscribe(_evict_availability)
+
+
+class BaseRepository(ABC):
+    @abstractmethod
+    def add(self, window):
+        pass
+
+    @abstractmethod
+    def get(self, window_id):
+        pass
+
+    @abstractmethod
+    def delete(self, window_id):
+        pass
+
+
+class MaintenanceRepository(BaseRepository):
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get_window_by_id(self, window_id: UUID) -> CarMaintenance:
+        db_window = self.db.get(CarMaintenance, window_id)
+
+        if not db_window:
+            error_message = f"Maintenance window with ID {window_id} does not exist."
+            logger.warning("Maintenance window with ID %s does not exist.", window_id)
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_message)
+
+        return db_window
+
+    def add(self, window: MaintenanceCreate) -> MaintenanceResponse:
+        """
+        Method for adding a maintenance window to a car.
+
+        Args:
+            window (MaintenanceCreate): Car ID, time range and reason.
+
+        Returns:
+            MaintenanceResponse: The created window.
+
+        Raises:
+            HTTPException: If the car does not exist (status code 404), the
+            window overlaps an existing one of the car (status code 409) or
+            any other database error occurs (status code 500).
+        """
+        CarRepository(db_session=self.db).get_car_by_id(window.car_id)
+
+        try:
+            with transaction_context(self.db):
+                db_window = CarMaintenance(
+                    car_id=window.car_id,
+                    period=Range(window.starts_at, window.ends_at, bounds="[)"),
+                    reason=window.reason,
+                )
+                self.db.add(db_window)
+                self.db.flush()
+                invalidation_bus.publish("availability", db=self.db)
+                self.db.refresh(db_window)
+
+            return MaintenanceResponse.model_validate(db_window)
+
+        except IntegrityError as e:
+            diag = getattr(e.orig, "diag", None)
+            if getattr(diag, "constraint_name", None) == NO_OVERLAP_CONSTRAINT:
+                raise HTTPException(
+                    status_code=HTTP_409_CONFLICT,
+                    detail="The car already has a maintenance window in this period.",
+                ) from e
+            if getattr(e.orig, "pgcode", None) == FOREIGN_KEY_VIOLATION:
+                # The car was deleted after the lookup above.
+                raise HTTPException(
+                    status_code=HTTP_404_NOT_FOUND,
+                    detail=f"Car with ID {window.car_id} does not exist.",
+                ) from e
+
+            logger.error("Integrity error adding maintenance window: %s", e)
+            raise HTTPException(
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error.",
+            ) from e
+
+        except SQLAlchemyError as e:
+            logger.error("Database error adding maintenance window: %s", e)
+            raise HTTPException(
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error.",
+            ) from e
+
+    def get(self, window_id: UUID) -> MaintenanceResponse:
+        return MaintenanceResponse.model_validate(self.get_window_by_id(window_id))
+
+    def get_for_car(self, car_id: UUID) -> List[MaintenanceResponse]:
+        db_windows = self.db.scalars(
+            select(CarMaintenance)
+            .where(CarMaintenance.car_id == car_id)
+            .order_by(CarMaintenance.period)
+        )
+        return [MaintenanceResponse.model_validate(window) for window in db_windows]
+
+    def delete(self, window_id: UUID) -> dict:
+        try:
+            with transaction_context(self.db):
+                self.db.delete(self.get_window_by_id(window_id))
+                invalidation_bus.publish("availability", db=self.db)
+            return {
+                "detail": f"Maintenance window with ID {window_id} deleted successfully."
+            }
+
+        except SQLAlchemyError as e:
+            logger.error("Database error deleting maintenance window: %s", e)
+            raise HTTPException(
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error.",
+            ) from e
+
+    def get_available_cars(
+        self, starts_at: datetime, ends_at: datetime
+    ) -> FleetAvailabilityResponse:
+        """
+        Cars free for the whole [starts_at, ends_at) period, in one query.
+
+        `Car.in_repair_shop` still marks a car as unavailable right now, so
+        it only excludes the car from periods that have already started.
+        """
+        if starts_at.tzinfo is None or ends_at.tzinfo is None:
+            raise HTTPException(
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="starts_at and ends_at must include a timezone.",
+            )
+        if ends_at <= starts_at:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail="ends_at must be after starts_at.",
+            )
+
+        statement = select(Car.id).where(
+            Car.id.not_in(select_busy_car_ids(starts_at, ends_at))
+        )
+        if starts_at <= datetime.now(timezone.utc):
+            statement = statement.where(Car.in_repair_shop.is_(False))
+
+        return FleetAvailabilityResponse(
+            starts_at=starts_at,
+            ends_at=ends_at,
+            available_car_ids=list(self.db.scalars(statement)),
+        )
+
+    def get_month_availability(
+        self, year: int, month: int
+    ) -> MonthAvailabilityResponse:
+        """
+        Free cars for every day of a month.
+
+        Loads the month's windows and the fleet with one query each and
+        intersects them per day in memory. Results are cached until a car or a
+        maintenance window changes, or the track day ends: cars in the repair
+        shop are only excluded from days that have not ended yet.
+        """
+        if not 1 <= month <= 12:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST, detail="month must be 1-12."
+            )
+
+        now = datetime.now(timezone.utc)
+        today = now.astimezone(TRACK_TZ).date()
+        if _availability_day.get("today") != today:
+            # Drop the views of the previous track day instead of letting
+            # them pile up under keys that are never read again.
+            entity_cache.evict_namespace("availability")
+            _availability_day["today"] = today
+
+        return entity_cache.get_or_load(
+            "availability",
+            f"{year:04d}-{month:02d}@{today.isoformat()}",
+            lambda: self._load_month_availability(year, month, now),
+            max_staleness=self.db.info.get("max_staleness", 0.0),
+        )
+
+    def _load_month_availability(
+        self, year: int, month: int, now: datetime
+    ) -> MonthAvailabilityResponse:
+        days_in_month = calendar.monthrange(year, month)[1]
+        first_day = date(year, month, 1)
+        month_start = datetime(year, month, 1, tzinfo=TRACK_TZ)
+        month_end = datetime.combine(
+            first_day + timedelta(days=days_in_month), datetime.min.time(), TRACK_TZ
+        )
+
+        windows = self.db.execute(
+            select(CarMaintenance.car_id, CarMaintenance.period).where(
+                CarMaintenance.period.overlaps(_range(month_start, month_end))
+            )
+        ).all()
+        fleet = self.db.execute(select(Car.id, Car.in_repair_shop)).all()
+
+        days: Dict[date, List[UUID]] = {}
+        for offset in range(days_in_month):
+            day = first_day + timedelta(days=offset)
+            day_start = datetime.combine(day, datetime.min.time(), TRACK_TZ)
+            day_end = day_start + timedelta(days=1)
+
+            busy = {
+                car_id
+                for car_id, period in windows
+                if period.lower < day_end and period.upper > day_start
+            }
+            days[day] = [
+                car_id
+                for car_id, in_repair_shop in fleet
+                if car_id not in busy and not (in_repair_shop and day_end > now)
+            ]
+
+        return MonthAvailabilityResponse(year=year, month=month, days=days)
@@ -0,0 +1,124 @@
+import logging
+import threading
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from starlette.status import HTTP_404_NOT_FOUND, HTTP_503_SERVICE_UNAVAILABLE
+
+from core.config import PAYMENT_CURRENCY
+from models.booking import Booking
+from models.enums import BookingStatus, PaymentStatusEnum
+from models.outbox import OutboxMessage
+from models.payments import Payments
+from models.transaction import Transaction, TransactionReference
+from schemas.payments import PaymentResponse
+from utils.notifications import enqueue_booking_confirmation
+from utils.outbox import outbox_dispatcher
+from utils.payment_provider import (
+    PaymentDeclinedError,
+    PaymentProvider,
+    build_payment_provider,
+)
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_CHARGE_TOPIC = "payment.charge"
+
+_payment_provider: Optional[PaymentProvider] = None
+_payment_provider_lock = threading.Lock()
+
+
+def get_payment_provider() -> PaymentProvider:
+    """
+    Provider selected by PAYMENT_PROVIDER, built on first use.
+
+    Built lazily so that the app starts, and serves everything but
+    payments, without a provider configured.
+
+    Raises:
+        HTTPException: If no usable provider is configured (status code 503).
+    """
+    global _payment_provider
+    with _payment_provider_lock:
+        if _payment_provider is None:
+            try:
+                _payment_provider = build_payment_provider()
+            except ValueError as e:
+                logger.error("Payments are unavailable: %s", e)
+                raise HTTPException(
+                    status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Payments are temporarily unavailable.",
+                ) from e
+        return _payment_provider
+
+
+class PaymentRepository:
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get_payment_by_id(self, payment_id: UUID) -> Payments:
+        db_payment = self.db.get(Payments, payment_id)
+
+        if not db_payment:
+            error_message = f"Payment with ID {payment_id} does not exist."
+            logger.warning("Payment with ID %s does not exist.", payment_id)
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_message)
+
+        return db_payment
+
+    def get(self, payment_id: UUID) -> PaymentResponse:
+        return PaymentResponse.model_validate(self.get_payment_by_id(payment_id))
+
+    def get_for_booking(self, booking_id: UUID) -> List[PaymentResponse]:
+        db_payments = self.db.scalars(
+            select(Payments)
+            .where(Payments.booking_id == booking_id)
+            .order_by(Payments.created_at)
+        )
+        return [PaymentResponse.model_validate(payment) for payment in db_payments]
+
+
+def handle_payment_charge(db: Session, message: OutboxMessage):
+    """
+    Outbox handler charging a pending payment.
+
+    The provider call reuses the message's idempotency key, so a retry after
+    a crash between charging and committing returns the original charge
+    instead of charging the customer again.
+    """
+    payment = db.get(
+        Payments, UUID(message.payload["payment_id"]), with_for_update=True
+    )
+    if payment is None or payment.status != PaymentStatusEnum.PENDING:
+        return
+
+    booking = db.get(Booking, payment.booking_id)
+    try:
+        reference = get_payment_provider().charge(
+            idempotency_key=message.idempotency_key,
+            amount=payment.amount,
+            currency=PAYMENT_CURRENCY,
+            metadata={"booking_id": str(booking.id)},
+        )
+    except PaymentDeclinedError as e:
+        logger.error("Payment %s declined: %s", payment.id, e)
+        payment.status = PaymentStatusEnum.FAILED
+        booking.status = BookingStatus.CANCELLED
+        return
+
+    transaction = Transaction(amount=payment.amount, provider_reference=reference)
+    db.add(transaction)
+    db.flush()
+    db.add(TransactionReference(reference=reference, transaction_id=transaction.id))
+    db.flush()
+
+    payment.transaction_id = transaction.id
+    payment.status = PaymentStatusEnum.SUCCEEDED
+    booking.status = BookingStatus.CONFIRMED
+    enqueue_booking_confirmation(db, booking.id)
+
+
+outbox_dispatcher.register(PAYMENT_CHARGE_TOPIC, handle_payment_charge)
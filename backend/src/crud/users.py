@@ -0,0 +1,88 @@
+import logging
+from typing import List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+
+from models.user import User
+from schemas.user import UserCreate
+from utils.contacts import normalize_email, normalize_phone
+
+logger = logging.getLogger(__name__)
+
+
+class UserRepository:
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get_user_by_id(self, user_id: UUID) -> User:
+        db_user = self.db.get(User, user_id)
+
+        if not db_user:
+            error_message = f"User with ID {user_id} does not exist."
+            logger.warning("User with ID %s does not exist.", user_id)
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_message)
+
+        return db_user
+
+    def find_by_email(self, email: str) -> Optional[User]:
+        """Customer with this email, in any letter case. One index lookup."""
+        return self.db.scalars(
+            select(User).where(User.email_normalized == normalize_email(email))
+        ).first()
+
+    def find_by_phone(self, phone_number: str, country_code: str) -> List[User]:
+        """
+        Customers with this phone number, in any notation.
+
+        Raises:
+            HTTPException: If it is not a valid phone number (status code 400).
+        """
+        phone = normalize_phone(phone_number, country_code)
+        if phone is None:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"{phone_number} is not a valid phone number.",
+            )
+        return list(self.db.scalars(select(User).where(User.phone_e164 == phone)))
+
+    def find_or_create(self, user: UserCreate) -> User:
+        """
+        Method returning the customer with `user.email`, created if new.
+
+        Safe under concurrent checkouts of the same new customer: the insert
+        skips on the unique normalized email, and in that case Postgres has
+        waited for the concurrent insert to commit, so the following lookup
+        finds its row. Runs in the caller's transaction and does not commit.
+
+        Args:
+            user (UserCreate): Details of the customer.
+
+        Returns:
+            User: The existing or newly created customer.
+        """
+        existing = self.find_by_email(user.email)
+        if existing:
+            return existing
+
+        statement = (
+            insert(User)
+            .values(
+                id=uuid4(),
+                email_normalized=normalize_email(user.email),
+                phone_e164=normalize_phone(user.phone_number, user.country_code),
+                **user.model_dump(),
+            )
+            .on_conflict_do_nothing(index_elements=[User.email_normalized])
+            .returning(User.id)
+        )
+        user_id = self.db.execute(statement).scalar()
+        if user_id is None:
+            return self.find_by_email(user.email)
+
+        logger.info("Created user %s.", user_id)
+        return self.db.get(User, user_id)
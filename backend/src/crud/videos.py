@@ -0,0 +1,294 @@
+import logging
+from datetime import datetime, timezone
+from typing import BinaryIO
+from uuid import UUID, uuid4
+
+from botocore.exceptions import BotoCoreError, ClientError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+    HTTP_409_CONFLICT,
+    HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_502_BAD_GATEWAY,
+)
+
+from core.config import VIDEO_MAX_SIZE, VIDEO_URL_EXPIRES_SECONDS
+from crud.booking import BookingRepository
+from models.enums import VideoStatusEnum
+from models.video import LapVideo
+from schemas.video import (
+    UploadedPart,
+    UploadProgressResponse,
+    VideoLinksResponse,
+    VideoResponse,
+    VideoUploadCreate,
+)
+from utils import storage
+from utils.outbox import enqueue
+from utils.transaction_context import transaction_context
+from utils.video_processing import VIDEO_PROCESS_TOPIC
+
+logger = logging.getLogger(__name__)
+
+
+def _storage_error(action: str, error: Exception) -> HTTPException:
+    logger.error("S3 error %s: %s", action, error)
+    return HTTPException(
+        status_code=HTTP_502_BAD_GATEWAY, detail="Video storage error."
+    )
+
+
+class VideoRepository:
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get_video_by_id(self, video_id: UUID) -> LapVideo:
+        db_video = self.db.get(LapVideo, video_id)
+
+        if not db_video:
+            error_message = f"Video with ID {video_id} does not exist."
+            logger.warning("Video with ID %s does not exist.", video_id)
+            raise HTTPException(status_code=HTTP_404_NOT_FOUND, detail=error_message)
+
+        return db_video
+
+    def get(self, video_id: UUID) -> VideoResponse:
+        return VideoResponse.model_validate(self.get_video_by_id(video_id))
+
+    def _get_uploading(self, video_id: UUID) -> LapVideo:
+        db_video = self.get_video_by_id(video_id)
+        if db_video.status != VideoStatusEnum.UPLOADING:
+            raise HTTPException(
+                status_code=HTTP_409_CONFLICT,
+                detail=f"Upload of video {video_id} is already complete.",
+            )
+        return db_video
+
+    def start_upload(self, video: VideoUploadCreate) -> VideoResponse:
+        """
+        Method for starting a resumable upload of a booking's lap video.
+
+        Opens an S3 multipart upload; the client then sends the file in
+        `part_count` parts of `part_size` bytes, in any order and from any
+        number of connections.
+
+        Args:
+            video (VideoUploadCreate): Booking, file name, type and size.
+
+        Returns:
+            VideoResponse: The video with the part layout to upload.
+
+        Raises:
+            HTTPException: If the booking does not exist (status code 404),
+            the file is too large (status code 413), S3 fails (status code
+            502) or a general database error occurs (status code 500).
+        """
+        BookingRepository(db_session=self.db).get_booking_by_id(video.booking_id)
+        if video.size > VIDEO_MAX_SIZE:
+            raise HTTPException(
+                status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Videos can be at most {VIDEO_MAX_SIZE} bytes.",
+            )
+
+        video_id = uuid4()
+        s3_key = f"lap-videos/{video.booking_id}/{video_id}/original"
+        try:
+            upload_id = storage.create_multipart_upload(s3_key, video.content_type)
+        except (BotoCoreError, ClientError) as e:
+            raise _storage_error("starting upload", e) from e
+
+        try:
+            with transaction_context(self.db):
+                db_video = LapVideo(
+                    id=video_id,
+                    booking_id=video.booking_id,
+                    filename=video.filename,
+                    content_type=video.content_type,
+                    size=video.size,
+                    part_size=storage.part_size_for(video.size),
+                    s3_key=s3_key,
+                    upload_id=upload_id,
+                    status=VideoStatusEnum.UPLOADING,
+                )
+                self.db.add(db_video)
+                self.db.flush()
+                self.db.refresh(db_video)
+
+            return VideoResponse.model_validate(db_video)
+
+        except SQLAlchemyError as e:
+            storage.abort_multipart_upload(s3_key, upload_id)
+            logger.error("Database error starting video upload: %s", e)
+            raise HTTPException(
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error.",
+            ) from e
+
+    def check_part(self, video_id: UUID, part_number: int, size: int) -> LapVideo:
+        """Validate a part before its body is read."""
+        db_video = self._get_uploading(video_id)
+        if not 1 <= part_number <= db_video.part_count:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"part_number must be between 1 and {db_video.part_count}.",
+            )
+        expected = db_video.expected_part_size(part_number)
+        if size != expected:
+            raise HTTPException(
+                status_code=HTTP_400_BAD_REQUEST,
+                detail=f"Part {part_number} must be {expected} bytes, got {size}.",
+            )
+        return db_video
+
+    @staticmethod
+    def upload_part(
+        db_video: LapVideo, part_number: int, body: BinaryIO, size: int, md5: str
+    ) -> UploadedPart:
+        """
+        Method for storing one part of an upload in S3.
+
+        Uploading a part again replaces it, so a client can simply retry
+        parts that failed or whose response it never got.
+        """
+        try:
+            etag = storage.upload_part(
+                db_video.s3_key, db_video.upload_id, part_number, body, size, md5
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise _storage_error("uploading part", e) from e
+        return UploadedPart(part_number=part_number, size=size, etag=etag)
+
+    def get_progress(self, video_id: UUID) -> UploadProgressResponse:
+        """
+        Method listing the parts S3 has received, to resume an upload.
+
+        Returns:
+            UploadProgressResponse: Uploaded parts and the part numbers still missing.
+        """
+        db_video = self._get_uploading(video_id)
+        try:
+            parts = storage.list_parts(db_video.s3_key, db_video.upload_id)
+        except (BotoCoreError, ClientError) as e:
+            raise _storage_error("listing parts", e) from e
+
+        uploaded = {part["PartNumber"] for part in parts}
+        return UploadProgressResponse(
+            video_id=video_id,
+            part_count=db_video.part_count,
+            uploaded_parts=[
+                UploadedPart(
+                    part_number=part["PartNumber"], size=part["Size"], etag=part["ETag"]
+                )
+                for part in parts
+            ],
+            missing_parts=[
+                number
+                for number in range(1, db_video.part_count + 1)
+                if number not in uploaded
+            ],
+        )
+
+    def complete_upload(self, video_id: UUID) -> VideoResponse:
+        """
+        Method for completing an upload once all parts are in S3.
+
+        Queues the transcoding and thumbnail job in the same transaction
+        that marks the video as processing.
+
+        Raises:
+            HTTPException: If parts are missing (status code 409), S3 fails
+            (status code 502) or a general database error occurs (status
+            code 500).
+        """
+        db_video = self._get_uploading(video_id)
+        progress = self.get_progress(video_id)
+        if progress.missing_parts:
+            raise HTTPException(
+                status_code=HTTP_409_CONFLICT,
+                detail=f"Parts still missing: {progress.missing_parts[:20]}.",
+            )
+
+        parts = [
+            {"PartNumber": part.part_number, "ETag": part.etag}
+            for part in progress.uploaded_parts
+        ]
+        try:
+            storage.complete_multipart_upload(
+                db_video.s3_key, db_video.upload_id, parts
+            )
+        except (BotoCoreError, ClientError) as e:
+            raise _storage_error("completing upload", e) from e
+
+        try:
+            with transaction_context(self.db):
+                db_video.upload_id = None
+                db_video.status = VideoStatusEnum.PROCESSING
+                db_video.completed_at = datetime.now(timezone.utc)
+                enqueue(
+                    self.db,
+                    topic=VIDEO_PROCESS_TOPIC,
+                    payload={"video_id": str(db_video.id)},
+                    idempotency_key=f"video:{db_video.id}",
+                )
+
+            return VideoResponse.model_validate(db_video)
+
+        except SQLAlchemyError as e:
+            logger.error("Database error completing video upload: %s", e)
+            raise HTTPException(
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error.",
+            ) from e
+
+    def abort_upload(self, video_id: UUID) -> dict:
+        """Method for cancelling an upload and freeing its parts in S3."""
+        db_video = self._get_uploading(video_id)
+        try:
+            storage.abort_multipart_upload(db_video.s3_key, db_video.upload_id)
+        except (BotoCoreError, ClientError) as e:
+            raise _storage_error("aborting upload", e) from e
+
+        try:
+            with transaction_context(self.db):
+                self.db.delete(db_video)
+            return {"message": f"Upload of video {video_id} cancelled."}
+
+        except SQLAlchemyError as e:
+            logger.error("Database error cancelling video upload: %s", e)
+            raise HTTPException(
+                status_code=HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Internal server error.",
+            ) from e
+
+    def get_links(self, video_id: UUID) -> VideoLinksResponse:
+        """
+        Method returning presigned download links of a video.
+
+        The links support range requests, so players can seek and downloads
+        can resume. The transcoded video and thumbnail are only linked once
+        processing has finished.
+        """
+        db_video = self.get_video_by_id(video_id)
+        if db_video.status == VideoStatusEnum.UPLOADING:
+            raise HTTPException(
+                status_code=HTTP_409_CONFLICT,
+                detail=f"Video {video_id} is still being uploaded.",
+            )
+
+        ready = db_video.status == VideoStatusEnum.READY
+        return VideoLinksResponse(
+            video_id=db_video.id,
+            status=db_video.status,
+            original_url=storage.presigned_url(
+                db_video.s3_key, filename=db_video.filename
+            ),
+            video_url=storage.presigned_url(db_video.transcoded_key) if ready else None,
+            thumbnail_url=(
+                storage.presigned_url(db_video.thumbnail_key) if ready else None
+            ),
+            expires_in=VIDEO_URL_EXPIRES_SECONDS,
+        )
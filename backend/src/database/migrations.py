@@ -0,0 +1,510 @@
+"""
+Versioned schema migrations.
+
+Migrations run in version order and are recorded in `schema_migrations`;
+an advisory lock makes concurrent runs (several workers or deploys)
+apply each one once. A migration runs in one transaction, unless it is
+declared with transactional=False, which online DDL such as CREATE INDEX
+CONCURRENTLY needs.
+
+    python scripts/migrate.py
+"""
+
+import logging
+import time
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import Enum, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+from core.config import MIGRATION_LOCK_TIMEOUT
+from database.partitions import (
+    ensure_partitions,
+    list_partitions,
+    partitioned_tables,
+    relkind,
+)
+from models import (  # noqa: F401  registers every table on Base.metadata
+    booking,
+    car,
+    hotel,
+    invalidation,
+    maintenance,
+    outbox,
+    payments,
+    rollups,
+    transaction,
+    user,
+    video,
+    voucher,
+)
+from models.base import Base
+from utils.contacts import normalize_email, normalize_phone
+from utils.user_dedup import dedup_users
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the migration runner's advisory lock.
+MIGRATION_LOCK_ID = 7_340_036
+
+# Columns models gained after init_db (create_all) created their tables.
+# create_all never alters an existing table, so a database from before
+# migrations has these tables without them. Later additions are migrations
+# of their own (0003, 0004).
+PRE_MIGRATION_COLUMNS = {
+    "hotel": ["availability_url"],
+    "booking": [
+        "car_id",
+        "user_id",
+        "hotel_id",
+        "voucher_id",
+        "email",
+        "package",
+        "track_date",
+        "laps",
+        "total_amount",
+        "status",
+        "idempotency_key",
+        "created_at",
+    ],
+    "transaction": ["provider_reference", "created_at"],
+    "payments": [
+        "booking_id",
+        "transaction_id",
+        "amount",
+        "status",
+        "idempotency_key",
+        "created_at",
+    ],
+}
+
+
+class Migration:
+    def __init__(
+        self,
+        version: str,
+        upgrade: Callable[[Connection], None],
+        transactional: bool = True,
+    ):
+        self.version = version
+        self.upgrade = upgrade
+        self.transactional = transactional
+        self.description = (upgrade.__doc__ or upgrade.__name__).strip().splitlines()[0]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: str, transactional: bool = True):
+    """Register the decorated function as the migration `version`."""
+
+    def register(upgrade: Callable[[Connection], None]):
+        MIGRATIONS.append(Migration(version, upgrade, transactional))
+        return upgrade
+
+    return register
+
+
+def _index_is_valid(connection: Connection, name: str) -> Optional[bool]:
+    return connection.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+
+
+def _create_index(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: str,
+    unique: bool,
+    where: Optional[str] = None,
+):
+    quote = connection.dialect.identifier_preparer.quote
+    # A failed CONCURRENTLY build leaves an invalid index behind that
+    # IF NOT EXISTS would keep forever.
+    if _index_is_valid(connection, name) is False:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY {quote(name)}"))
+    connection.execute(
+        text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS"
+            f" {quote(name)} ON {quote(table)} ({columns})"
+            + (f" WHERE {where}" if where else "")
+        )
+    )
+
+
+def create_index_concurrently(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: Iterable[str],
+    unique: bool = False,
+    where: Optional[str] = None,
+):
+    """
+    Build an index without blocking writes to the table, partial if `where`
+    is given (not supported on partitioned tables).
+
+    Needs an autocommit connection (transactional=False migration). Safe to
+    re-run after a failure. Partitioned tables cannot be indexed
+    concurrently directly: the index is declared on the parent only, built
+    concurrently on every partition and attached; the parent index becomes
+    valid once all partitions are attached, and partitions created later
+    get it automatically.
+    """
+    quote = connection.dialect.identifier_preparer.quote
+    columns = list(columns)
+    column_list = ", ".join(quote(column) for column in columns)
+
+    if relkind(connection, table) != "p":
+        _create_index(connection, name, table, column_list, unique, where)
+        return
+    if where:
+        raise ValueError("Partitioned tables cannot have partial indexes here.")
+
+    connection.execute(
+        text(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {quote(name)}"
+            f" ON ONLY {quote(table)} ({column_list})"
+        )
+    )
+    for partition in list_partitions(connection, table):
+        child = f"{partition}_{'_'.join(columns)}_idx"
+        _create_index(connection, child, partition, column_list, unique)
+        # A no-op for a partition attached in an earlier, interrupted run
+        connection.execute(
+            text(f"ALTER INDEX {quote(name)} ATTACH PARTITION {quote(child)}")
+        )
+
+
+def _constraint_exists(connection: Connection, table: str, name: str) -> bool:
+    return (
+        connection.execute(
+            text(
+                "SELECT 1 FROM pg_constraint"
+                " WHERE conrelid = to_regclass(:table) AND conname = :name"
+            ),
+            {
+                "table": connection.dialect.identifier_preparer.quote(table),
+                "name": name,
+            },
+        ).scalar()
+        is not None
+    )
+
+
+def add_columns(connection: Connection, table_name: str, names: Iterable[str]):
+    """
+    Add model columns missing from an existing table, as create_all would
+    have declared them: type (creating enum types), NOT NULL, server
+    default, foreign keys, index and uniqueness.
+
+    NOT NULL columns without a server default can only be added while the
+    table is empty, which the tables of PRE_MIGRATION_COLUMNS were: the
+    application did not write them before these columns existed.
+    """
+    quote = connection.dialect.identifier_preparer.quote
+    table = Base.metadata.tables[table_name]
+    for column in (table.c[name] for name in names):
+        if isinstance(column.type, Enum):
+            column.type.create(connection, checkfirst=True)
+        definition = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.execute(
+            text(
+                f"ALTER TABLE {quote(table.name)}"
+                f" ADD COLUMN IF NOT EXISTS {definition}"
+            )
+        )
+        for foreign_key in column.foreign_keys:
+            name = f"{table.name}_{column.name}_fkey"
+            if _constraint_exists(connection, table.name, name):
+                continue
+            target = foreign_key.column
+            connection.execute(
+                text(
+                    f"ALTER TABLE {quote(table.name)} ADD CONSTRAINT {quote(name)}"
+                    f" FOREIGN KEY ({quote(column.name)})"
+                    f" REFERENCES {quote(target.table.name)} ({quote(target.name)})"
+                )
+            )
+        if column.index or column.unique:
+            # The names create_all gives them: an index, or a constraint
+            name = (
+                f"ix_{table.name}_{column.name}"
+                if column.index
+                else f"{table.name}_{column.name}_key"
+            )
+            connection.execute(
+                text(
+                    f"CREATE {'UNIQUE ' if column.unique else ''}INDEX IF NOT EXISTS"
+                    f" {quote(name)} ON {quote(table.name)} ({quote(column.name)})"
+                )
+            )
+
+
+@migration("0001")
+def create_schema(connection: Connection):
+    """Create the tables of all models and the monthly partitions."""
+    # Needed by the GiST exclusion constraint on maintenance windows.
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+    Base.metadata.create_all(bind=connection)
+    # Brings tables created by init_db before migrations up to date.
+    for table_name, names in PRE_MIGRATION_COLUMNS.items():
+        add_columns(connection, table_name, names)
+    for table in partitioned_tables():
+        ensure_partitions(connection, table)
+
+
+@migration("0002", transactional=False)
+def index_rollup_windows(connection: Connection):
+    """Index the time columns the rollup job reads new rows by."""
+    create_index_concurrently(
+        connection, "ix_transaction_created_at", "transaction", ["created_at"]
+    )
+    create_index_concurrently(
+        connection, "ix_voucher_issued_at", "voucher", ["issued_at"]
+    )
+
+
+def _backfill_user_contacts(connection: Connection, batch_size: int = 10_000):
+    # Keyset batches, each in its own short transaction.
+    after = None
+    while True:
+        with connection.engine.begin() as batch:
+            rows = batch.execute(
+                text(
+                    'SELECT id, email, phone_number, country_code FROM "user"'
+                    " WHERE (CAST(:after AS uuid) IS NULL OR id > :after)"
+                    " ORDER BY id LIMIT :limit"
+                ),
+                {"after": after, "limit": batch_size},
+            ).all()
+            if not rows:
+                return
+            batch.execute(
+                text(
+                    'UPDATE "user" SET email_normalized = :email, phone_e164 = :phone'
+                    " WHERE id = :id"
+                ),
+                [
+                    {
+                        "id": row.id,
+                        "email": normalize_email(row.email),
+                        "phone": normalize_phone(row.phone_number, row.country_code),
+                    }
+                    for row in rows
+                ],
+            )
+        after = rows[-1].id
+
+
+@migration("0003", transactional=False)
+def normalize_user_contacts(connection: Connection):
+    """Normalize user emails and phones, merge duplicates and index both."""
+    connection.execute(
+        text(
+            'ALTER TABLE "user"'
+            " ADD COLUMN IF NOT EXISTS email_normalized varchar,"
+            " ADD COLUMN IF NOT EXISTS phone_e164 varchar"
+        )
+    )
+    _backfill_user_contacts(connection)
+    # The unique index cannot be built while duplicates exist.
+    dedup_users(connection.engine)
+    create_index_concurrently(
+        connection,
+        "ix_user_email_normalized",
+        "user",
+        ["email_normalized"],
+        unique=True,
+    )
+    create_index_concurrently(connection, "ix_user_phone_e164", "user", ["phone_e164"])
+    connection.execute(
+        text('ALTER TABLE "user" ALTER COLUMN email_normalized SET NOT NULL')
+    )
+
+
+@migration("0004", transactional=False)
+def track_booking_changes(connection: Connection):
+    """Add booking.updated_at, which the rollups find changed days by."""
+    connection.execute(
+        text(
+            "ALTER TABLE booking ADD COLUMN IF NOT EXISTS"
+            " updated_at timestamptz NOT NULL DEFAULT now()"
+        )
+    )
+    create_index_concurrently(
+        connection, "ix_booking_updated_at", "booking", ["updated_at"]
+    )
+
+
+@migration("0005")
+def number_invalidation_messages(connection: Connection):
+    """Create the sequence the invalidation bus numbers its messages with."""
+    connection.execute(text("CREATE SEQUENCE IF NOT EXISTS invalidation_message_id"))
+
+
+@migration("0006")
+def index_unique_references(connection: Connection):
+    """Make booking idempotency keys and provider references globally unique."""
+    Base.metadata.create_all(
+        bind=connection,
+        tables=[
+            booking.BookingIdempotencyKey.__table__,
+            transaction.TransactionReference.__table__,
+        ],
+    )
+    # Per-partition uniqueness let a value repeat in different months; the
+    # oldest row keeps it.
+    for key_table, key, table, column in (
+        ("bookingidempotencykey", "key, booking_id", "booking", "idempotency_key"),
+        (
+            "transactionreference",
+            "reference, transaction_id",
+            "transaction",
+            "provider_reference",
+        ),
+    ):
+        inserted = connection.execute(
+            text(
+                f'INSERT INTO {key_table} ({key}) SELECT {column}, id FROM "{table}"'
+                " ORDER BY id ON CONFLICT DO NOTHING"
+            )
+        ).rowcount
+        total = connection.execute(text(f'SELECT count(*) FROM "{table}"')).scalar()
+        if total > inserted:
+            logger.warning(
+                "%s rows of %s repeat the %s of an older row.",
+                total - inserted,
+                table,
+                column,
+            )
+
+
+@migration("0007")
+def price_hotel_nights(connection: Connection):
+    """Add hotel.price_per_night, which checkout adds to the booking total."""
+    add_columns(connection, "hotel", ["price_per_night"])
+
+
+@migration("0008", transactional=False)
+def lease_outbox_messages(connection: Connection):
+    """Add the in-progress outbox status and the index of expired leases."""
+    # Committed on its own: a new enum value cannot be used in the
+    # transaction that adds it.
+    connection.execute(
+        text("ALTER TYPE outboxstatusenum ADD VALUE IF NOT EXISTS 'IN_PROGRESS'")
+    )
+    create_index_concurrently(
+        connection,
+        "outboxmessage_in_progress_idx",
+        "outboxmessage",
+        ["available_at"],
+        where="status = 'IN_PROGRESS'",
+    )
+
+
+@migration("0009")
+def renormalize_trunk_zero_phones(connection: Connection):
+    """Re-normalize phones written with a bracketed trunk 0, e.g. +44 (0)20."""
+    rows = connection.execute(
+        text(
+            'SELECT id, phone_number, country_code FROM "user"'
+            r" WHERE phone_number ~ '\(\s*0\s*\)'"
+        )
+    ).all()
+    if rows:
+        connection.execute(
+            text('UPDATE "user" SET phone_e164 = :phone WHERE id = :id'),
+            [
+                {
+                    "id": row.id,
+                    "phone": normalize_phone(row.phone_number, row.country_code),
+                }
+                for row in rows
+            ],
+        )
+
+
+def _ensure_version_table(connection: Connection):
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version varchar PRIMARY KEY,"
+            " description varchar NOT NULL,"
+            " applied_at timestamptz NOT NULL DEFAULT now())"
+        )
+    )
+
+
+def applied_versions(connection: Connection) -> List[str]:
+    _ensure_version_table(connection)
+    return list(
+        connection.execute(text("SELECT version FROM schema_migrations")).scalars()
+    )
+
+
+def _record(connection: Connection, migration: Migration):
+    connection.execute(
+        text("INSERT INTO schema_migrations (version, description) VALUES (:v, :d)"),
+        {"v": migration.version, "d": migration.description},
+    )
+
+
+def _apply(engine: Engine, migration: Migration):
+    if migration.transactional:
+        with engine.begin() as connection:
+            connection.execute(
+                text(f"SET LOCAL lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'")
+            )
+            migration.upgrade(connection)
+            _record(connection, migration)
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(f"SET lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'"))
+        try:
+            migration.upgrade(connection)
+            _record(connection, migration)
+        finally:
+            connection.execute(text("RESET lock_timeout"))
+
+
+def migrate(engine: Optional[Engine] = None) -> List[str]:
+    """
+    Apply the pending migrations in version order.
+
+    Returns:
+        List[str]: Versions applied by this run.
+    """
+    if engine is None:
+        from database.session import engine
+
+    applied = []
+    # The lock is held by its own autocommit connection: an open transaction
+    # would make CREATE INDEX CONCURRENTLY wait for it forever.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as lock:
+        lock.execute(select(func.pg_advisory_lock(MIGRATION_LOCK_ID)))
+        try:
+            done = set(applied_versions(lock))
+            for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+                if migration.version in done:
+                    continue
+                started = time.perf_counter()
+                logger.info(
+                    "Applying migration %s: %s",
+                    migration.version,
+                    migration.description,
+                )
+                _apply(engine, migration)
+                logger.info(
+                    "Applied migration %s in %.1f s",
+                    migration.version,
+                    time.perf_counter() - started,
+                )
+                applied.append(migration.version)
+        finally:
+            lock.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_ID)))
+    return applied
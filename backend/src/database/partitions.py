@@ -0,0 +1,166 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from core.config import MIGRATION_LOCK_TIMEOUT, PARTITION_MONTHS_AHEAD
+from models.base import Base, uuid7_floor
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the partition job's advisory lock.
+PARTITION_LOCK_ID = 7_340_035
+
+
+def partitioned_tables(metadata=Base.metadata) -> List[Table]:
+    """Tables declared with `monthly_partitions`."""
+    return [
+        table
+        for table in metadata.sorted_tables
+        if table.info.get("partitioned_by_month")
+    ]
+
+
+def months_from(moment: datetime, count: int) -> Iterator[datetime]:
+    """First instants (UTC) of `count` consecutive months, starting with moment's."""
+    year, month = moment.year, moment.month
+    for _ in range(count):
+        yield datetime(year, month, 1, tzinfo=timezone.utc)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def relkind(connection: Connection, name: str) -> Optional[str]:
+    """pg_class.relkind of a relation: "r" table, "p" partitioned table, "i" index..."""
+    return connection.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+
+
+def list_partitions(connection: Connection, name: str) -> List[str]:
+    return list(
+        connection.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits"
+                " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+                " WHERE pg_inherits.inhparent = to_regclass(:name)"
+                " ORDER BY child.relname"
+            ),
+            {"name": name},
+        ).scalars()
+    )
+
+
+def wanted_partitions(
+    table: Table, now: datetime, months_ahead: int
+) -> List[Tuple[str, str]]:
+    """(name, bounds) of the partitions `table` should have at `now`."""
+    months = list(months_from(now, months_ahead + 2))
+    partitions = [
+        (
+            f"{table.name}_{lower:%Y_%m}",
+            f"FOR VALUES FROM ('{uuid7_floor(lower)}') TO ('{uuid7_floor(upper)}')",
+        )
+        for lower, upper in zip(months, months[1:])
+    ]
+    # Catches keys outside every month, e.g. UUID4 keys of rows written
+    # before the table switched to UUIDv7, so such inserts never fail.
+    partitions.append((f"{table.name}_default", "DEFAULT"))
+    return partitions
+
+
+def ensure_partitions(
+    connection: Connection,
+    table: Table,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """
+    Create the missing partitions of `table`, this month and `months_ahead` more.
+
+    New partitions are empty, so their per-partition unique indexes are
+    built instantly. Creating a partition briefly locks the parent table
+    and scans the default partition, which is empty in normal operation.
+
+    Returns:
+        List[str]: Names of the partitions created.
+    """
+    if relkind(connection, table.name) != "p":
+        logger.warning(
+            "Table %s is not partitioned; it predates monthly partitioning and "
+            "has to be rebuilt to use it.",
+            table.name,
+        )
+        return []
+
+    quote = connection.dialect.identifier_preparer.quote
+    existing = set(list_partitions(connection, table.name))
+    created = []
+    now = now or datetime.now(timezone.utc)
+    for name, bounds in wanted_partitions(table, now, months_ahead):
+        if name in existing:
+            continue
+        connection.execute(
+            text(
+                f"CREATE TABLE {quote(name)} PARTITION OF {quote(table.name)} {bounds}"
+            )
+        )
+        for column in table.info["partition_unique"]:
+            connection.execute(
+                text(
+                    f"CREATE UNIQUE INDEX {quote(f'{name}_{column}_key')}"
+                    f" ON {quote(name)} ({quote(column)})"
+                )
+            )
+        created.append(name)
+    return created
+
+
+def maintain_partitions(engine: Engine) -> bool:
+    """
+    Create upcoming monthly partitions of every partitioned table.
+
+    Runs daily, so a run that gave up on a busy table is retried long before
+    the partitions it wanted are needed. An advisory lock keeps concurrent
+    runs from several workers from overlapping.
+
+    Returns:
+        bool: False if another worker was already running the job.
+    """
+    with engine.begin() as connection:
+        locked = connection.execute(
+            select(func.pg_try_advisory_xact_lock(PARTITION_LOCK_ID))
+        ).scalar()
+        if not locked:
+            return False
+
+        connection.execute(text(f"SET LOCAL lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'"))
+        for table in partitioned_tables():
+            created = ensure_partitions(connection, table)
+            if created:
+                logger.info("Created partitions %s of %s.", created, table.name)
+    return True
+
+
+def _build_scheduler() -> BackgroundScheduler:
+    from database.session import engine
+
+    scheduler = BackgroundScheduler(daemon=True)
+    scheduler.add_job(
+        maintain_partitions,
+        "interval",
+        args=[engine],
+        days=1,
+        # Also once right after startup
+        next_run_time=datetime.now(timezone.utc) + timedelta(seconds=30),
+        id="maintain_partitions",
+        max_instances=1,
+        coalesce=True,
+    )
+    return scheduler
+
+
+partition_scheduler = _build_scheduler()
@@ -0,0 +1,205 @@
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from core.config import (
+    DB_READ_YOUR_WRITES_SECONDS,
+    DB_REPLICA_CHECK_SECONDS,
+    DB_REPLICA_MAX_LAG_SECONDS,
+    DB_REPLICA_STRATEGY,
+    DB_REPLICA_URLS,
+)
+from database.session import Session, create_db_engine, engine
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Cookie holding the time until which a client reads from the primary.
+PIN_COOKIE = "nurblife_primary_until"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Seconds behind the primary. Zero when the replica has replayed everything
+# it received, so an idle primary does not make its replicas look stale.
+LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class Replica:
+    def __init__(self, name: str, replica_engine: Engine, max_staleness: float):
+        self.name = name
+        self.engine = replica_engine
+        # Unknown until the first check, so the replica is not used before it.
+        self.lag = math.inf
+        self.session_factory = sessionmaker(
+            autoflush=False,
+            bind=replica_engine,
+            info={"replica": name, "max_staleness": max_staleness},
+        )
+
+    def connections(self) -> int:
+        return self.engine.pool.checkedout()
+
+
+class ReplicaRouter:
+    """
+    Picks the database read-only requests run on.
+
+    Replicas whose last measured lag is over `max_lag` are skipped; with no
+    usable replica, reads go to the primary. A background thread measures
+    the lag of every replica every `check_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        strategy: str = DB_REPLICA_STRATEGY,
+        max_lag: float = DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = DB_REPLICA_CHECK_SECONDS,
+    ):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.lag <= self.max_lag]
+        if not healthy:
+            return None
+        if self.strategy == "least_connections":
+            return min(healthy, key=Replica.connections)
+        return healthy[next(self._counter) % len(healthy)]
+
+    def check_lag(self) -> None:
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    replica.lag = float(connection.execute(LAG_QUERY).scalar())
+            except Exception as e:
+                logger.warning("Replica %s lag check failed: %s", replica.name, e)
+                replica.lag = math.inf
+            metrics.set_gauge(
+                "db_replica_lag_seconds", replica.lag, replica=replica.name
+            )
+
+    def start(self) -> None:
+        if not self.replicas or (self._thread and self._thread.is_alive()):
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="replica-lag-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.check_lag()
+            self._stopped.wait(self.check_interval)
+
+
+def _build_router() -> ReplicaRouter:
+    # A read cached from a replica may be this old; see EntityCache.get_or_load.
+    max_staleness = DB_REPLICA_MAX_LAG_SECONDS + DB_REPLICA_CHECK_SECONDS
+    replicas = [
+        Replica(f"replica{index}", create_db_engine(url), max_staleness)
+        for index, url in enumerate(DB_REPLICA_URLS, start=1)
+    ]
+    return ReplicaRouter(replicas)
+
+
+replica_router = _build_router()
+
+
+def is_pinned(request: Request) -> bool:
+    """Whether the client wrote recently and must read its writes from the primary."""
+    try:
+        return int(request.cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only endpoints, on a replica when one is usable.
+
+    Falls back to the primary when the client is pinned to it or when every
+    replica lags too much.
+    """
+    replica = None if is_pinned(request) else replica_router.choose()
+    metrics.inc("db_reads_total", target=replica.name if replica else "primary")
+
+    db = replica.session_factory() if replica else Session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def read_engine() -> Engine:
+    """Engine for long read-only scans such as exports."""
+    replica = replica_router.choose()
+    return replica.engine if replica else engine
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware pinning a client to the primary after it writes.
+
+    A successful request with an unsafe method sets a short-lived cookie;
+    get_read_db sends the client's reads to the primary until it expires,
+    whichever worker serves them.
+    """
+
+    def __init__(self, app, window: int = DB_READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or not self.window
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = int(time.time()) + self.window
+                cookie = (
+                    f"{PIN_COOKIE}={until}; Max-Age={self.window}; Path=/; "
+                    "HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode())
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_pin)
@@ -1,17 +1,49 @@
+import os
+
 from sqlalchemy import create_engine, Column
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
-from core.config import DB_URL
+from core.config import DB_PREPARE_THRESHOLD, DB_QUERY_CACHE_SIZE, DB_URL
 
-from models.base import Base
 
 DATABASE_URL = DB_URL
 
-engine = create_engine(DATABASE_URL, pool_size=5, max_overflow=10)
+
+def engine_connect_args(url) -> dict:
+    """
+    Driver arguments enabling server-side prepared statements where supported.
+
+    psycopg (3) prepares a statement on the server after it has been executed
+    `prepare_threshold` times on a connection. psycopg2 has no such option.
+    """
+    if make_url(url).get_driver_name() == "psycopg":
+        return {"prepare_threshold": DB_PREPARE_THRESHOLD}
+    return {}
+
+
+def create_db_engine(url):
+    """Engine with the pool and statement cache settings shared by all databases."""
+    db_engine = create_engine(
+        url,
+        pool_size=5,
+        max_overflow=10,
+        query_cache_size=DB_QUERY_CACHE_SIZE,
+        connect_args=engine_connect_args(url),
+    )
+    # A forked worker must not reuse the parent's connections.
+    os.register_at_fork(after_in_child=lambda: db_engine.dispose(close=False))
+    return db_engine
+
+
+engine = create_db_engine(DATABASE_URL)
 Session = sessionmaker(autoflush=False, bind=engine)
 
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    """Create or upgrade the schema, see database.migrations."""
+    from database.migrations import migrate
+
+    migrate(engine)
 
 
 def get_db():
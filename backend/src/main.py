@@ -1,12 +1,144 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import signal
+import threading
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 import uvicorn
 
+from api.v1.routes import api_router
+from core.config import (
+    CALENDAR_CONCURRENCY_LIMIT,
+    CALENDAR_QUEUE_LIMIT,
+    CALENDAR_QUEUE_TIMEOUT,
+    CALENDAR_RATE_BURST,
+    CALENDAR_RATE_LIMIT,
+    HOTEL_AVAILABILITY_CONCURRENCY_LIMIT,
+    HOTEL_AVAILABILITY_QUEUE_LIMIT,
+    HOTEL_AVAILABILITY_QUEUE_TIMEOUT,
+    HOTEL_AVAILABILITY_RATE_BURST,
+    HOTEL_AVAILABILITY_RATE_LIMIT,
+    PROFILING_SAMPLE_RATE,
+)
+from core.logging_config import setup_logging
+from database.partitions import partition_scheduler
+from database.routing import ReadYourWritesMiddleware, replica_router
+from utils.admission import AdmissionControlMiddleware, RouteLimit
+from utils.events import broadcaster
+from utils.hotel_availability import hotel_availability
+from utils.invalidation import invalidation_bus
+from utils.metrics import metrics
+from utils.notifications import notification_dispatcher
+from utils.outbox import outbox_dispatcher
+from utils.profiling import (
+    PROFILING_ENABLED,
+    ProfilingMiddleware,
+    is_profiling_admin,
+    profile_store,
+    route_class,
+)
+from utils.request_id import RequestIDMiddleware
+from utils.rollups import rollup_scheduler
+from utils.video_processing import video_dispatcher
+from utils.warmup import readiness, warm_up
+
+# Structured JSON logs written off the request threads
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+def close_streams_on_sigterm():
+    """
+    Close the SSE streams as soon as the worker gets SIGTERM.
+
+    The server only runs the lifespan shutdown once open responses have
+    finished, which endless streams never do; closing them right away lets
+    the clients reconnect to another worker instead of waiting out the
+    graceful timeout.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_sigterm(signum, frame):
+        broadcaster.stop()
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Every worker listens for writes made by the other workers.
+    invalidation_bus.start()
+    replica_router.start()
+    broadcaster.start(asyncio.get_running_loop())
+    close_streams_on_sigterm()
+    outbox_dispatcher.start()
+    notification_dispatcher.start()
+    video_dispatcher.start()
+    rollup_scheduler.start()
+    partition_scheduler.start()
+    calendar_sync_scheduler.start()
+    # Warm up in the background; /ready reports false until it is done.
+    warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up, app))
+    yield
+    readiness.stop()
+    warm_up_task.cancel()
+    calendar_sync_scheduler.shutdown(wait=False)
+    partition_scheduler.shutdown(wait=False)
+    rollup_scheduler.shutdown(wait=False)
+    video_dispatcher.stop()
+    notification_dispatcher.stop()
+    outbox_dispatcher.stop()
+    broadcaster.stop()
+    hotel_availability.close()
+    replica_router.stop()
+    invalidation_bus.stop()
+
 
 app = FastAPI(
     title="NURBLIFE-EXPERIENCE API",
     description="Experience the legenedary Green Hell Track with our services.",
     version="1.0.0",
+    lifespan=lifespan,
+)
+app.router.route_class = route_class
+
+
+def calendar_route_limit() -> RouteLimit:
+    return RouteLimit(
+        concurrency=CALENDAR_CONCURRENCY_LIMIT,
+        max_queue=CALENDAR_QUEUE_LIMIT,
+        queue_timeout=CALENDAR_QUEUE_TIMEOUT,
+        rate=CALENDAR_RATE_LIMIT,
+        burst=CALENDAR_RATE_BURST,
+    )
+
+
+# Calendar-bound routes get their own budget so a slow Google API cannot
+# exhaust the threadpool used by the cars/hotels endpoints, and so does the
+# hotel availability search, which fans out to every partner. Added before CORS
+# so CORS wraps it: preflights are answered without using the budget and
+# shed responses still carry the CORS headers.
+app.add_middleware(
+    AdmissionControlMiddleware,
+    limits={
+        "/events": calendar_route_limit(),
+        "/check-date": calendar_route_limit(),
+        "/api/v1/hotels/availability": RouteLimit(
+            concurrency=HOTEL_AVAILABILITY_CONCURRENCY_LIMIT,
+            max_queue=HOTEL_AVAILABILITY_QUEUE_LIMIT,
+            queue_timeout=HOTEL_AVAILABILITY_QUEUE_TIMEOUT,
+            rate=HOTEL_AVAILABILITY_RATE_LIMIT,
+            burst=HOTEL_AVAILABILITY_RATE_BURST,
+        ),
+    },
 )
 
 # Add CORS middleware
@@ -18,22 +150,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in: without a token or a sample rate the middleware is not installed.
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, sample_rate=PROFILING_SAMPLE_RATE)
+
+# Reads of a client that just wrote go to the primary, not a lagging replica.
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Outermost, so logs and profiles of every layer carry the request ID.
+app.add_middleware(RequestIDMiddleware)
+
+app.include_router(api_router, prefix="/api/v1")
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    return metrics.render()
+
+
+@app.get("/ready", include_in_schema=False)
+def get_ready():
+    """
+    Readiness probe for the load balancer.
+
+    Returns 200 once warm-up has finished, 503 before that, which includes
+    as long as the database cannot be reached.
+    """
+    status_code = 200 if readiness.is_ready else 503
+    return JSONResponse({"ready": readiness.is_ready}, status_code=status_code)
+
+
+@app.get("/debug/profiles/{profile_id}", include_in_schema=False)
+def get_profile(profile_id: str, x_profile: str = Header(None)):
+    """
+    Download the speedscope profile of a profiled request.
+
+    - **profile_id**: The `X-Profile-ID` header of the profiled response.
+
+    Requires the profiling admin token in the `X-Profile` header.
+    """
+    if not is_profiling_admin(x_profile):
+        raise HTTPException(status_code=403, detail="Profiling access denied.")
+
+    profile = profile_store.load(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+
+    return Response(
+        profile,
+        media_type="application/json",
+        headers={
+            "Content-Disposition": f'attachment; filename="{profile_id}.speedscope.json"'
+        },
+    )
+
+
 # Import functions from google_calendar.py
 try:
-    from utils.google_calendar import get_events, check_date_availability
+    from utils.google_calendar import (
+        calendar_sync_scheduler,
+        check_date_availability,
+        get_events,
+    )
 
     app.get("/events")(get_events)
     app.get("/check-date/{date}")(check_date_availability)
 
 except ImportError as e:
-    print(f"ERROR: Failed to import functions from google_calendar.py: {e}")
-    # Show more information about the error
-    import traceback
-
-    traceback.print_exc()
+    # Log the full traceback before failing the startup
+    logger.exception("Failed to import functions from google_calendar.py: %s", e)
     raise
 
 
 if __name__ == "__main__":
-    print("Starting the server...")
+    logger.info("Starting the server...")
     uvicorn.run("main:app", host="127.0.0.1", port=8000, reload=True)
@@ -1,4 +1,8 @@
+import os
+import threading
+import time
 import uuid
+from datetime import datetime
 
 from sqlalchemy import Column
 from sqlalchemy.dialects.postgresql import UUID
@@ -6,24 +10,82 @@ from sqlalchemy.orm import declarative_base, declarative_mixin, declared_attr
 
 Base = declarative_base()
 
+_uuid7_lock = threading.Lock()
+_uuid7_last = (0, 0)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7).
+
+    The first 48 bits are the Unix time in milliseconds, so new keys land at
+    the right edge of the primary key index instead of on a random page.
+    Within a millisecond the 12 bit `rand_a` field counts up, which keeps
+    the keys of one process strictly increasing.
+    """
+    global _uuid7_last
+    with _uuid7_lock:
+        millis = time.time_ns() // 1_000_000
+        last_millis, counter = _uuid7_last
+        if millis <= last_millis:
+            millis, counter = last_millis, counter + 1
+            if counter > 0xFFF:
+                millis, counter = last_millis + 1, 0
+        else:
+            counter = int.from_bytes(os.urandom(2)) & 0x7FF
+        _uuid7_last = (millis, counter)
+
+    rand_b = int.from_bytes(os.urandom(8)) & ((1 << 62) - 1)
+    value = millis << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+
+def uuid7_floor(moment: datetime) -> uuid.UUID:
+    """Smallest UUIDv7 generated at or after `moment`, for range bounds."""
+    return uuid.UUID(int=int(moment.timestamp() * 1000) << 80)
+
+
+def monthly_partitions(*unique: str) -> dict:
+    """
+    __table_args__ range partitioning a table by month of its UUIDv7 id.
+
+    Partitioning by the key itself keeps `id` a valid primary key and
+    foreign key target: Postgres requires the partition key in every unique
+    constraint. Other unique columns can only be unique per partition; list
+    them in `unique` instead of declaring them unique=True. A value that
+    must be unique across the whole table goes into a small unpartitioned
+    table keyed by it instead (see BookingIdempotencyKey). The partitions
+    are created by `database.partitions`.
+    """
+    return {
+        "postgresql_partition_by": "RANGE (id)",
+        "info": {"partitioned_by_month": True, "partition_unique": unique},
+    }
+
 
 @declarative_mixin
 class BaseMixin:
     """
     Class defining common attributes for all models.
     All models should inherit from this class.
+
+    Append-heavy tables set `__id_version__ = 7` for time-ordered keys.
     """
 
-    id = Column(
-        UUID(as_uuid=True),
-        primary_key=True,
-        index=True,
-        default=uuid.uuid4,
-        unique=True,
-        nullable=False,
-    )
+    __id_version__ = 4
     __name__: str
 
+    @declared_attr  # type: ignore
+    def id(cls):
+        return Column(
+            UUID(as_uuid=True),
+            primary_key=True,
+            index=True,
+            default=uuid7 if cls.__id_version__ == 7 else uuid.uuid4,
+            unique=True,
+            nullable=False,
+        )
+
     @declared_attr  # type: ignore
     def __tablename__(cls) -> str:
         return cls.__name__.lower()
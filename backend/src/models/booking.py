@@ -1,6 +1,68 @@
-from sqlalchemy import Column
-from models.base import Base, BaseMixin
+from sqlalchemy import Column, Date, DateTime, Enum, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from models.base import Base, BaseMixin, monthly_partitions
+from models.enums import BookingStatus, Package
 
 
 class Booking(Base, BaseMixin):
-    pass
\ No newline at end of file
+    """
+    A customer's booking of a car for a track day.
+
+    Attributes:
+        car_id (UUID): Booked car.
+        user_id (UUID): Customer, if known at checkout.
+        hotel_id (UUID): Partner hotel chosen with the package, optional.
+        voucher_id (UUID): Voucher redeemed for the booking, optional.
+        email (str): Address the confirmation is sent to.
+        package (Package): Booked package.
+        track_date (date): Day of the track session.
+        laps (int): Number of laps.
+        total_amount (int): Price in euros.
+        status (BookingStatus): Pending until the payment has gone through.
+        idempotency_key (str): Client supplied key making checkout retries safe.
+            Unique through BookingIdempotencyKey: a partitioned table can
+            only enforce it per partition.
+        created_at (datetime): Time of checkout.
+        updated_at (datetime): Time of the last change, e.g. of the status;
+            the rollups recompute the track days of changed bookings.
+    """
+
+    __id_version__ = 7
+    __table_args__ = monthly_partitions()
+
+    car_id = Column(UUID(as_uuid=True), ForeignKey("car.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user.id"), index=True)
+    hotel_id = Column(UUID(as_uuid=True), ForeignKey("hotel.id"))
+    voucher_id = Column(UUID(as_uuid=True), ForeignKey("voucher.id"))
+    email = Column(String, nullable=False)
+    package = Column(Enum(Package), nullable=False)
+    track_date = Column(Date, nullable=False, index=True)
+    laps = Column(Integer, nullable=False)
+    total_amount = Column(Integer, nullable=False)
+    status = Column(Enum(BookingStatus), nullable=False, default=BookingStatus.PENDING)
+    idempotency_key = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        index=True,
+    )
+
+
+class BookingIdempotencyKey(Base):
+    """
+    Idempotency keys of all bookings, unpartitioned so that each key is
+    unique across every month.
+
+    Written in the checkout transaction; a concurrent retry with the same
+    key fails on the primary key and replays the booking that won.
+    """
+
+    __tablename__ = "bookingidempotencykey"
+
+    key = Column(String, primary_key=True)
+    booking_id = Column(
+        UUID(as_uuid=True), ForeignKey("booking.id"), nullable=False, unique=True
+    )
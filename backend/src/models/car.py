@@ -29,6 +29,7 @@ class Car(Base, BaseMixin):
         price_for_lap (int): Price for a lap in euros.
         seats_count (int): Number of seats in the car.
         in_repair_shop: Shows if the car is unavailable at the moment.
+            Future downtime is stored as CarMaintenance windows.
     """
 
     image = Column(String, nullable=False, unique=True)
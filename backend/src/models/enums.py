@@ -56,3 +56,23 @@ class VoucherStatusEnum(str, Enum):
     ACTIVE_VOUCHER="active_voucher"
     USED_VOUCHER="used_voucher"
     EXPIRED_VOUCHER="expired_voucher"
+
+
+class PaymentStatusEnum(str, Enum):
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class OutboxStatusEnum(str, Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"  # claimed until available_at (the lease)
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class VideoStatusEnum(str, Enum):
+    UPLOADING = "uploading"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float
+from sqlalchemy import Column, Float, Integer, String
 from models.base import Base, BaseMixin
 
 
@@ -10,8 +10,15 @@ class Hotel(Base, BaseMixin):
         image (str): URL or path to the hotel's image. Must be unique and cannot be null.
         link_to_hotel (str): URL linking to the hotel's official website or booking page. 
                              Must be unique and cannot be null.
+        availability_url (str): Partner endpoint answering room availability and
+                                price for a date, optional.
+        price_per_night (int): Price in euros of the night before a track day,
+                               added to bookings that include the hotel.
+                               Hotels without a price cannot be booked.
     """
     image = Column(String, nullable=False, unique=True)
     name = Column(String, nullable=False, unique=True)
     link_to_hotel = Column(String, nullable=False, unique=True)
     distance_from_track = Column(Float, nullable=False)
+    availability_url = Column(String)
+    price_per_night = Column(Integer)
@@ -0,0 +1,7 @@
+from sqlalchemy import Sequence
+from models.base import Base
+
+# IDs of the messages on the invalidation bus, drawn in the publishing
+# transaction so every worker sees the same ID for a message. Values are
+# unique, but concurrent transactions can commit them out of order.
+invalidation_message_id = Sequence("invalidation_message_id", metadata=Base.metadata)
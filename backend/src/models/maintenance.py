@@ -0,0 +1,41 @@
+from sqlalchemy import Column, ForeignKey, String
+from sqlalchemy.dialects.postgresql import ExcludeConstraint, TSTZRANGE, UUID
+from models.base import Base, BaseMixin
+
+
+class CarMaintenance(Base, BaseMixin):
+    """
+    Time range during which a car is in the shop or otherwise unavailable.
+
+    The GiST exclusion constraint rejects overlapping windows for the same
+    car and serves the overlap (`&&`) lookups of the availability queries.
+    It needs the btree_gist extension, created by `init_db`.
+
+    Attributes:
+        car_id (UUID): ID of the car.
+        period (Range): Half-open [start, end) range of the downtime.
+        reason (str): Optional note, e.g. "brake service".
+    """
+
+    car_id = Column(
+        UUID(as_uuid=True), ForeignKey("car.id", ondelete="CASCADE"), nullable=False
+    )
+    period = Column(TSTZRANGE, nullable=False)
+    reason = Column(String(255))
+
+    __table_args__ = (
+        ExcludeConstraint(
+            (car_id, "="),
+            (period, "&&"),
+            name="carmaintenance_no_overlap",
+            using="gist",
+        ),
+    )
+
+    @property
+    def starts_at(self):
+        return self.period.lower
+
+    @property
+    def ends_at(self):
+        return self.period.upper
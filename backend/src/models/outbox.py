@@ -0,0 +1,57 @@
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from models.base import Base, BaseMixin
+from models.enums import OutboxStatusEnum
+
+
+class OutboxMessage(Base, BaseMixin):
+    """
+    Side effect to perform after a transaction commits (transactional outbox).
+
+    Rows are written in the same transaction as the business change and
+    drained in batches by the OutboxDispatcher.
+
+    Attributes:
+        topic (str): Handler name, e.g. "payment.charge".
+        payload (dict): Handler arguments.
+        idempotency_key (str): Unique key passed to the external system.
+        status (OutboxStatusEnum): Pending, in progress (long-running jobs
+            claimed by a dispatcher), sent or failed.
+        attempts (int): Number of dispatch attempts so far.
+        last_error (str): Error of the last failed attempt.
+        available_at (datetime): Earliest time of the next attempt; for a
+            message in progress, when its lease expires.
+        created_at (datetime): Time the message was written.
+        processed_at (datetime): Time the message was sent.
+    """
+
+    topic = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    idempotency_key = Column(String, nullable=False, unique=True)
+    status = Column(
+        Enum(OutboxStatusEnum), nullable=False, default=OutboxStatusEnum.PENDING
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    available_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    processed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Only pending rows are scanned by the dispatcher.
+        Index(
+            "outboxmessage_pending_idx",
+            "available_at",
+            postgresql_where=(status == OutboxStatusEnum.PENDING),
+        ),
+        # Messages whose dispatcher died are found by their expired lease.
+        Index(
+            "outboxmessage_in_progress_idx",
+            "available_at",
+            postgresql_where=(status == OutboxStatusEnum.IN_PROGRESS),
+        ),
+    )
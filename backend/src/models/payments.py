@@ -1,7 +1,30 @@
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
 from models.base import Base, BaseMixin
+from models.enums import PaymentStatusEnum
 
 
 class Payments(Base, BaseMixin):
-    booking_id =""
-    transaction_id =""
\ No newline at end of file
+    """
+    Payment of a booking, charged asynchronously by the outbox dispatcher.
+
+    Attributes:
+        booking_id (UUID): Paid booking.
+        transaction_id (UUID): Provider transaction, set once the charge succeeded.
+        amount (int): Amount in euros.
+        status (PaymentStatusEnum): Pending, succeeded or failed.
+        idempotency_key (str): Key sent to the provider so retries never
+            charge twice.
+        created_at (datetime): Time the payment was requested.
+    """
+
+    booking_id = Column(
+        UUID(as_uuid=True), ForeignKey("booking.id"), nullable=False, index=True
+    )
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("transaction.id"))
+    amount = Column(Integer, nullable=False)
+    status = Column(
+        Enum(PaymentStatusEnum), nullable=False, default=PaymentStatusEnum.PENDING
+    )
+    idempotency_key = Column(String, nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Date, DateTime, Enum, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from models.base import Base
+from models.enums import Package
+
+
+class RevenueRollup(Base):
+    """
+    Confirmed revenue per track day x car x package.
+
+    Maintained per changed day by `utils.rollups.refresh_rollups`; the
+    dashboard reads only this table, never the raw transactions.
+    """
+
+    __tablename__ = "revenuerollup"
+
+    day = Column(Date, primary_key=True)
+    car_id = Column(UUID(as_uuid=True), primary_key=True)
+    package = Column(Enum(Package), primary_key=True)
+    bookings_count = Column(Integer, nullable=False, server_default="0")
+    laps = Column(Integer, nullable=False, server_default="0")
+    revenue = Column(Integer, nullable=False, server_default="0")
+
+
+class VoucherRollup(Base):
+    """
+    Voucher amounts issued, redeemed and expired per day.
+
+    Outstanding liability is issued minus redeemed minus expired.
+    """
+
+    __tablename__ = "voucherrollup"
+
+    day = Column(Date, primary_key=True)
+    issued_count = Column(Integer, nullable=False, server_default="0")
+    issued_amount = Column(Integer, nullable=False, server_default="0")
+    redeemed_amount = Column(Integer, nullable=False, server_default="0")
+    expired_amount = Column(Integer, nullable=False, server_default="0")
+
+
+class RollupWatermark(Base):
+    """
+    Time of the last run of a rollup. The next run recomputes the days with
+    source changes since shortly before it.
+    """
+
+    __tablename__ = "rollupwatermark"
+
+    name = Column(String, primary_key=True)
+    processed_until = Column(DateTime(timezone=True), nullable=False)
@@ -1,6 +1,36 @@
-from sqlalchemy import Column, Integer
-from models.base import Base, BaseMixin
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from models.base import Base, BaseMixin, monthly_partitions
 
 
 class Transaction(Base, BaseMixin):
+    """
+    Charge confirmed by the payment provider.
+
+    Attributes:
+        amount (int): Charged amount in euros.
+        provider_reference (str): Provider's ID of the charge, unique
+            through TransactionReference.
+        created_at (datetime): Time the charge was recorded.
+    """
+
+    __id_version__ = 7
+    __table_args__ = monthly_partitions()
+
     amount = Column(Integer, nullable=False)
+    provider_reference = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class TransactionReference(Base):
+    """
+    Provider references of all transactions, unpartitioned so that a charge
+    is recorded at most once across every month.
+    """
+
+    __tablename__ = "transactionreference"
+
+    reference = Column(String, primary_key=True)
+    transaction_id = Column(
+        UUID(as_uuid=True), ForeignKey("transaction.id"), nullable=False, unique=True
+    )
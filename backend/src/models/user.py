@@ -1,16 +1,40 @@
 from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy.orm import validates
 from models.base import Base, BaseMixin
+from utils.contacts import normalize_email, normalize_phone
 
 
 class User(Base, BaseMixin):
+    """
+    Customer.
+
+    `email_normalized` and `phone_e164` are the lookup forms of the contact
+    details, kept in sync by the validators below. A customer is one row per
+    normalized email; see crud/users.py and utils/user_dedup.py.
+    """
+
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     email = Column(String, nullable=False)
+    email_normalized = Column(String, nullable=False, unique=True, index=True)
     phone_number = Column(String, nullable=False)
     country_code = Column(String, nullable=False)
+    phone_e164 = Column(String, index=True)
     date_of_birth = Column(Date, nullable=False)
     country = Column(String, nullable=False)
     address = Column(String, nullable=False)
     postcode = Column(String, nullable=False)
     town = Column(String, nullable=False)
     comment = Column(String(255))
+
+    @validates("email")
+    def _normalize_email(self, key, email):
+        self.email_normalized = normalize_email(email)
+        return email
+
+    @validates("phone_number", "country_code")
+    def _normalize_phone(self, key, value):
+        phone_number = value if key == "phone_number" else self.phone_number
+        country_code = value if key == "country_code" else self.country_code
+        self.phone_e164 = normalize_phone(phone_number, country_code)
+        return value
@@ -0,0 +1,65 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from models.base import Base, BaseMixin
+from models.enums import VideoStatusEnum
+
+
+class LapVideo(Base, BaseMixin):
+    """
+    Onboard footage of a booking's laps, stored in S3.
+
+    The original is uploaded in parts straight into an S3 multipart upload;
+    the parts already received are listed from S3 itself, so an interrupted
+    upload can be resumed from any worker.
+
+    Attributes:
+        booking_id (UUID): Booking the footage belongs to.
+        filename (str): Original file name.
+        content_type (str): MIME type of the original.
+        size (int): Size of the original in bytes.
+        part_size (int): Size of every part but the last.
+        s3_key (str): Key of the original.
+        upload_id (str): S3 multipart upload ID, cleared once completed.
+        status (VideoStatusEnum): Uploading, processing, ready or failed.
+        transcoded_key (str): Key of the web playable MP4.
+        thumbnail_key (str): Key of the JPEG thumbnail.
+        created_at (datetime): Time the upload started.
+        completed_at (datetime): Time the last part arrived.
+    """
+
+    booking_id = Column(
+        UUID(as_uuid=True), ForeignKey("booking.id"), nullable=False, index=True
+    )
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    part_size = Column(Integer, nullable=False)
+    s3_key = Column(String, nullable=False, unique=True)
+    upload_id = Column(String)
+    status = Column(
+        Enum(VideoStatusEnum), nullable=False, default=VideoStatusEnum.UPLOADING
+    )
+    transcoded_key = Column(String)
+    thumbnail_key = Column(String)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    completed_at = Column(DateTime(timezone=True))
+
+    @property
+    def part_count(self) -> int:
+        return max(1, -(-self.size // self.part_size))
+
+    def expected_part_size(self, part_number: int) -> int:
+        if part_number < self.part_count:
+            return self.part_size
+        return self.size - self.part_size * (self.part_count - 1)
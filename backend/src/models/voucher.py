@@ -6,6 +6,8 @@ from sqlalchemy import Column, DateTime, Enum, Integer, String, func
 
 
 class Voucher(Base, BaseMixin):
+    __id_version__ = 7
+
     code = Column(
         String, nullable=False, unique=True
     )  # Unique code that will be auto generated
@@ -0,0 +1,45 @@
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from models.enums import BookingStatus, Package
+from pydantic import BaseModel, Field, field_validator
+from schemas.user import CustomerDetails
+
+
+class BaseConfig(BaseModel):
+    model_config = {"from_attributes": True}
+
+
+class CheckoutRequest(BaseConfig):
+    car_id: UUID
+    track_date: date
+    laps: int
+    package: Package
+    email: str
+    hotel_id: Optional[UUID] = None
+    # Links the booking to the customer with this email, created if new.
+    # Not part of the booking itself, so excluded from dumps.
+    customer: Optional[CustomerDetails] = Field(default=None, exclude=True)
+
+    @field_validator("laps")
+    @classmethod
+    def validate_laps(cls, v):
+        if v <= 0:
+            raise ValueError("laps must be positive number.")
+        return v
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, v):
+        if "@" not in v.strip(" @"):
+            raise ValueError("email must be a valid email address.")
+        return v.strip()
+
+
+class BookingResponse(CheckoutRequest):
+    id: UUID
+    user_id: Optional[UUID] = None
+    total_amount: int
+    status: BookingStatus
+    created_at: datetime
@@ -1,8 +1,16 @@
-from typing import Optional
+from typing import List, Literal, Optional, get_args
 from uuid import UUID
 
 from models.enums import CarGearboxEnum, DriveTypeEnum, RollcageTypeEnum, SeatsCountEnum
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+
+# Numeric specs the car picker filters and sorts by. power_to_weight is
+# derived: horsepower per tonne.
+CarSpec = Literal[
+    "hp", "nm", "acceleration", "weight", "price_for_lap", "power_to_weight"
+]
+CAR_SPECS = get_args(CarSpec)
 
 
 def validate_horsepower(cls, v, values):
@@ -76,3 +84,37 @@ class CarUpdate(CarCreate):
     rollcage_type: Optional[RollcageTypeEnum] = None
     price_for_lap: Optional[int] = None
     seats_count: Optional[SeatsCountEnum] = None
+
+
+class CarSearch(BaseModel):
+    """
+    Car picker query: inclusive ranges over the numeric specs, allowed enum
+    values, an optional sort and a limit for top-k queries.
+    """
+
+    min_hp: Optional[int] = None
+    max_hp: Optional[int] = None
+    min_nm: Optional[int] = None
+    max_nm: Optional[int] = None
+    min_acceleration: Optional[float] = None
+    max_acceleration: Optional[float] = None
+    min_weight: Optional[int] = None
+    max_weight: Optional[int] = None
+    min_price_for_lap: Optional[int] = None
+    max_price_for_lap: Optional[int] = None
+    min_power_to_weight: Optional[float] = None
+    max_power_to_weight: Optional[float] = None
+    drive: List[DriveTypeEnum] = []
+    gearbox: List[CarGearboxEnum] = []
+    rollcage_type: List[RollcageTypeEnum] = []
+    available_only: bool = False
+    sort_by: Optional[CarSpec] = None
+    descending: bool = False
+    limit: Optional[int] = Field(default=None, gt=0, le=1000)
+
+    def ranges(self):
+        """(spec, min, max) of every spec with at least one bound set."""
+        for spec in CAR_SPECS:
+            low, high = getattr(self, f"min_{spec}"), getattr(self, f"max_{spec}")
+            if low is not None or high is not None:
+                yield spec, low, high
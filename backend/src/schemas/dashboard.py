@@ -0,0 +1,46 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class BaseConfig(BaseModel):
+    model_config = {"from_attributes": True}
+
+
+class RevenueRow(BaseConfig):
+    key: str  # day, car ID or package, depending on the grouping
+    bookings_count: int
+    laps: int
+    revenue: int
+
+
+class RevenueResponse(BaseConfig):
+    start: date
+    end: date
+    group_by: str
+    total_revenue: int
+    rows: List[RevenueRow]
+
+
+class VoucherLiabilityResponse(BaseConfig):
+    as_of: Optional[date] = None
+    issued_count: int
+    issued_amount: int
+    redeemed_amount: int
+    expired_amount: int
+    outstanding_amount: int
+
+
+class UtilisationRow(BaseConfig):
+    day: date
+    booked_cars: int
+    fleet_size: int
+    utilisation: float
+
+
+class UtilisationResponse(BaseConfig):
+    start: date
+    end: date
+    average_utilisation: float
+    days: List[UtilisationRow]
@@ -1,21 +1,52 @@
-from typing import Optional
+import ipaddress
+from datetime import date
+from typing import List, Optional
+from urllib.parse import urlsplit
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 
 class BaseConfig(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class AddHotel(BaseConfig):
+class HotelBase(BaseConfig):
     image: str
     name: str
     link: str
     distance_from_track: float  # distance in km
+    availability_url: Optional[str] = None
+    price_per_night: Optional[int] = None  # euros
 
 
-class HotelResponse(AddHotel):
+class AddHotel(HotelBase):
+    @field_validator("availability_url")
+    @classmethod
+    def validate_availability_url(cls, v):
+        """
+        The server fetches this URL, so it must be a public http(s) endpoint,
+        not a way to reach the internal network.
+        """
+        if v is None:
+            return v
+        url = urlsplit(v.strip())
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError("availability_url must be an http(s) URL.")
+        if url.username or url.password:
+            raise ValueError("availability_url must not carry credentials.")
+        if url.hostname == "localhost" or url.hostname.endswith(".localhost"):
+            raise ValueError("availability_url must be a public address.")
+        try:
+            address = ipaddress.ip_address(url.hostname)
+        except ValueError:
+            return url.geturl()
+        if not address.is_global:
+            raise ValueError("availability_url must be a public address.")
+        return url.geturl()
+
+
+class HotelResponse(HotelBase):
     id: UUID
 
 
@@ -24,3 +55,22 @@ class UpdateHotel(AddHotel):
     name: Optional[str] = None
     link: Optional[str] = None
     distance_from_track: Optional[float] = None
+    availability_url: Optional[str] = None
+    price_per_night: Optional[int] = None
+
+
+class HotelAvailability(BaseConfig):
+    hotel_id: UUID
+    name: str
+    status: str  # ok, timeout, error or no_source
+    available: Optional[bool] = None
+    rooms: Optional[int] = None
+    price: Optional[float] = None
+    currency: Optional[str] = None
+    cached: bool = False
+
+
+class HotelAvailabilityResponse(BaseConfig):
+    date: date
+    complete: bool  # False if some sources did not answer in time
+    hotels: List[HotelAvailability]
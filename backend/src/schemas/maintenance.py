@@ -0,0 +1,40 @@
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, model_validator
+
+
+class BaseConfig(BaseModel):
+    model_config = {"from_attributes": True}
+
+
+class MaintenanceCreate(BaseConfig):
+    car_id: UUID
+    starts_at: datetime
+    ends_at: datetime
+    reason: Optional[str] = None
+
+    @model_validator(mode="after")
+    def validate_range(self):
+        if self.starts_at.tzinfo is None or self.ends_at.tzinfo is None:
+            raise ValueError("starts_at and ends_at must include a timezone.")
+        if self.ends_at <= self.starts_at:
+            raise ValueError("ends_at must be after starts_at.")
+        return self
+
+
+class MaintenanceResponse(MaintenanceCreate):
+    id: UUID
+
+
+class FleetAvailabilityResponse(BaseConfig):
+    starts_at: datetime
+    ends_at: datetime
+    available_car_ids: List[UUID]
+
+
+class MonthAvailabilityResponse(BaseConfig):
+    year: int
+    month: int
+    days: Dict[date, List[UUID]]  # free car IDs per track day
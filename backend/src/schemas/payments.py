@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from models.enums import PaymentStatusEnum
+from pydantic import BaseModel
+
+
+class BaseConfig(BaseModel):
+    model_config = {"from_attributes": True}
+
+
+class PaymentResponse(BaseConfig):
+    id: UUID
+    booking_id: UUID
+    transaction_id: Optional[UUID] = None
+    amount: int
+    status: PaymentStatusEnum
+    created_at: datetime
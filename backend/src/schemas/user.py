@@ -0,0 +1,38 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, field_validator
+
+
+class BaseConfig(BaseModel):
+    model_config = {"from_attributes": True}
+
+
+class CustomerDetails(BaseConfig):
+    first_name: str
+    last_name: str
+    phone_number: str
+    country_code: str
+    date_of_birth: date
+    country: str
+    address: str
+    postcode: str
+    town: str
+    comment: Optional[str] = None
+
+
+class UserCreate(CustomerDetails):
+    email: str
+
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, v):
+        if "@" not in v.strip(" @"):
+            raise ValueError("email must be a valid email address.")
+        return v.strip()
+
+
+class UserResponse(UserCreate):
+    id: UUID
+    phone_e164: Optional[str] = None
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from models.enums import VideoStatusEnum
+from pydantic import BaseModel, Field
+
+
+class BaseConfig(BaseModel):
+    model_config = {"from_attributes": True}
+
+
+class VideoUploadCreate(BaseConfig):
+    booking_id: UUID
+    filename: str
+    content_type: str = "video/mp4"
+    size: int = Field(gt=0)
+
+
+class VideoResponse(BaseConfig):
+    id: UUID
+    booking_id: UUID
+    filename: str
+    content_type: str
+    size: int
+    part_size: int
+    part_count: int
+    status: VideoStatusEnum
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class UploadedPart(BaseConfig):
+    part_number: int
+    size: int
+    etag: str
+
+
+class UploadProgressResponse(BaseConfig):
+    video_id: UUID
+    part_count: int
+    uploaded_parts: List[UploadedPart]
+    missing_parts: List[int]
+
+
+class VideoLinksResponse(BaseConfig):
+    video_id: UUID
+    status: VideoStatusEnum
+    original_url: str
+    video_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    expires_in: int
@@ -0,0 +1,156 @@
+"""
+Production entry point.
+
+    python server.py
+
+Runs the app under gunicorn with uvicorn workers when gunicorn and
+uvicorn-worker are installed: the app is imported once in the master and
+the workers are forked from it, sharing its memory copy-on-write. Without
+them it falls back to uvicorn's own process manager, which starts every worker
+from scratch. Either way uvloop and httptools are used when installed.
+
+`python main.py` remains the single-process development server with
+auto-reload.
+"""
+
+import logging
+import math
+import os
+from importlib.util import find_spec
+
+import uvicorn
+
+from core.config import (
+    FORWARDED_ALLOW_IPS,
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_KEEPALIVE_SECONDS,
+    SERVER_MAX_REQUESTS,
+    SERVER_MAX_REQUESTS_JITTER,
+    SERVER_PORT,
+    WEB_CONCURRENCY,
+)
+from core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def available_cores() -> int:
+    """
+    CPU cores this process may actually use.
+
+    Respects the CPU affinity mask and a cgroup v2 CPU quota, so a
+    container limited to 2 CPUs on a 64-core host starts 2 workers.
+    """
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cores = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+        if quota != "max":
+            cores = min(cores, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return cores
+
+
+def worker_count() -> int:
+    # Async workers are not blocked by I/O; one per core saturates the CPU.
+    return WEB_CONCURRENCY or available_cores()
+
+
+def event_loop() -> str:
+    return "uvloop" if find_spec("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    return "httptools" if find_spec("httptools") else "h11"
+
+
+def run_gunicorn(workers: int) -> None:
+    from gunicorn.app.base import BaseApplication
+
+    class GunicornServer(BaseApplication):
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Runs in the master with preload_app, before the workers fork.
+            from main import app
+
+            return app
+
+    GunicornServer(
+        {
+            "bind": f"{SERVER_HOST}:{SERVER_PORT}",
+            "workers": workers,
+            # Picks uvloop and httptools when they are installed.
+            "worker_class": "uvicorn_worker.UvicornWorker",
+            "preload_app": True,
+            "backlog": SERVER_BACKLOG,
+            "keepalive": SERVER_KEEPALIVE_SECONDS,
+            # Recycle workers to bound slow leaks; the jitter keeps them
+            # from all restarting at once.
+            "max_requests": SERVER_MAX_REQUESTS,
+            "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+            # On SIGTERM, in-flight requests get this long to finish.
+            "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+            "timeout": SERVER_GRACEFUL_TIMEOUT * 2,
+            "forwarded_allow_ips": FORWARDED_ALLOW_IPS,
+            # Logging is set up by the app; the load balancer logs requests.
+            "accesslog": None,
+        }
+    ).run()
+
+
+def run_uvicorn(workers: int) -> None:
+    uvicorn.run(
+        "main:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        workers=workers,
+        loop=event_loop(),
+        http=http_protocol(),
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEPALIVE_SECONDS,
+        # uvicorn restarts a worker that exits after this many requests.
+        limit_max_requests=SERVER_MAX_REQUESTS,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+        log_config=None,
+        access_log=False,
+    )
+
+
+def main():
+    setup_logging()
+    workers = worker_count()
+    # Preloading and forked workers need gunicorn; uvicorn.workers is
+    # deprecated in favour of the uvicorn-worker package.
+    use_gunicorn = all(find_spec(name) for name in ("gunicorn", "uvicorn_worker"))
+    logger.info(
+        "Starting %s workers (loop=%s, http=%s, server=%s)",
+        workers,
+        event_loop(),
+        http_protocol(),
+        "gunicorn" if use_gunicorn else "uvicorn",
+    )
+    if use_gunicorn:
+        run_gunicorn(workers)
+    else:
+        run_uvicorn(workers)
+
+
+if __name__ == "__main__":
+    main()
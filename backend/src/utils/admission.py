@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS, HTTP_503_SERVICE_UNAVAILABLE
+
+from utils.metrics import metrics
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, tokens: float = 1) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            if self._tokens < tokens:
+                return False
+
+            self._tokens -= tokens
+            return True
+
+    def seconds_until_available(self, tokens: float = 1) -> float:
+        with self._lock:
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+
+class RouteLimit:
+    """
+    Admission limits for one route prefix.
+
+    Args:
+        concurrency (int): Requests allowed to run at the same time.
+        max_queue (int): Requests allowed to wait for a slot; more are shed.
+        queue_timeout (float): Seconds a queued request waits before it is shed.
+        rate (float): Sustained requests per second, None disables rate limiting.
+        burst (int): Token bucket capacity.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_queue: int = 0,
+        queue_timeout: float = 1.0,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+    ):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(rate, burst or int(rate) or 1) if rate else None
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying per-route concurrency and rate limits.
+
+    Requests over the limit are rejected immediately with 429/503 and a
+    Retry-After header instead of piling up in the threadpool, so slow
+    upstream-bound routes cannot starve the rest of the API.
+    """
+
+    def __init__(self, app, limits: Dict[str, RouteLimit]):
+        self.app = app
+        # Longest prefix first so "/check-date" wins over "/".
+        self.limits = sorted(limits.items(), key=lambda item: -len(item[0]))
+
+    def _match(self, path: str):
+        # Whole path segments only: "/events" covers "/events/1", not "/eventsx".
+        for prefix, limit in self.limits:
+            if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+                return prefix, limit
+        return None, None
+
+    def _report(self, route: str, limit: RouteLimit) -> None:
+        metrics.set_gauge("admission_queue_depth", limit.waiting, route=route)
+        metrics.set_gauge("admission_in_flight", limit.in_flight, route=route)
+
+    async def _shed(
+        self, scope, receive, send, route, status_code, retry_after, reason
+    ):
+        metrics.inc("admission_shed_total", route=route, reason=reason)
+        response = JSONResponse(
+            {"detail": "Service is busy, please retry later."},
+            status_code=status_code,
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route, limit = self._match(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        if limit.bucket and not limit.bucket.consume():
+            await self._shed(
+                scope,
+                receive,
+                send,
+                route,
+                HTTP_429_TOO_MANY_REQUESTS,
+                limit.bucket.seconds_until_available(),
+                "rate_limited",
+            )
+            return
+
+        if limit.semaphore.locked() and limit.waiting >= limit.max_queue:
+            await self._shed(
+                scope,
+                receive,
+                send,
+                route,
+                HTTP_503_SERVICE_UNAVAILABLE,
+                limit.queue_timeout,
+                "queue_full",
+            )
+            return
+
+        limit.waiting += 1
+        self._report(route, limit)
+        try:
+            await asyncio.wait_for(limit.semaphore.acquire(), limit.queue_timeout)
+        except asyncio.TimeoutError:
+            await self._shed(
+                scope,
+                receive,
+                send,
+                route,
+                HTTP_503_SERVICE_UNAVAILABLE,
+                limit.queue_timeout,
+                "queue_timeout",
+            )
+            return
+        finally:
+            limit.waiting -= 1
+
+        limit.in_flight += 1
+        self._report(route, limit)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.in_flight -= 1
+            limit.semaphore.release()
+            self._report(route, limit)
@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# Key used for the cached "list all" result of a namespace.
+ALL_KEY = "all"
+
+
+class EntityCache:
+    """
+    Thread-safe in-process cache for catalog data (cars, hotels, calendar).
+
+    Entries are grouped by namespace (for example "car") and keyed by entity ID.
+    Entries never expire on their own; they are evicted by the invalidation bus
+    whenever any worker writes to the entity.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Hashable], Any] = {}
+        # When each namespace (or, under "*", everything) was last evicted
+        self._evicted_at: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def _mark_evicted(self, namespace: str) -> None:
+        self._evicted_at[namespace] = time.monotonic()
+
+    def _last_evicted(self, namespace: str) -> float:
+        return max(self._evicted_at.get(namespace, 0.0), self._evicted_at.get("*", 0.0))
+
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._entries.get((namespace, str(key)), default)
+
+    def set(self, namespace: str, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[(namespace, str(key))] = value
+
+    def get_or_load(
+        self,
+        namespace: str,
+        key: Hashable,
+        loader: Callable[[], Any],
+        max_staleness: float = 0.0,
+    ) -> Any:
+        """
+        Return the cached value or call `loader` and cache its result.
+
+        The loader runs outside the lock so a slow query never blocks readers
+        of other entries. Its result is not cached if the namespace was evicted
+        while it ran, or within `max_staleness` seconds before it started: it
+        may have been read before the write that caused the eviction (e.g. from
+        a lagging read replica) and would stay cached until the next write.
+        """
+        sentinel = object()
+        value = self.get(namespace, key, sentinel)
+        if value is not sentinel:
+            return value
+
+        started = time.monotonic()
+        value = loader()
+        with self._lock:
+            if self._last_evicted(namespace) < started - max_staleness:
+                self._entries[(namespace, str(key))] = value
+        return value
+
+    def evict(self, namespace: str, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop((namespace, str(key)), None)
+            self._mark_evicted(namespace)
+
+    def evict_namespace(self, namespace: str) -> None:
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+            self._mark_evicted(namespace)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._mark_evicted("*")
+
+    def handle_invalidation(self, namespace: str, key: str) -> None:
+        """
+        Evict the entries affected by a write to `namespace:key`.
+
+        A changed entity also makes the namespace's cached list stale, so both
+        are evicted. A key of "*" drops the whole namespace.
+        """
+        if key == "*":
+            self.evict_namespace(namespace)
+            return
+
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+            self._entries.pop((namespace, ALL_KEY), None)
+            self._mark_evicted(namespace)
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire after `ttl` seconds.
+
+    For data owned by third parties, where no invalidation is published.
+    Holds at most `max_entries`; the oldest entries are dropped first.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so this is the oldest entry.
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+entity_cache = EntityCache()
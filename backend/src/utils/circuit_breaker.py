@@ -0,0 +1,92 @@
+import threading
+import time
+from typing import Callable, TypeVar
+
+from utils.metrics import metrics
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, retry after {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream for `reset_timeout` seconds.
+
+    After `failure_threshold` consecutive failures (errors or calls slower than
+    `slow_call_seconds`) the circuit opens and calls fail fast with
+    CircuitOpenError. Once the timeout passes a single trial call is let
+    through; it closes the circuit on success and reopens it on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        slow_call_seconds: float = 5.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        metrics.set_gauge(
+            "circuit_breaker_open", int(state != self.CLOSED), breaker=self.name
+        )
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.OPEN and remaining <= 0:
+                self._set_state(self.HALF_OPEN)
+                return
+
+            # Either still open, or a trial call is already in flight.
+            metrics.inc("circuit_breaker_rejected_total", breaker=self.name)
+            raise CircuitOpenError(self.name, max(remaining, 1.0))
+
+    def _record(self, success: bool) -> None:
+        with self._lock:
+            if success:
+                self._failures = 0
+                if self.state != self.CLOSED:
+                    self._set_state(self.CLOSED)
+                return
+
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def call(self, func: Callable[[], T]) -> T:
+        self._before_call()
+
+        started = time.monotonic()
+        try:
+            result = func()
+        except Exception:
+            self._record(success=False)
+            raise
+
+        self._record(success=time.monotonic() - started < self.slow_call_seconds)
+        return result
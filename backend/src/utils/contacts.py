@@ -0,0 +1,46 @@
+import re
+from typing import Optional
+
+_NON_DIGITS = re.compile(r"\D")
+# The trunk 0 some write after the country code: +44 (0)20 7946 0958
+_TRUNK_ZERO = re.compile(r"\(\s*0\s*\)")
+
+# E.164 numbers have at most 15 digits; shorter than 8 is no real number.
+E164_MIN_DIGITS = 8
+E164_MAX_DIGITS = 15
+
+
+def normalize_email(email: str) -> str:
+    """Lookup form of an email address: trimmed and lower-cased."""
+    return email.strip().lower()
+
+
+def normalize_phone(
+    phone_number: Optional[str], country_code: Optional[str]
+) -> Optional[str]:
+    """
+    E.164 form (+359888123456) of a phone number, None if it is not one.
+
+    Numbers starting with + or 00 are taken as international. Anything else
+    is a national number: a leading trunk 0 is dropped and `country_code`
+    (e.g. "+359") is prepended. A trunk 0 in brackets, as in
+    "+44 (0)20 7946 0958", is dropped. Spaces, dashes and brackets are ignored.
+    """
+    if not phone_number:
+        return None
+
+    number = _TRUNK_ZERO.sub("", phone_number).strip()
+    digits = _NON_DIGITS.sub("", number)
+    if number.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    else:
+        prefix = _NON_DIGITS.sub("", country_code or "")
+        if not prefix:
+            return None
+        digits = prefix + (digits[1:] if digits.startswith("0") else digits)
+
+    if not E164_MIN_DIGITS <= len(digits) <= E164_MAX_DIGITS:
+        return None
+    return f"+{digits}"
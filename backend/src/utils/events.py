@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import AsyncIterator, Deque, Optional, Set
+
+from core.config import (
+    EVENTS_CLIENT_QUEUE_SIZE,
+    EVENTS_HEARTBEAT_SECONDS,
+    EVENTS_HISTORY_SIZE,
+    EVENTS_MAX_CLIENTS,
+)
+from utils.invalidation import invalidation_bus
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Sent when events after Last-Event-ID are no longer in the history;
+# the client should refetch everything it shows.
+RESYNC_EVENT = "resync"
+
+# Tells EventSource how long to wait before reconnecting, in milliseconds.
+RETRY_MILLISECONDS = 3000
+
+
+class TooManyClientsError(Exception):
+    """The worker already serves EVENTS_MAX_CLIENTS streams."""
+
+
+class Event:
+    def __init__(self, event_id: Optional[int], event_type: str, data: dict):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+    def encode(self) -> bytes:
+        # Without an id line the client keeps its last event ID.
+        event_id = "" if self.id is None else f"id: {self.id}\n"
+        return (
+            f"{event_id}event: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+        ).encode()
+
+
+_CLOSED = object()
+
+
+class EventBroadcaster:
+    """
+    Fans change events out to the SSE clients connected to this worker.
+
+    Every client is an asyncio queue served by the event loop, so idle
+    connections cost no thread. Events may be published from any thread
+    (invalidation listener, scheduler, threadpool); they are handed to the
+    loop with call_soon_threadsafe.
+
+    Event IDs are the IDs of the invalidation bus messages they come
+    from, the same on every worker, and every worker receives the messages
+    in the same (commit) order. A client that reconnects to a different
+    worker therefore resumes right after its Last-Event-ID in that order;
+    IDs are unique but not necessarily increasing, so they are never
+    compared numerically. Events raised by one worker alone carry no ID
+    and are not kept for replay.
+    """
+
+    def __init__(
+        self,
+        history_size: int = EVENTS_HISTORY_SIZE,
+        queue_size: int = EVENTS_CLIENT_QUEUE_SIZE,
+        max_clients: int = EVENTS_MAX_CLIENTS,
+        heartbeat: float = EVENTS_HEARTBEAT_SECONDS,
+    ):
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self.heartbeat = heartbeat
+        self._history: Deque[Event] = deque(maxlen=history_size)
+        self._clients: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def stop(self) -> None:
+        """Close all streams; clients reconnect to another worker."""
+        if self._loop is None:
+            return
+        loop, self._loop = self._loop, None
+        loop.call_soon_threadsafe(self._close_all)
+
+    def publish(
+        self, event_type: str, data: dict, event_id: Optional[int] = None
+    ) -> None:
+        """
+        Send an event to every client of this worker.
+
+        Args:
+            event_type (str): SSE event name.
+            data (dict): JSON payload.
+            event_id (int): ID of the bus message the event comes from,
+                None for an event of this worker only.
+        """
+        event = Event(event_id, event_type, data)
+        loop = self._loop
+        if loop is None:
+            self._remember(event)
+            return
+        loop.call_soon_threadsafe(self._fan_out, event)
+
+    def _remember(self, event: Event) -> None:
+        if event.id is not None:
+            self._history.append(event)
+
+    def _fan_out(self, event: Event) -> None:
+        self._remember(event)
+        metrics.inc("sse_events_total", type=event.type)
+        for client in list(self._clients):
+            try:
+                client.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow to keep up; it resumes from Last-Event-ID.
+                self._close(client)
+                metrics.inc("sse_clients_dropped_total")
+
+    def _close(self, client: asyncio.Queue) -> None:
+        self._clients.discard(client)
+        while not client.empty():
+            client.get_nowait()
+        client.put_nowait(_CLOSED)
+
+    def _close_all(self) -> None:
+        for client in list(self._clients):
+            self._close(client)
+
+    def _replay(self, last_event_id: Optional[int]):
+        if last_event_id is None:
+            return []
+        history = list(self._history)
+        for position, event in enumerate(history):
+            if event.id == last_event_id:
+                return history[position + 1 :]
+        # Older than the history, or never seen by this worker: a gap we
+        # cannot fill, the client has to start over.
+        return [Event(None, RESYNC_EVENT, {})]
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[bytes]:
+        """
+        Register a client and return its SSE byte stream.
+
+        Raises:
+            TooManyClientsError: If the worker is at `max_clients`.
+        """
+        if len(self._clients) >= self.max_clients:
+            metrics.inc("sse_clients_rejected_total")
+            raise TooManyClientsError()
+
+        client: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._clients.add(client)
+        metrics.set_gauge("sse_clients", len(self._clients))
+        return self._stream(client, self._replay(last_event_id))
+
+    async def _stream(self, client: asyncio.Queue, backlog) -> AsyncIterator[bytes]:
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+            for event in backlog:
+                yield event.encode()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(client.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing the idle connection.
+                    yield b": heartbeat\n\n"
+                    continue
+                if event is _CLOSED:
+                    return
+                yield event.encode()
+        finally:
+            self._clients.discard(client)
+            metrics.set_gauge("sse_clients", len(self._clients))
+
+
+broadcaster = EventBroadcaster()
+
+
+def _push_changes(message_id: Optional[int], namespace: str, key: str):
+    # Writes of this or any other worker arrive here through the bus.
+    if namespace in ("availability", "car", "booking"):
+        broadcaster.publish(
+            "availability", {"source": namespace, "key": key}, event_id=message_id
+        )
+    elif namespace == "*":
+        # Raised locally when the listener (re)connects: changes may be lost.
+        broadcaster.publish(RESYNC_EVENT, {})
+
+
+invalidation_bus.subscribe_messages(_push_changes)
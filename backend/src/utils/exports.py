@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterable, Iterator, List, Type
+from uuid import UUID
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, select
+
+from core.config import EXPORT_BATCH_SIZE
+from models.base import Base
+from models.booking import Booking
+from models.user import User
+from models.voucher import Voucher
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional: the "parquet" extra
+    pa = None
+    pq = None
+
+EXPORTABLE_TABLES = {
+    "users": User,
+    "vouchers": Voucher,
+    "bookings": Booking,
+}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportFormatUnavailableError(Exception):
+    """The requested format needs an optional dependency that is not installed."""
+
+
+def _plain(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def iter_batches(
+    engine, model: Type[Base], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[List[tuple]]:
+    """
+    Stream a table in batches from a server-side cursor.
+
+    Only `batch_size` rows are held in memory at a time, whatever the
+    table size. Rows are plain tuples in column order, no ORM objects.
+    """
+    columns = list(model.__table__.columns)
+    statement = select(*columns).order_by(model.__table__.c.id)
+
+    with engine.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=batch_size
+        ).execute(statement)
+        for partition in result.partitions():
+            yield [tuple(_plain(value) for value in row) for row in partition]
+
+
+def iter_csv(columns: List[str], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_ndjson(columns: List[str], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+            for row in batch
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(column):
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column.type.timezone else None)
+    if isinstance(column.type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def iter_parquet(model: Type[Base], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """Write each batch as one Parquet row group and yield the bytes as they are produced."""
+    if pa is None:
+        raise ExportFormatUnavailableError(
+            "Parquet export needs pyarrow (the parquet extra) installed."
+        )
+
+    columns = list(model.__table__.columns)
+    schema = pa.schema([(column.name, _arrow_type(column)) for column in columns])
+    sink = _ChunkSink()
+
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for batch in batches:
+            arrays = [
+                pa.array([row[index] for row in batch], type=field.type)
+                for index, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_export(
+    engine, table: str, export_format: str, gzip: bool = False
+) -> Iterator[bytes]:
+    """
+    Serialize a whole table as a stream of byte chunks.
+
+    Args:
+        engine: Engine to open the streaming connection on.
+        table (str): One of EXPORTABLE_TABLES.
+        export_format (str): One of EXPORT_FORMATS.
+        gzip (bool): Compress the stream on the fly.
+    """
+    model = EXPORTABLE_TABLES[table]
+    if export_format == "parquet" and pa is None:
+        raise ExportFormatUnavailableError(
+            "Parquet export needs pyarrow (the parquet extra) installed."
+        )
+
+    columns = [column.name for column in model.__table__.columns]
+    batches = iter_batches(engine, model)
+
+    if export_format == "csv":
+        chunks = iter_csv(columns, batches)
+    elif export_format == "ndjson":
+        chunks = iter_ndjson(columns, batches)
+    else:
+        chunks = iter_parquet(model, batches)
+
+    return iter_gzip(chunks) if gzip else chunks
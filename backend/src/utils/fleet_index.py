@@ -0,0 +1,193 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.config import FLEET_INDEX_ENABLED
+from models.car import Car
+from models.enums import CarGearboxEnum, DriveTypeEnum, RollcageTypeEnum
+from schemas.car import CarResponse, CarSearch
+from utils.invalidation import invalidation_bus
+from utils.metrics import metrics
+
+try:
+    import numpy as np
+except ImportError:  # The index is optional, searches fall back to SQL
+    np = None
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_COLUMNS = {
+    "hp": "int32",
+    "nm": "int32",
+    "acceleration": "float64",
+    "weight": "int32",
+    "price_for_lap": "int32",
+}
+ENUM_COLUMNS = {
+    "drive": DriveTypeEnum,
+    "gearbox": CarGearboxEnum,
+    "rollcage_type": RollcageTypeEnum,
+}
+
+
+def _codes(enum) -> Dict:
+    return {member: code for code, member in enumerate(enum)}
+
+
+ENUM_CODES = {column: _codes(enum) for column, enum in ENUM_COLUMNS.items()}
+
+
+class FleetSnapshot:
+    """
+    Column arrays of the cars table at one point in time.
+
+    Row i of every array is `cars[i]`; rows are in id order. Enum columns
+    are stored as small integer codes. power_to_weight is NaN for a car
+    without a weight, which, like NULL in SQL, fails every range and sorts
+    last. A snapshot is never modified, so
+    queries can read it without locking while a newer one is built.
+    """
+
+    def __init__(
+        self, cars: List[CarResponse], in_repair_shop: List[bool], version: int
+    ):
+        self.cars = cars
+        self.version = version
+        self.columns = {
+            spec: np.array([getattr(car, spec) for car in cars], dtype=dtype)
+            for spec, dtype in NUMERIC_COLUMNS.items()
+        }
+        weight = self.columns["weight"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            power_to_weight = self.columns["hp"] * 1000.0 / weight
+        self.columns["power_to_weight"] = np.where(weight == 0, np.nan, power_to_weight)
+        for column, codes in ENUM_CODES.items():
+            self.columns[column] = np.array(
+                [codes[getattr(car, column)] for car in cars], dtype=np.uint8
+            )
+        self.in_repair_shop = np.array(in_repair_shop, dtype=bool)
+
+    def __len__(self):
+        return len(self.cars)
+
+    def _mask(self, search: CarSearch):
+        mask = np.ones(len(self.cars), dtype=bool)
+        for spec, low, high in search.ranges():
+            values = self.columns[spec]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+
+        for column, codes in ENUM_CODES.items():
+            wanted = getattr(search, column)
+            if wanted:
+                # Lookup table indexed by code: one gather instead of isin.
+                allowed = np.zeros(len(codes), dtype=bool)
+                allowed[[codes[value] for value in wanted]] = True
+                mask &= allowed[self.columns[column]]
+
+        if search.available_only:
+            mask &= ~self.in_repair_shop
+        return mask
+
+    def select(self, search: CarSearch):
+        """Row numbers matching `search`, sorted and limited as requested."""
+        rows = np.flatnonzero(self._mask(search))
+        if not search.sort_by:
+            return rows[: search.limit] if search.limit else rows
+
+        keys = self.columns[search.sort_by][rows]
+        if search.descending:
+            keys = -keys
+        limit = search.limit
+        if limit and limit < len(rows):
+            # Top-k: a linear partition finds the k-th key, only rows up to it
+            # are sorted. Rows tied with it are all kept so ties still
+            # resolve in id order, like ORDER BY ..., id.
+            kth = np.partition(keys, limit - 1)[limit - 1]
+            # NaN keys sort last; when the k-th key is NaN, all rows are kept.
+            candidates = np.flatnonzero((keys <= kth) | np.isnan(kth))
+            order = candidates[np.argsort(keys[candidates], kind="stable")][:limit]
+        else:
+            order = np.argsort(keys, kind="stable")
+        return rows[order]
+
+
+class FleetIndex:
+    """
+    In-memory columnar copy of the cars table for the car picker.
+
+    Multi-spec filters, sorts and top-k queries run as vectorized NumPy
+    masks over a few arrays instead of a database round trip per picker
+    change. Every car write, from any worker, arrives through the
+    invalidation bus and marks the snapshot stale; the next query rebuilds
+    it from the primary, so a burst of writes costs one rebuild.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        enabled: bool = FLEET_INDEX_ENABLED,
+    ):
+        self.session_factory = session_factory
+        self.enabled = enabled and np is not None
+        self._snapshot: Optional[FleetSnapshot] = None
+        self._versions = itertools.count(1)
+        self._version = 0
+        self._lock = threading.Lock()
+        if enabled and np is None:
+            logger.warning("numpy is not installed, car searches run in SQL.")
+
+    def invalidate(self):
+        # next() on a count is atomic, so concurrent writes never share a version.
+        self._version = next(self._versions)
+
+    def on_change(self, namespace: str, key: str):
+        if namespace in ("car", "*"):
+            self.invalidate()
+
+    def _build(self, version: int) -> FleetSnapshot:
+        started = time.perf_counter()
+        with self.session_factory() as db:
+            db_cars = db.scalars(select(Car).order_by(Car.id)).all()
+            cars = [CarResponse.model_validate(car) for car in db_cars]
+            in_repair_shop = [car.in_repair_shop for car in db_cars]
+        snapshot = FleetSnapshot(cars, in_repair_shop, version)
+        metrics.set_gauge("fleet_index_build_seconds", time.perf_counter() - started)
+        metrics.set_gauge("fleet_index_cars", len(snapshot))
+        return snapshot
+
+    def snapshot(self) -> FleetSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != self._version:
+                # Read before loading: a write during the build leaves the
+                # new snapshot stale instead of losing the change.
+                version = self._version
+                snapshot = self._build(version)
+                self._snapshot = snapshot
+        return snapshot
+
+    def query(self, search: CarSearch) -> List[CarResponse]:
+        snapshot = self.snapshot()
+        return [snapshot.cars[row] for row in snapshot.select(search)]
+
+
+def _build_index() -> FleetIndex:
+    from database.session import Session
+
+    return FleetIndex(Session)
+
+
+fleet_index = _build_index()
+invalidation_bus.subscribe(fleet_index.on_change)
@@ -1,12 +1,35 @@
 import datetime
+import hashlib
+import json
+import logging
+import math
 import os
+import time
 
 import pytz
+from apscheduler.schedulers.background import BackgroundScheduler
 from dateutil import parser
 from fastapi import HTTPException
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from core.config import (
+    CALENDAR_BREAKER_FAILURES,
+    CALENDAR_BREAKER_RESET_SECONDS,
+    CALENDAR_SLOW_CALL_SECONDS,
+    CALENDAR_SNAPSHOT_MAX_ENTRIES,
+    CALENDAR_SNAPSHOT_TTL_SECONDS,
+    CALENDAR_SYNC_SECONDS,
+)
+from utils.cache import TTLCache
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.events import broadcaster
+from utils.invalidation import invalidation_bus
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
 
 # PATH to my Service Account JSON File
 SERVICE_ACCOUNT_FILE = "/Users/a516095/Documents/cred_ghub/nurblife-453719-c55365f7d993.json"
@@ -27,14 +50,60 @@ try:
     )
 
     service = build("calendar", "v3", credentials=credentials)
-    print("Google API client successfully created")
+    logger.info("Google API client successfully created")
 except Exception as e:
-    print(f"Error initializing Google API client: {e}")
+    logger.error("Error initializing Google API client: %s", e)
     raise
 
 # Adding timezone for Bulgaria - Europe/Sofia
 bulgaria_tz = pytz.timezone("Europe/Sofia")
 
+# Fail fast while Google Calendar is down or slow instead of queuing requests
+calendar_breaker = CircuitBreaker(
+    "google_calendar",
+    failure_threshold=CALENDAR_BREAKER_FAILURES,
+    reset_timeout=CALENDAR_BREAKER_RESET_SECONDS,
+    slow_call_seconds=CALENDAR_SLOW_CALL_SECONDS,
+)
+
+# Last good API response per query, served while the breaker is open.
+# Bounded: /check-date creates one entry per requested date.
+calendar_snapshots = TTLCache(
+    CALENDAR_SNAPSHOT_TTL_SECONDS, max_entries=CALENDAR_SNAPSHOT_MAX_ENTRIES
+)
+
+
+def fetch_calendar_events(snapshot_key: str, **params):
+    """
+    Fetch events from the Nürburgring calendar through the circuit breaker.
+
+    Successful responses are kept as the snapshot for `snapshot_key`. When the
+    upstream fails or the breaker is open, the last snapshot is returned; with
+    no snapshot an open breaker becomes a fast 503 with Retry-After.
+    """
+    try:
+        events_result = calendar_breaker.call(
+            lambda: service.events()
+            .list(calendarId=NURBURGRING_CALENDAR_ID, **params)
+            .execute()
+        )
+    except Exception as e:
+        snapshot = calendar_snapshots.get(snapshot_key)
+        if snapshot is not None:
+            metrics.inc("calendar_snapshot_served_total")
+            return snapshot
+
+        if isinstance(e, CircuitOpenError):
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Google Calendar is temporarily unavailable.",
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            ) from e
+        raise
+
+    calendar_snapshots.set(snapshot_key, events_result)
+    return events_result
+
 
 def format_datetime_to_local(iso_datetime_str):
     """Converts ISO datetime string to local timezone (Bulgaria)"""
@@ -60,18 +129,14 @@ def get_events():
         ).isoformat() + "Z"
 
         # Fetch events from Nürburgring calendar
-        events_result = (
-            service.events()
-            .list(
-                calendarId=NURBURGRING_CALENDAR_ID,
-                timeMin=now,
-                timeMax=one_month_later,
-                maxResults=100,
-                singleEvents=True,
-                orderBy="startTime",
-                timeZone="Europe/Berlin",  # Set timezone for fetching
-            )
-            .execute()
+        events_result = fetch_calendar_events(
+            "events",
+            timeMin=now,
+            timeMax=one_month_later,
+            maxResults=100,
+            singleEvents=True,
+            orderBy="startTime",
+            timeZone="Europe/Berlin",  # Set timezone for fetching
         )
 
         events = events_result.get("items", [])
@@ -114,13 +179,15 @@ def get_events():
 
         return {"events": event_list}
 
+    except HTTPException:
+        raise
     except HttpError as error:
-        print(f"Error fetching events: {error}")
+        logger.error("Error fetching events: %s", error)
         raise HTTPException(
             status_code=500, detail=f"Google Calendar API error: {error}"
-        ) from e
+        ) from error
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        logger.exception("Unexpected error fetching events: %s", e)
         raise HTTPException(
             status_code=500, detail=f"Error processing the request: {e}"
         ) from e
@@ -138,16 +205,12 @@ def check_date_availability(date: str):
         end_date = dt_obj.replace(hour=23, minute=59, second=59).isoformat() + "Z"
 
         # Fetch events for this day
-        events_result = (
-            service.events()
-            .list(
-                calendarId=NURBURGRING_CALENDAR_ID,
-                timeMin=start_date,
-                timeMax=end_date,
-                singleEvents=True,
-                timeZone="Europe/Berlin",  # Set timezone for fetching
-            )
-            .execute()
+        events_result = fetch_calendar_events(
+            f"date:{date}",
+            timeMin=start_date,
+            timeMax=end_date,
+            singleEvents=True,
+            timeZone="Europe/Berlin",  # Set timezone for fetching
         )
 
         events = events_result.get("items", [])
@@ -208,8 +271,79 @@ def check_date_availability(date: str):
             "message": "No clear information available for this date.",
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error checking the date: {e}")
+        logger.error("Error checking the date %s: %s", date, e)
         raise HTTPException(
             status_code=500, detail=f"Error checking the date: {e}"
         ) from e
+
+
+class CalendarSyncState:
+    """
+    Digest of the upcoming events as last announced by any worker.
+
+    Every sync is announced on the invalidation bus, so all workers know
+    when the calendar was last read and whether it changed.
+    """
+
+    def __init__(self):
+        self.digest = None
+        self.synced_at = 0.0
+
+
+calendar_sync = CalendarSyncState()
+
+
+def sync_calendar():
+    """
+    Re-read the upcoming events and announce their digest to all workers.
+
+    Skipped if another worker synced less than an interval ago, so Google is
+    polled about once per CALENDAR_SYNC_SECONDS whatever the worker count.
+    """
+    if time.monotonic() - calendar_sync.synced_at < CALENDAR_SYNC_SECONDS * 0.9:
+        return
+
+    try:
+        events = get_events()
+    except Exception as e:
+        logger.warning("Calendar sync failed: %s", e)
+        return
+
+    digest = hashlib.sha1(json.dumps(events, sort_keys=True).encode()).hexdigest()
+    invalidation_bus.publish("calendar", digest[:16])
+
+
+def _on_calendar_sync(message_id, namespace: str, key: str):
+    if namespace != "calendar":
+        return
+
+    calendar_sync.synced_at = time.monotonic()
+    if key != calendar_sync.digest:
+        changed = calendar_sync.digest is not None
+        calendar_sync.digest = key
+        if changed:
+            broadcaster.publish("calendar", {}, event_id=message_id)
+
+
+invalidation_bus.subscribe_messages(_on_calendar_sync)
+
+
+def _build_scheduler() -> BackgroundScheduler:
+    scheduler = BackgroundScheduler(daemon=True)
+    scheduler.add_job(
+        sync_calendar,
+        "interval",
+        seconds=CALENDAR_SYNC_SECONDS,
+        # Spread the workers so one of them usually syncs for all.
+        jitter=CALENDAR_SYNC_SECONDS // 2,
+        id="sync_calendar",
+        max_instances=1,
+        coalesce=True,
+    )
+    return scheduler
+
+
+calendar_sync_scheduler = _build_scheduler()
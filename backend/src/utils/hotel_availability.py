@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.config import (
+    HOTEL_AVAILABILITY_TTL_SECONDS,
+    HOTEL_SOURCE_CONCURRENCY,
+    HOTEL_SOURCE_FAILURE_TTL_SECONDS,
+    HOTEL_SOURCE_REQUEST_TIMEOUT_SECONDS,
+    HOTEL_SOURCE_TIMEOUT_SECONDS,
+)
+from schemas.hotel import HotelAvailability, HotelAvailabilityResponse, HotelResponse
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def parse_source_answer(hotel: HotelResponse, payload: dict) -> HotelAvailability:
+    """
+    Normalize a partner's answer.
+
+    Sources answer `GET <availability_url>?date=YYYY-MM-DD` with JSON like
+    {"available": true, "rooms": 3, "price": 129.0, "currency": "EUR"}.
+    """
+    rooms = payload.get("rooms")
+    return HotelAvailability(
+        hotel_id=hotel.id,
+        name=hotel.name,
+        status="ok",
+        available=bool(payload.get("available", bool(rooms))),
+        rooms=rooms,
+        price=payload.get("price"),
+        currency=payload.get("currency", "EUR"),
+    )
+
+
+class HotelAvailabilityAggregator:
+    """
+    Asks every partner hotel for its availability on a date, concurrently.
+
+    The search takes as long as the slowest source, capped by `timeout`;
+    sources that do not answer in time are reported as such instead of
+    failing the search. Their requests go on for up to `request_timeout`,
+    longer than `timeout`, and answers are cached per hotel and date for
+    `ttl` seconds, so a late answer still serves the next search. Failures
+    and timeouts are remembered for `failure_ttl` seconds, so a partner that
+    is down does not hold up every search until it is back.
+    Concurrent searches share in-flight requests, and all requests share
+    one keep-alive connection pool.
+
+    The requests run on a dedicated thread pool (requests is a blocking
+    client), sized so a search over every partner runs in one wave.
+    """
+
+    def __init__(
+        self,
+        timeout: float = HOTEL_SOURCE_TIMEOUT_SECONDS,
+        ttl: float = HOTEL_AVAILABILITY_TTL_SECONDS,
+        concurrency: int = HOTEL_SOURCE_CONCURRENCY,
+        request_timeout: float = HOTEL_SOURCE_REQUEST_TIMEOUT_SECONDS,
+        failure_ttl: float = HOTEL_SOURCE_FAILURE_TTL_SECONDS,
+    ):
+        self.timeout = timeout
+        # Never shorter than the search timeout, or a slow source would
+        # fail as an error instead of timing out.
+        self.request_timeout = max(request_timeout, timeout)
+        self.cache = TTLCache(ttl)
+        # Status ("error" or "timeout") of sources that recently failed
+        self.failures = TTLCache(failure_ttl)
+        self.executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="hotel-source"
+        )
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        self._inflight: Dict[Tuple[UUID, date], asyncio.Future] = {}
+
+    def _fetch(self, hotel: HotelResponse, track_date: date) -> HotelAvailability:
+        started = time.perf_counter()
+        try:
+            # No redirects: a source must not bounce us to another host.
+            response = self.http.get(
+                hotel.availability_url,
+                params={"date": track_date.isoformat()},
+                timeout=self.request_timeout,
+                allow_redirects=False,
+            )
+            response.raise_for_status()
+            if response.is_redirect:
+                raise requests.HTTPError(
+                    f"Redirected to {response.headers['Location']}"
+                )
+            answer = parse_source_answer(hotel, response.json())
+        except Exception:
+            self.failures.set((hotel.id, track_date), "error")
+            raise
+        # Cached here, so an answer arriving after the search gave up on it
+        # still serves the next search.
+        self.cache.set((hotel.id, track_date), answer)
+        metrics.set_gauge(
+            "hotel_source_seconds", time.perf_counter() - started, hotel=str(hotel.id)
+        )
+        return answer
+
+    def _request(self, hotel: HotelResponse, track_date: date) -> asyncio.Future:
+        key = (hotel.id, track_date)
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, self._fetch, hotel, track_date)
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key: Tuple[UUID, date], future: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is not None:
+            # Retrieved here: once every search waiting on it timed out,
+            # nobody else reads the error. Those that did logged it.
+            logger.debug("Availability request %s failed: %s", key, future.exception())
+
+    async def _ask(self, hotel: HotelResponse, track_date: date) -> HotelAvailability:
+        if not hotel.availability_url:
+            return HotelAvailability(
+                hotel_id=hotel.id, name=hotel.name, status="no_source"
+            )
+
+        cached = self.cache.get((hotel.id, track_date))
+        if cached is not None:
+            metrics.inc("hotel_availability_cache_hits_total")
+            return cached.model_copy(update={"cached": True})
+
+        failed = self.failures.get((hotel.id, track_date))
+        if failed is not None:
+            metrics.inc("hotel_source_failures_total", status=failed)
+            return HotelAvailability(
+                hotel_id=hotel.id, name=hotel.name, status=failed, cached=True
+            )
+
+        try:
+            # shield: a timed out search must not cancel a request that
+            # other searches are waiting on.
+            return await asyncio.wait_for(
+                asyncio.shield(self._request(hotel, track_date)), self.timeout
+            )
+        except asyncio.TimeoutError:
+            status = "timeout"
+            self.failures.set((hotel.id, track_date), status)
+        except Exception as e:
+            logger.warning("Availability source of hotel %s failed: %s", hotel.id, e)
+            status = "error"
+
+        metrics.inc("hotel_source_failures_total", status=status)
+        return HotelAvailability(hotel_id=hotel.id, name=hotel.name, status=status)
+
+    async def search(
+        self, hotels: Iterable[HotelResponse], track_date: date
+    ) -> HotelAvailabilityResponse:
+        results: List[HotelAvailability] = await asyncio.gather(
+            *(self._ask(hotel, track_date) for hotel in hotels)
+        )
+        return HotelAvailabilityResponse(
+            date=track_date,
+            complete=all(result.status in ("ok", "no_source") for result in results),
+            hotels=results,
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
+
+
+hotel_availability = HotelAvailabilityAggregator()
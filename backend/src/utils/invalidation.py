@@ -0,0 +1,241 @@
+import itertools
+import logging
+import select
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.config import CACHE_INVALIDATION_CHANNEL, CACHE_TRANSPORT
+from utils.cache import entity_cache
+
+logger = logging.getLogger(__name__)
+
+InvalidationHandler = Callable[[str, str], None]
+# Also gets the message ID, None for messages raised by this worker alone.
+MessageHandler = Callable[[Optional[int], str, str], None]
+
+
+def encode_payload(namespace: str, key) -> str:
+    return f"{namespace}:{key}"
+
+
+def decode_payload(payload: str):
+    namespace, _, key = payload.partition(":")
+    return namespace, key or "*"
+
+
+def decode_message(message: str) -> Tuple[Optional[int], str]:
+    """Split "<id>|<payload>" as sent by the transports; a bare payload has no ID."""
+    message_id, separator, payload = message.partition("|")
+    if not separator:
+        return None, message
+    return int(message_id), payload
+
+
+class InvalidationTransport(ABC):
+    @abstractmethod
+    def publish(self, db: Optional[Session], payload: str):
+        pass
+
+    @abstractmethod
+    def start(self, callback: Callable[[str], None]):
+        pass
+
+    @abstractmethod
+    def stop(self):
+        pass
+
+
+class InMemoryTransport(InvalidationTransport):
+    """
+    Transport that delivers payloads to every bus started on it.
+
+    Several buses sharing one instance behave like several workers sharing
+    one database, which is enough for tests and single-process runs.
+    """
+
+    def __init__(self):
+        self._callbacks: List[Callable[[str], None]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, db: Optional[Session], payload: str):
+        with self._lock:
+            message = f"{next(self._ids)}|{payload}"
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(message)
+
+    def start(self, callback: Callable[[str], None]):
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def stop(self):
+        with self._lock:
+            self._callbacks.clear()
+
+
+class PostgresNotifyTransport(InvalidationTransport):
+    """
+    Transport based on Postgres LISTEN/NOTIFY.
+
+    Publishing runs `pg_notify` on the caller's session, so the notification
+    is only delivered if the surrounding transaction commits. The message ID
+    is drawn from the `invalidation_message_id` sequence in the same
+    statement, so all workers know a message by the same ID; Postgres
+    delivers notifications to every listener in commit order. Each worker
+    listens on a dedicated connection taken out of the engine's pool.
+    """
+
+    def __init__(self, engine, channel: str = CACHE_INVALIDATION_CHANNEL):
+        self.engine = engine
+        self.channel = channel
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def publish(self, db: Optional[Session], payload: str):
+        statement = text(
+            "SELECT pg_notify(:channel,"
+            " nextval('invalidation_message_id') || '|' || :payload)"
+        )
+        params = {"channel": self.channel, "payload": payload}
+
+        if db is not None:
+            db.execute(statement, params)
+            return
+
+        with self.engine.begin() as connection:
+            connection.execute(statement, params)
+
+    def start(self, callback: Callable[[str], None]):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen,
+            args=(callback,),
+            name="cache-invalidation-listener",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _connect(self):
+        raw_connection = self.engine.raw_connection()
+        # Taken before detaching, which drops the pool's reference to it.
+        connection = raw_connection.driver_connection
+        raw_connection.detach()
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return connection
+
+    def _listen(self, callback: Callable[[str], None]):
+        connection = None
+        while not self._stopped.is_set():
+            try:
+                if connection is None:
+                    connection = self._connect()
+                    # Anything may have changed while we were not listening.
+                    callback("*")
+
+                readable, _, _ = select.select([connection], [], [], 1.0)
+                if not readable:
+                    continue
+
+                connection.poll()
+                while connection.notifies:
+                    notify = connection.notifies.pop(0)
+                    callback(notify.payload)
+
+            except Exception as e:
+                logger.error("Cache invalidation listener error: %s", e)
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+                connection = None
+                self._stopped.wait(1.0)
+
+        if connection is not None:
+            connection.close()
+
+
+class InvalidationBus:
+    """
+    Publishes entity keys written by the repositories and fans incoming keys
+    out to the registered handlers (the process caches of this worker).
+    """
+
+    def __init__(self, transport: InvalidationTransport):
+        self.transport = transport
+        self._handlers: List[InvalidationHandler] = []
+        self._message_handlers: List[MessageHandler] = []
+
+    def subscribe(self, handler: InvalidationHandler):
+        self._handlers.append(handler)
+
+    def subscribe_messages(self, handler: MessageHandler):
+        """Like `subscribe`, for handlers that also need the message ID."""
+        self._message_handlers.append(handler)
+
+    def publish(self, namespace: str, key="*", db: Optional[Session] = None):
+        """
+        Announce that `namespace:key` changed.
+
+        Args:
+            namespace (str): Entity namespace, e.g. "car" or "hotel".
+            key: ID of the changed entity, "*" for the whole namespace.
+            db (Session): Session whose transaction carries the notification.
+        """
+        self.transport.publish(db, encode_payload(namespace, key))
+
+    def start(self):
+        self.transport.start(self._dispatch)
+
+    def stop(self):
+        self.transport.stop()
+
+    def _dispatch(self, message: str):
+        # A bare "*" (e.g. after a listener reconnect) decodes to ("*", "*").
+        message_id, payload = decode_message(message)
+        namespace, key = decode_payload(payload)
+        handlers = [(handler, (namespace, key)) for handler in self._handlers] + [
+            (handler, (message_id, namespace, key))
+            for handler in self._message_handlers
+        ]
+        for handler, args in handlers:
+            try:
+                handler(*args)
+            except Exception as e:
+                logger.error("Cache invalidation handler failed for %s: %s", message, e)
+
+
+def _evict(namespace: str, key: str):
+    if namespace == "*":
+        entity_cache.clear()
+    else:
+        entity_cache.handle_invalidation(namespace, key)
+
+
+def _build_transport() -> InvalidationTransport:
+    if CACHE_TRANSPORT == "memory":
+        return InMemoryTransport()
+
+    from database.session import engine
+
+    return PostgresNotifyTransport(engine)
+
+
+invalidation_bus = InvalidationBus(_build_transport())
+invalidation_bus.subscribe(_evict)
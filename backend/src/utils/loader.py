@@ -0,0 +1,78 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Type
+from uuid import UUID
+
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+
+from models.base import Base
+
+
+def select_by_ids(model: Type[Base]):
+    """
+    Statement loading every `model` row whose ID is in the `ids` parameter.
+
+    The IDs are sent as one array parameter (`id = ANY(:ids)`), so the SQL is
+    the same for any number of IDs and stays in the compiled-statement cache.
+    """
+    ids = bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))
+    return select(model).where(model.id == any_(ids))
+
+
+def fetch_by_ids(
+    db: Session, model: Type[Base], entity_ids: Iterable[UUID]
+) -> List[Base]:
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return []
+    return list(db.scalars(select_by_ids(model), {"ids": entity_ids}))
+
+
+class EntityLoader:
+    """
+    Request-scoped batching loader for entities referenced by ID.
+
+    IDs queued during a request are resolved with a single query per model
+    the first time any of them is needed, and results (including misses) are
+    memoized until the request ends. This turns the per-row `get_*_by_id`
+    pattern of a booking list into one query per entity type.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._pending: Dict[Type[Base], Set[UUID]] = defaultdict(set)
+        self._loaded: Dict[Type[Base], Dict[UUID, Optional[Base]]] = defaultdict(dict)
+
+    def queue(self, model: Type[Base], entity_ids: Iterable[UUID]) -> None:
+        """Register IDs that will be needed later in this request."""
+        loaded = self._loaded[model]
+        self._pending[model].update(
+            entity_id for entity_id in entity_ids if entity_id not in loaded
+        )
+
+    def load(self, model: Type[Base], entity_id: UUID) -> Optional[Base]:
+        """Return one entity, resolving every queued ID of its type at once."""
+        return self.load_many(model, [entity_id])[entity_id]
+
+    def load_many(
+        self, model: Type[Base], entity_ids: Iterable[UUID]
+    ) -> Dict[UUID, Optional[Base]]:
+        entity_ids = list(entity_ids)
+        self.queue(model, entity_ids)
+        self._flush(model)
+
+        loaded = self._loaded[model]
+        return {entity_id: loaded[entity_id] for entity_id in entity_ids}
+
+    def _flush(self, model: Type[Base]) -> None:
+        pending = self._pending.pop(model, None)
+        if not pending:
+            return
+
+        loaded = self._loaded[model]
+        for entity in fetch_by_ids(self.db, model, pending):
+            loaded[entity.id] = entity
+        for entity_id in pending:
+            loaded.setdefault(entity_id, None)
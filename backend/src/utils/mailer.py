@@ -0,0 +1,110 @@
+import logging
+import queue
+import smtplib
+from email.message import EmailMessage
+
+from core.config import (
+    SMTP_HOST,
+    SMTP_PASSWORD,
+    SMTP_PORT,
+    SMTP_STARTTLS,
+    SMTP_TIMEOUT,
+    SMTP_USERNAME,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """
+    Pool of open SMTP connections shared by the notification workers.
+
+    Reusing connections saves the TCP, TLS and AUTH handshakes on every
+    email. Connections are opened lazily up to `size` and replaced when the
+    server has dropped them.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        username: str = SMTP_USERNAME,
+        password: str = SMTP_PASSWORD,
+        starttls: bool = SMTP_STARTTLS,
+        timeout: float = SMTP_TIMEOUT,
+        size: int = 4,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+
+    def _acquire(self) -> smtplib.SMTP:
+        self._slots.get()
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.put(None)
+            raise
+
+    def _release(self, connection, healthy: bool) -> None:
+        if healthy:
+            self._idle.put(connection)
+        else:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self._slots.put(None)
+
+    def send(self, message: EmailMessage) -> None:
+        connection = self._acquire()
+        try:
+            connection.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connection timed out on the server; retry once on a fresh one.
+            self._release(connection, healthy=False)
+            connection = self._acquire()
+            try:
+                connection.send_message(message)
+            except Exception:
+                self._release(connection, healthy=False)
+                raise
+        except smtplib.SMTPRecipientsRefused:
+            self._release(connection, healthy=True)
+            raise
+        except Exception:
+            self._release(connection, healthy=False)
+            raise
+
+        self._release(connection, healthy=True)
+
+    def close(self) -> None:
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                connection.quit()
+            except Exception:
+                pass
@@ -0,0 +1,55 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process registry of counters and gauges.
+
+    Rendered in the Prometheus text exposition format by the `/metrics`
+    endpoint, so it can be scraped without an extra dependency.
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[Labels, float]] = defaultdict(dict)
+        self._gauges: Dict[str, Dict[Labels, float]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _labels(labels: dict) -> Labels:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[name][self._labels(labels)] = value
+
+    def get(self, name: str, **labels) -> float:
+        key = self._labels(labels)
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name].get(key, 0)
+            return self._gauges.get(name, {}).get(key, 0)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for kind, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(metrics.items()):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in sorted(series.items()):
+                        label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                        suffix = f"{{{label_str}}}" if label_str else ""
+                        lines.append(f"{name}{suffix} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,179 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from string import Template
+from typing import List
+from uuid import UUID
+
+from ics import Calendar, Event
+from sqlalchemy.orm import Session
+
+from core.config import MAIL_FROM, NOTIFICATION_BATCH_SIZE, NOTIFICATION_WORKERS
+from models.booking import Booking
+from models.car import Car
+from models.outbox import OutboxMessage
+from utils.loader import EntityLoader
+from utils.mailer import SMTPConnectionPool
+from utils.outbox import OutboxDispatcher, enqueue
+
+logger = logging.getLogger(__name__)
+
+BOOKING_CONFIRMATION_TOPIC = "notification.booking_confirmation"
+
+CONFIRMATION_SUBJECT = Template(
+    "Your Nürburgring track day on $track_date is confirmed"
+)
+
+CONFIRMATION_BODY = Template(
+    """Hi,
+
+your track day at the Nürburgring Nordschleife is confirmed.
+
+Date: $track_date
+Car: $car
+Laps: $laps
+Package: $package
+Total: $total_amount EUR
+Booking ID: $booking_id
+
+The event is attached, add it to your calendar.
+
+See you in the Green Hell!
+NURBLIFE Experience
+"""
+)
+
+
+def render_booking_ics(job: dict) -> str:
+    event = Event(
+        name=f"Nürburgring track day - {job['car']}",
+        begin=job["track_date"],
+        location="Nürburgring Nordschleife, Nürburg, Germany",
+        description=f"Booking {job['booking_id']}, {job['laps']} laps.",
+        uid=f"{job['booking_id']}@nurblife.bg",
+    )
+    event.make_all_day()
+    return Calendar(events=[event]).serialize()
+
+
+def render_booking_confirmation(job: dict) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = MAIL_FROM
+    message["To"] = job["email"]
+    message["Subject"] = CONFIRMATION_SUBJECT.substitute(job)
+    message.set_content(CONFIRMATION_BODY.substitute(job))
+    message.add_attachment(
+        render_booking_ics(job).encode(),
+        maintype="text",
+        subtype="calendar",
+        filename="nurburgring-track-day.ics",
+    )
+    return message
+
+
+def enqueue_booking_confirmation(db: Session, booking_id: UUID) -> None:
+    """Queue the confirmation email of a booking in the caller's transaction."""
+    enqueue(
+        db,
+        topic=BOOKING_CONFIRMATION_TOPIC,
+        payload={"booking_id": str(booking_id)},
+        idempotency_key=f"confirmation:{booking_id}",
+    )
+
+
+class NotificationDispatcher(OutboxDispatcher):
+    """
+    Sends queued booking confirmations in batches.
+
+    The jobs persist in the outbox table, so nothing is lost on restart and
+    failed sends are retried with backoff. Each batch loads its bookings and
+    cars with one query per type, then a thread pool renders the templates
+    and ICS files and sends them over pooled SMTP connections.
+    """
+
+    thread_name = "notification-dispatcher"
+
+    def __init__(
+        self,
+        session_factory,
+        smtp_pool: SMTPConnectionPool,
+        workers: int = NOTIFICATION_WORKERS,
+        batch_size: int = NOTIFICATION_BATCH_SIZE,
+    ):
+        super().__init__(session_factory, batch_size=batch_size)
+        self.smtp_pool = smtp_pool
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="notification"
+        )
+
+    @property
+    def topics(self) -> List[str]:
+        return [BOOKING_CONFIRMATION_TOPIC]
+
+    def _build_jobs(self, db: Session, messages: List[OutboxMessage]) -> List[dict]:
+        loader = EntityLoader(db)
+        booking_ids = [UUID(message.payload["booking_id"]) for message in messages]
+        bookings = loader.load_many(Booking, booking_ids)
+        cars = loader.load_many(
+            Car, {booking.car_id for booking in bookings.values() if booking}
+        )
+
+        # Plain values only: ORM objects must not leave the session's thread.
+        jobs = []
+        for booking_id in booking_ids:
+            booking = bookings[booking_id]
+            if booking is None:
+                jobs.append(None)
+                continue
+
+            car = cars[booking.car_id]
+            jobs.append(
+                {
+                    "booking_id": str(booking.id),
+                    "email": booking.email,
+                    "track_date": booking.track_date.isoformat(),
+                    "car": f"{car.make} {car.model}",
+                    "laps": booking.laps,
+                    "package": booking.package.value.replace("_", " ").title(),
+                    "total_amount": booking.total_amount,
+                }
+            )
+        return jobs
+
+    def _deliver(self, job: dict) -> None:
+        self.smtp_pool.send(render_booking_confirmation(job))
+
+    def _process_batch(self, db: Session, messages: List[OutboxMessage]):
+        futures = [
+            self.executor.submit(self._deliver, job) if job else None
+            for job in self._build_jobs(db, messages)
+        ]
+
+        for message, future in zip(messages, futures):
+            try:
+                if future is None:
+                    raise LookupError(
+                        f"Booking {message.payload['booking_id']} not found."
+                    )
+                future.result()
+            except Exception as e:
+                self._mark_failed(message, e)
+            else:
+                self._mark_sent(message)
+
+    def stop(self):
+        super().stop()
+        # Lets sends of a batch cut short by the join timeout finish first.
+        self.executor.shutdown(wait=True)
+        self.smtp_pool.close()
+
+
+def _build_dispatcher() -> NotificationDispatcher:
+    from database.session import Session
+
+    return NotificationDispatcher(
+        Session, SMTPConnectionPool(size=NOTIFICATION_WORKERS)
+    )
+
+
+notification_dispatcher = _build_dispatcher()
@@ -0,0 +1,202 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.config import OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, OUTBOX_POLL_SECONDS
+from models.enums import OutboxStatusEnum
+from models.outbox import OutboxMessage
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+OutboxHandler = Callable[[Session, OutboxMessage], None]
+
+# Retry delays grow 2, 4, 8 ... seconds, capped at ten minutes.
+MAX_BACKOFF_SECONDS = 600
+
+
+def enqueue(
+    db: Session, topic: str, payload: dict, idempotency_key: str
+) -> OutboxMessage:
+    """
+    Add an outbox message to the caller's transaction.
+
+    The message only becomes visible to the dispatcher if that transaction
+    commits, so the side effect can never run for a rolled back change.
+    """
+    message = OutboxMessage(
+        topic=topic,
+        payload=payload,
+        idempotency_key=idempotency_key,
+        status=OutboxStatusEnum.PENDING,
+        attempts=0,
+    )
+    db.add(message)
+    return message
+
+
+class OutboxDispatcher:
+    """
+    Drains pending outbox messages in batches and runs their topic handlers.
+
+    Batches are claimed with FOR UPDATE SKIP LOCKED, so several workers can
+    run a dispatcher without processing the same message twice. Each message
+    runs in its own savepoint; a failing handler only reschedules its message
+    with exponential backoff.
+
+    Subclasses can override `topics` and `_process_batch` to handle a whole
+    batch at once while reusing the claiming, retry and metrics logic.
+    """
+
+    thread_name = "outbox-dispatcher"
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_seconds: float = OUTBOX_POLL_SECONDS,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self._handlers: Dict[str, OutboxHandler] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def register(self, topic: str, handler: OutboxHandler):
+        self._handlers[topic] = handler
+
+    @property
+    def topics(self) -> List[str]:
+        """Topics claimed by this dispatcher."""
+        return list(self._handlers)
+
+    def run_once(self) -> int:
+        """
+        Process one batch of due messages.
+
+        Returns:
+            int: Number of messages claimed.
+        """
+        db = self.session_factory()
+        try:
+            messages = db.scalars(
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.status == OutboxStatusEnum.PENDING,
+                    OutboxMessage.topic.in_(self.topics),
+                    OutboxMessage.available_at <= datetime.now(timezone.utc),
+                )
+                .order_by(OutboxMessage.available_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+
+            started = time.perf_counter()
+            self._process_batch(db, messages)
+            db.commit()
+
+            if messages:
+                metrics.set_gauge("outbox_batch_size", len(messages))
+                metrics.set_gauge(
+                    "outbox_batch_duration_seconds", time.perf_counter() - started
+                )
+            return len(messages)
+
+        except Exception:
+            db.rollback()
+            raise
+
+        finally:
+            db.close()
+
+    def _process_batch(self, db: Session, messages: List[OutboxMessage]):
+        for message in messages:
+            self._dispatch(db, message)
+
+    def _dispatch(self, db: Session, message: OutboxMessage):
+        handler = self._handlers.get(message.topic)
+
+        try:
+            if handler is None:
+                raise LookupError(f"No outbox handler for topic {message.topic}.")
+            with db.begin_nested():
+                handler(db, message)
+
+        except Exception as e:
+            self._mark_failed(message, e)
+            return
+
+        self._mark_sent(message)
+
+    def _mark_sent(self, message: OutboxMessage):
+        now = datetime.now(timezone.utc)
+        message.attempts += 1
+        message.status = OutboxStatusEnum.SENT
+        message.processed_at = now
+        metrics.inc("outbox_sent_total", topic=message.topic)
+        metrics.set_gauge(
+            "outbox_latency_seconds",
+            (now - message.created_at).total_seconds(),
+            topic=message.topic,
+        )
+
+    def _mark_failed(self, message: OutboxMessage, error: Exception):
+        logger.error(
+            "Outbox message %s (%s) failed: %s", message.id, message.topic, error
+        )
+        message.attempts += 1
+        message.last_error = str(error)
+
+        if message.attempts >= self.max_attempts:
+            message.status = OutboxStatusEnum.FAILED
+            metrics.inc("outbox_failed_total", topic=message.topic)
+            return
+
+        delay = min(2**message.attempts, MAX_BACKOFF_SECONDS)
+        message.available_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        metrics.inc("outbox_retried_total", topic=message.topic)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=self.thread_name, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                logger.error("Outbox dispatcher error: %s", e)
+                claimed = 0
+
+            # Keep draining while batches come back full.
+            if claimed < self.batch_size:
+                self._stopped.wait(self.poll_seconds)
+
+
+def _build_dispatcher() -> OutboxDispatcher:
+    from database.session import Session
+
+    return OutboxDispatcher(Session)
+
+
+outbox_dispatcher = _build_dispatcher()
@@ -0,0 +1,75 @@
+import threading
+import uuid
+from abc import ABC, abstractmethod
+
+from core.config import ALLOW_FAKE_PAYMENTS, PAYMENT_PROVIDER
+
+
+class PaymentDeclinedError(Exception):
+    """The provider refused the charge; retrying will not help."""
+
+
+class PaymentProvider(ABC):
+    @abstractmethod
+    def charge(
+        self, idempotency_key: str, amount: int, currency: str, metadata: dict
+    ) -> str:
+        """
+        Charge `amount` and return the provider's reference of the charge.
+
+        Calls with an already used `idempotency_key` must return the original
+        charge instead of creating a new one.
+        """
+        pass
+
+
+class FakePaymentProvider(PaymentProvider):
+    """
+    Local stand-in for the payment provider, used in development and tests.
+
+    Charges are deduplicated by idempotency key like a real provider does.
+    """
+
+    def __init__(self):
+        self.charges = {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def charge(
+        self, idempotency_key: str, amount: int, currency: str, metadata: dict
+    ) -> str:
+        if amount <= 0:
+            raise PaymentDeclinedError("Amount must be positive.")
+
+        with self._lock:
+            self.calls += 1
+            if idempotency_key not in self.charges:
+                self.charges[idempotency_key] = {
+                    "reference": f"fake_{uuid.uuid4().hex}",
+                    "amount": amount,
+                    "currency": currency,
+                    "metadata": metadata,
+                }
+            return self.charges[idempotency_key]["reference"]
+
+
+def build_payment_provider(
+    name: str = PAYMENT_PROVIDER, allow_fake: bool = ALLOW_FAKE_PAYMENTS
+) -> PaymentProvider:
+    """
+    Provider selected by PAYMENT_PROVIDER.
+
+    Fails closed: a missing or unknown provider raises at startup, and the
+    fake provider, which charges nothing, is refused unless explicitly
+    allowed with ALLOW_FAKE_PAYMENTS.
+    """
+    if not name:
+        raise ValueError("PAYMENT_PROVIDER is not set.")
+    if name == "fake":
+        if not allow_fake:
+            raise ValueError(
+                "The fake payment provider needs ALLOW_FAKE_PAYMENTS=true;"
+                " use it in development and tests only."
+            )
+        return FakePaymentProvider()
+    raise ValueError(f"Unknown payment provider: {name}")
@@ -0,0 +1,307 @@
+import asyncio
+import functools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi.routing import APIRoute
+
+from core.config import (
+    PROFILING_ADMIN_TOKEN,
+    PROFILING_DIR,
+    PROFILING_INTERVAL_SECONDS,
+    PROFILING_MAX_FILES,
+    PROFILING_SAMPLE_RATE,
+)
+from core.security import is_admin
+from utils.metrics import metrics
+from utils.request_id import get_request_id
+
+Frame = Tuple[str, str, int]
+
+MAX_STACK_DEPTH = 128
+
+# Profiles are named by server-generated IDs (uuid4 hex), never by anything
+# the client sent, so a client cannot choose or overwrite a file name.
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Without a token or a sample rate nothing is profiled, and neither the
+# middleware nor the endpoint wrapper is installed.
+PROFILING_ENABLED = bool(PROFILING_ADMIN_TOKEN) or PROFILING_SAMPLE_RATE > 0
+
+
+class RequestProfile:
+    """
+    Stack samples of the threads currently working on one request.
+    """
+
+    def __init__(self, name: str, request_id: Optional[str] = None):
+        self.profile_id = uuid.uuid4().hex
+        self.request_id = request_id
+        self.name = name
+        self.thread_ids: Set[int] = set()
+        self.samples: List[Tuple[Frame, ...]] = []
+        self.started = time.perf_counter()
+        self.duration = 0.0
+
+    @contextmanager
+    def thread(self):
+        """Sample the calling thread while the block runs."""
+        thread_id = threading.get_ident()
+        self.thread_ids.add(thread_id)
+        try:
+            yield
+        finally:
+            self.thread_ids.discard(thread_id)
+
+    def to_speedscope(self, interval: float) -> dict:
+        """Render the samples in the speedscope file format."""
+        frame_index: Dict[Frame, int] = {}
+        samples = []
+        for stack in self.samples:
+            samples.append(
+                [frame_index.setdefault(frame, len(frame_index)) for frame in stack]
+            )
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "shared": {
+                "frames": [
+                    {"name": name, "file": file, "line": line}
+                    for name, file, line in frame_index
+                ]
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{self.name} ({self.request_id or self.profile_id})",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.duration,
+                    "samples": samples,
+                    "weights": [interval] * len(samples),
+                }
+            ],
+        }
+
+
+def _stack(frame) -> Tuple[Frame, ...]:
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class SamplingProfiler:
+    """
+    One background thread per worker sampling the stacks of profiled requests.
+
+    The thread sleeps while no request is being profiled, so the profiler
+    costs nothing until it is used.
+    """
+
+    def __init__(self, interval: float = PROFILING_INTERVAL_SECONDS):
+        self.interval = interval
+        self._profiles: Set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.discard(profile)
+        profile.duration = time.perf_counter() - profile.started
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                profiles = list(self._profiles)
+                if not profiles:
+                    self._wake.clear()
+            if not profiles:
+                self._wake.wait()
+                continue
+
+            frames = sys._current_frames()
+            for profile in profiles:
+                for thread_id in list(profile.thread_ids):
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own_id:
+                        profile.samples.append(_stack(frame))
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """
+    Speedscope profiles on disk, keyed by profile ID.
+
+    A directory shared by all workers of a host, so a profile can be
+    downloaded from any worker. Only the newest `max_files` are kept.
+    """
+
+    def __init__(
+        self, directory: str = PROFILING_DIR, max_files: int = PROFILING_MAX_FILES
+    ):
+        self.directory = directory
+        self.max_files = max_files
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.speedscope.json")
+
+    def save(self, profile: RequestProfile, interval: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(profile.profile_id), "w") as file:
+            json.dump(profile.to_speedscope(interval), file)
+        self._prune()
+
+    def load(self, profile_id: str) -> Optional[bytes]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        try:
+            with open(self._path(profile_id), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _prune(self) -> None:
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(".speedscope.json")
+        ]
+        if len(paths) <= self.max_files:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[: len(paths) - self.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "current_profile", default=None
+)
+profiler = SamplingProfiler()
+profile_store = ProfileStore()
+
+
+def is_profiling_admin(token: Optional[str]) -> bool:
+    return is_admin(token, expected=PROFILING_ADMIN_TOKEN)
+
+
+def _profiled(endpoint):
+    """
+    Wrap an endpoint so the thread running it is sampled when its request
+    is profiled. Sync endpoints run in the threadpool; the context variable
+    is copied there, which is how the profile finds its worker thread.
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            if profile is None:
+                return await endpoint(*args, **kwargs)
+            with profile.thread():
+                return await endpoint(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        profile = current_profile.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        with profile.thread():
+            return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class making the endpoint visible to the request profiler."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+# Route class for the routers: the endpoint wrapper only when profiling is on.
+route_class = ProfiledRoute if PROFILING_ENABLED else APIRoute
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling single requests on demand.
+
+    A request is profiled when it sends the admin token in `X-Profile`, or
+    when it is sampled with probability `sample_rate`. The profile is stored
+    under a new profile ID, returned in the `X-Profile-ID` header. Requests
+    that are not profiled only pay for one header lookup and one random().
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILING_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    def _should_profile(self, headers: Dict[bytes, bytes]) -> bool:
+        token = headers.get(b"x-profile")
+        if token is not None and is_profiling_admin(token.decode("latin-1")):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if not self._should_profile(headers):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            f"{scope['method']} {scope['path']}", request_id=get_request_id()
+        )
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-profile-id", profile.profile_id.encode())
+                ]
+            await send(message)
+
+        token = current_profile.set(profile)
+        profiler.start(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop(profile)
+            current_profile.reset(token)
+            await asyncio.to_thread(profile_store.save, profile, profiler.interval)
+            metrics.inc("profiled_requests_total")
@@ -0,0 +1,237 @@
+import logging
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import cast, Date, delete, func, select, union
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core.config import ROLLUP_INTERVAL_SECONDS, ROLLUP_RECOMPUTE_WINDOW_SECONDS
+from models.booking import Booking
+from models.enums import BookingStatus, VoucherStatusEnum
+from models.payments import Payments
+from models.rollups import RevenueRollup, RollupWatermark, VoucherRollup
+from models.transaction import Transaction
+from models.voucher import Voucher
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the rollup job's advisory lock.
+ROLLUP_LOCK_ID = 7_340_034
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _claim_window(db: Session, name: str, now: datetime) -> datetime:
+    """
+    Return the time from which source changes are re-read for `name` and
+    move its watermark to `now` in the caller's transaction.
+
+    The window reaches ROLLUP_RECOMPUTE_WINDOW_SECONDS behind the previous
+    run: timestamps are taken when a transaction starts, not when it
+    commits, so a long transaction can make rows visible with a time the
+    previous run had already passed.
+    """
+    watermark = db.get(RollupWatermark, name, with_for_update=True)
+    if watermark is None:
+        watermark = RollupWatermark(name=name, processed_until=EPOCH)
+        db.add(watermark)
+
+    since = watermark.processed_until - timedelta(
+        seconds=ROLLUP_RECOMPUTE_WINDOW_SECONDS
+    )
+    watermark.processed_until = max(watermark.processed_until, now)
+    return since
+
+
+def _upsert_adding(table, columns, source):
+    """INSERT ... SELECT that adds to existing rollup rows instead of replacing them."""
+    statement = insert(table).from_select(columns, source)
+    keys = [column.name for column in table.__table__.primary_key]
+    return statement.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            name: getattr(table, name) + getattr(statement.excluded, name)
+            for name in columns
+            if name not in keys
+        },
+    )
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min)
+
+
+def refresh_revenue(db: Session, since: datetime, now: datetime) -> None:
+    """
+    Recompute the revenue of every track day with a booking changed since
+    `since`.
+
+    Days are recomputed from scratch rather than added to, so re-reading
+    the window is harmless, and a booking cancelled or refunded after its
+    charge drops out of the figures: only confirmed bookings count.
+    """
+    days = db.scalars(
+        select(Booking.track_date).where(Booking.updated_at > since).distinct()
+    ).all()
+    if not days:
+        return
+
+    db.execute(delete(RevenueRollup).where(RevenueRollup.day.in_(days)))
+    source = (
+        select(
+            Booking.track_date,
+            Booking.car_id,
+            Booking.package,
+            func.count(Transaction.id),
+            func.sum(Booking.laps),
+            func.sum(Transaction.amount),
+        )
+        .select_from(Transaction)
+        .join(Payments, Payments.transaction_id == Transaction.id)
+        .join(Booking, Booking.id == Payments.booking_id)
+        .where(
+            Booking.status == BookingStatus.CONFIRMED,
+            Booking.track_date.in_(days),
+        )
+        .group_by(Booking.track_date, Booking.car_id, Booking.package)
+    )
+    db.execute(
+        _upsert_adding(
+            RevenueRollup,
+            ["day", "car_id", "package", "bookings_count", "laps", "revenue"],
+            source,
+        )
+    )
+
+
+def refresh_vouchers(db: Session, since: datetime, now: datetime) -> None:
+    """
+    Recompute the voucher figures of every day on which a voucher was
+    issued, redeemed or expired since `since`.
+    """
+    # Voucher timestamps are stored without a time zone.
+    since, now = since.replace(tzinfo=None), now.replace(tzinfo=None)
+
+    issued_day = cast(Voucher.issued_at, Date)
+    used_day = cast(Voucher.used_on, Date)
+    expiry_day = cast(Voucher.expiration_data, Date)
+    days = db.scalars(
+        union(
+            select(issued_day).where(Voucher.issued_at > since),
+            select(used_day).where(
+                Voucher.status == VoucherStatusEnum.USED_VOUCHER,
+                Voucher.used_on > since,
+            ),
+            select(expiry_day).where(
+                Voucher.expiration_data > since, Voucher.expiration_data <= now
+            ),
+        )
+    ).all()
+    if not days:
+        return
+
+    # The range bound lets the time column indexes narrow the scans.
+    first = _day_start(min(days))
+    db.execute(delete(VoucherRollup).where(VoucherRollup.day.in_(days)))
+
+    issued = (
+        select(issued_day, func.count(Voucher.id), func.sum(Voucher.amount))
+        .where(Voucher.issued_at >= first, issued_day.in_(days))
+        .group_by(issued_day)
+    )
+    db.execute(
+        _upsert_adding(VoucherRollup, ["day", "issued_count", "issued_amount"], issued)
+    )
+
+    redeemed = (
+        select(used_day, func.sum(Voucher.amount))
+        .where(
+            Voucher.status == VoucherStatusEnum.USED_VOUCHER,
+            Voucher.used_on >= first,
+            used_day.in_(days),
+        )
+        .group_by(used_day)
+    )
+    db.execute(_upsert_adding(VoucherRollup, ["day", "redeemed_amount"], redeemed))
+
+    expired = (
+        select(expiry_day, func.sum(Voucher.amount))
+        .where(
+            Voucher.status != VoucherStatusEnum.USED_VOUCHER,
+            Voucher.expiration_data >= first,
+            Voucher.expiration_data <= now,
+            expiry_day.in_(days),
+        )
+        .group_by(expiry_day)
+    )
+    db.execute(_upsert_adding(VoucherRollup, ["day", "expired_amount"], expired))
+
+
+ROLLUPS = (
+    ("revenue", refresh_revenue),
+    ("vouchers", refresh_vouchers),
+)
+
+
+def refresh_rollups(session_factory) -> bool:
+    """
+    Recompute the rollup rows of the days whose source rows changed since
+    the last run.
+
+    Each rollup and its watermark move in one transaction, so a crash never
+    leaves a day half updated. An advisory lock keeps concurrent runs from
+    several workers from overlapping.
+
+    Returns:
+        bool: False if another worker was already running the job.
+    """
+    now = datetime.now(timezone.utc)
+    db = session_factory()
+    try:
+        locked = db.execute(
+            select(func.pg_try_advisory_xact_lock(ROLLUP_LOCK_ID))
+        ).scalar()
+        if not locked:
+            db.rollback()
+            return False
+
+        for name, refresh in ROLLUPS:
+            started = time.perf_counter()
+            since = _claim_window(db, name, now)
+            refresh(db, since, now)
+            metrics.set_gauge(
+                "rollup_refresh_seconds", time.perf_counter() - started, rollup=name
+            )
+
+        db.commit()
+        return True
+
+    except Exception as e:
+        db.rollback()
+        logger.error("Rollup refresh failed: %s", e)
+        raise
+
+    finally:
+        db.close()
+
+
+def _build_scheduler() -> BackgroundScheduler:
+    from database.session import Session
+
+    scheduler = BackgroundScheduler(daemon=True)
+    scheduler.add_job(
+        refresh_rollups,
+        "interval",
+        args=[Session],
+        seconds=ROLLUP_INTERVAL_SECONDS,
+        id="refresh_rollups",
+        max_instances=1,
+        coalesce=True,
+    )
+    return scheduler
+
+
+rollup_scheduler = _build_scheduler()
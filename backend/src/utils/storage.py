@@ -0,0 +1,179 @@
+import base64
+import hashlib
+import math
+import re
+import threading
+import unicodedata
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
+from urllib.parse import quote
+
+import boto3
+from botocore.config import Config
+
+from core.config import (
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_REGION,
+    VIDEO_PART_SIZE,
+    VIDEO_SPOOL_MAX_MEMORY,
+    VIDEO_URL_EXPIRES_SECONDS,
+)
+
+# S3 limits for multipart uploads
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PARTS = 10_000
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def s3_client():
+    """Shared S3 client; boto3 clients are thread-safe, sessions are not."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = boto3.client(
+                "s3",
+                endpoint_url=S3_ENDPOINT_URL,
+                region_name=S3_REGION,
+                config=Config(
+                    max_pool_connections=50,
+                    retries={"mode": "adaptive", "max_attempts": 5},
+                    # Path style works with MinIO and other stand-ins.
+                    s3={"addressing_style": "path"} if S3_ENDPOINT_URL else None,
+                ),
+            )
+        return _client
+
+
+def part_size_for(size: int, preferred: int = VIDEO_PART_SIZE) -> int:
+    """Part size of at least `preferred` that fits the file in MAX_PARTS parts."""
+    needed = math.ceil(size / MAX_PARTS)
+    mebibyte = 1024 * 1024
+    return max(preferred, MIN_PART_SIZE, math.ceil(needed / mebibyte) * mebibyte)
+
+
+async def spool_stream(
+    chunks: AsyncIterator[bytes], max_memory: int = VIDEO_SPOOL_MAX_MEMORY
+) -> Tuple[BinaryIO, int, str]:
+    """
+    Copy a request body into a temporary file while it arrives.
+
+    Up to `max_memory` bytes stay in memory, the rest goes to disk, so a
+    64 MiB part never needs 64 MiB of RAM.
+
+    Returns:
+        The rewound file, its size and its base64 MD5 (for Content-MD5).
+    """
+    spool = SpooledTemporaryFile(max_size=max_memory)
+    digest = hashlib.md5()
+    size = 0
+    try:
+        async for chunk in chunks:
+            spool.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool, size, base64.b64encode(digest.digest()).decode()
+
+
+def create_multipart_upload(key: str, content_type: str) -> str:
+    response = s3_client().create_multipart_upload(
+        Bucket=S3_BUCKET, Key=key, ContentType=content_type
+    )
+    return response["UploadId"]
+
+
+def upload_part(
+    key: str, upload_id: str, part_number: int, body: BinaryIO, size: int, md5: str
+) -> str:
+    response = s3_client().upload_part(
+        Bucket=S3_BUCKET,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        Body=body,
+        ContentLength=size,
+        ContentMD5=md5,
+    )
+    return response["ETag"]
+
+
+def list_parts(key: str, upload_id: str) -> List[dict]:
+    """All parts S3 has received for an upload, in part number order."""
+    parts = []
+    marker = 0
+    while True:
+        response = s3_client().list_parts(
+            Bucket=S3_BUCKET, Key=key, UploadId=upload_id, PartNumberMarker=marker
+        )
+        parts.extend(response.get("Parts", []))
+        if not response.get("IsTruncated"):
+            return parts
+        marker = response["NextPartNumberMarker"]
+
+
+def complete_multipart_upload(key: str, upload_id: str, parts: List[dict]) -> None:
+    s3_client().complete_multipart_upload(
+        Bucket=S3_BUCKET,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [
+                {"PartNumber": part["PartNumber"], "ETag": part["ETag"]}
+                for part in parts
+            ]
+        },
+    )
+
+
+def abort_multipart_upload(key: str, upload_id: str) -> None:
+    s3_client().abort_multipart_upload(Bucket=S3_BUCKET, Key=key, UploadId=upload_id)
+
+
+def content_disposition(filename: str) -> str:
+    """
+    Attachment header for a file name chosen by a customer.
+
+    `filename` is an ASCII fallback without quotes, backslashes or control
+    characters; `filename*` (RFC 5987) carries the full name as UTF-8.
+    """
+    name = filename.replace("\\", "/").rsplit("/", 1)[-1]
+    name = "".join(char for char in name if unicodedata.category(char)[0] != "C")
+    # Accents are dropped ("ü" becomes "u"), other characters replaced.
+    fallback = "".join(
+        char
+        for char in unicodedata.normalize("NFKD", name)
+        if unicodedata.category(char) != "Mn"
+    )
+    fallback = re.sub(r"[^A-Za-z0-9._ -]", "_", fallback).strip(" .") or "video"
+    if not name.strip(" ."):
+        name = fallback
+    return (
+        f'attachment; filename="{fallback}";'
+        f" filename*=UTF-8''{quote(name, safe='')}"
+    )
+
+
+def presigned_url(
+    key: str,
+    expires_in: int = VIDEO_URL_EXPIRES_SECONDS,
+    filename: Optional[str] = None,
+) -> str:
+    """
+    Time-limited GET link to an object.
+
+    The Range header is not part of the signature, so players and download
+    managers can seek and resume with range requests against the same URL.
+    """
+    params = {"Bucket": S3_BUCKET, "Key": key}
+    if filename:
+        params["ResponseContentDisposition"] = content_disposition(filename)
+    return s3_client().generate_presigned_url(
+        "get_object", Params=params, ExpiresIn=expires_in
+    )
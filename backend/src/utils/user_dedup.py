@@ -0,0 +1,149 @@
+import logging
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+
+from models.user import User
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEDUP_BATCH_SIZE = 10_000
+
+UserKeys = Tuple[UUID, str, Optional[str], str, str]
+
+
+class DedupResult(NamedTuple):
+    users: int
+    merged: int
+    seconds: float
+
+
+def find_duplicates(rows: Iterable[UserKeys]) -> Dict[UUID, UUID]:
+    """
+    Map every duplicate user to the user it merges into.
+
+    Two users are the same customer if their normalized emails match, or
+    their E.164 phones and names match; matches chain, so A~B and B~C merge
+    all three. Works like a hash join: each key is looked up in a dict of
+    keys seen so far and matching rows are united in a union-find, one pass
+    and O(n) instead of comparing every pair. `rows` are
+    (id, email_normalized, phone_e164, first_name, last_name) in id order;
+    a group merges into its smallest id.
+    """
+    ids: List[UUID] = []
+    parent: List[int] = []
+    first_with_key: Dict[str, int] = {}
+
+    def root(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index, (user_id, email, phone, first_name, last_name) in enumerate(rows):
+        ids.append(user_id)
+        parent.append(index)
+        # Emails never start with "+", so the two kinds of key cannot collide.
+        keys = [email]
+        if phone:
+            name = f"{first_name.strip().lower()}|{last_name.strip().lower()}"
+            keys.append(f"{phone}|{name}")
+
+        for key in keys:
+            other = first_with_key.setdefault(key, index)
+            if other != index:
+                a, b = root(other), root(index)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+    return {
+        ids[index]: ids[root(index)]
+        for index in range(len(ids))
+        if root(index) != index
+    }
+
+
+def _iter_user_keys(connection, batch_size: int):
+    statement = select(
+        User.id, User.email_normalized, User.phone_e164, User.first_name, User.last_name
+    ).order_by(User.id)
+    result = connection.execution_options(
+        stream_results=True, yield_per=batch_size
+    ).execute(statement)
+    for partition in result.partitions():
+        yield from partition
+
+
+def merge_users(
+    connection, merges: Dict[UUID, UUID], batch_size: int = DEDUP_BATCH_SIZE
+):
+    """
+    Point the bookings of duplicates at their survivors and delete the duplicates.
+
+    The merge map is loaded into a temporary table, so both steps are one
+    set-based statement each (a hash join in Postgres) whatever its size.
+    Needs to run in a transaction.
+    """
+    connection.execute(
+        text(
+            "CREATE TEMPORARY TABLE user_merge"
+            " (duplicate_id uuid PRIMARY KEY, survivor_id uuid NOT NULL)"
+            " ON COMMIT DROP"
+        )
+    )
+    pairs = [
+        {"duplicate_id": duplicate, "survivor_id": survivor}
+        for duplicate, survivor in merges.items()
+    ]
+    for start in range(0, len(pairs), batch_size):
+        connection.execute(
+            text("INSERT INTO user_merge VALUES (:duplicate_id, :survivor_id)"),
+            pairs[start : start + batch_size],
+        )
+    connection.execute(text("ANALYZE user_merge"))
+    connection.execute(
+        text(
+            "UPDATE booking SET user_id = user_merge.survivor_id FROM user_merge"
+            " WHERE booking.user_id = user_merge.duplicate_id"
+        )
+    )
+    connection.execute(
+        text(
+            'DELETE FROM "user" USING user_merge'
+            ' WHERE "user".id = user_merge.duplicate_id'
+        )
+    )
+
+
+def dedup_users(
+    engine: Engine, batch_size: int = DEDUP_BATCH_SIZE, dry_run: bool = False
+) -> DedupResult:
+    """
+    Merge duplicate customers, see `find_duplicates`.
+
+    Reads the users in one streamed pass, keeping only their lookup keys in
+    memory, then merges in a single transaction.
+    """
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        users = connection.execute(select(func.count()).select_from(User)).scalar()
+        merges = find_duplicates(_iter_user_keys(connection, batch_size))
+
+    if merges and not dry_run:
+        with engine.begin() as connection:
+            merge_users(connection, merges, batch_size)
+
+    result = DedupResult(users, len(merges), time.perf_counter() - started)
+    metrics.set_gauge("user_dedup_merged", result.merged)
+    logger.info(
+        "User dedup: %d users, %d duplicates %s in %.1f s.",
+        result.users,
+        result.merged,
+        "found" if dry_run else "merged",
+        result.seconds,
+    )
+    return result
@@ -0,0 +1,262 @@
+import logging
+import multiprocessing
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from boto3.s3.transfer import TransferConfig
+from PIL import Image
+from sqlalchemy import or_, select
+
+from core.config import (
+    FFMPEG_BINARY,
+    S3_BUCKET,
+    VIDEO_LEASE_SECONDS,
+    VIDEO_THUMBNAIL_WIDTH,
+    VIDEO_WORKERS,
+)
+from models.enums import OutboxStatusEnum, VideoStatusEnum
+from models.outbox import OutboxMessage
+from models.video import LapVideo
+from utils.metrics import metrics
+from utils.outbox import OutboxDispatcher
+from utils.storage import s3_client
+
+logger = logging.getLogger(__name__)
+
+VIDEO_PROCESS_TOPIC = "video.process"
+
+# Downloads and uploads go through disk in 16 MiB ranges, never whole files.
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=4,
+)
+
+
+# H.264/AAC plays in every browser.
+ENCODE_OPTIONS = ["-c:v", "libx264", "-preset", "veryfast", "-crf", "23", "-c:a", "aac"]
+
+
+def _ffmpeg(*args: str) -> None:
+    result = subprocess.run(
+        [FFMPEG_BINARY, "-nostdin", "-y", *args], capture_output=True
+    )
+    if result.returncode != 0:
+        error = result.stderr[-500:].decode(errors="replace")
+        raise RuntimeError(f"ffmpeg exited with {result.returncode}: {error}")
+
+
+def process_video(source_key: str, transcoded_key: str, thumbnail_key: str) -> None:
+    """
+    Transcode an uploaded original to a web playable MP4 and make a thumbnail.
+
+    Runs in a worker process of the pool: the original is streamed to a
+    temporary file, ffmpeg does the encoding and Pillow resizes the frame.
+    """
+    client = s3_client()
+    with tempfile.TemporaryDirectory(prefix="lap-video-") as workdir:
+        source = os.path.join(workdir, "source")
+        transcoded = os.path.join(workdir, "video.mp4")
+        frame = os.path.join(workdir, "frame.png")
+        thumbnail = os.path.join(workdir, "thumbnail.jpg")
+
+        client.download_file(S3_BUCKET, source_key, source, Config=TRANSFER_CONFIG)
+
+        # +faststart moves the index to the front, so playback starts before
+        # the whole file has downloaded.
+        _ffmpeg("-i", source, *ENCODE_OPTIONS, "-movflags", "+faststart", transcoded)
+        # The thumbnail filter picks a representative frame, not a black one.
+        _ffmpeg("-i", source, "-vf", "thumbnail", "-frames:v", "1", frame)
+
+        with Image.open(frame) as image:
+            image.thumbnail((VIDEO_THUMBNAIL_WIDTH, VIDEO_THUMBNAIL_WIDTH))
+            image.convert("RGB").save(thumbnail, "JPEG", quality=85, optimize=True)
+
+        client.upload_file(
+            transcoded,
+            S3_BUCKET,
+            transcoded_key,
+            ExtraArgs={"ContentType": "video/mp4"},
+            Config=TRANSFER_CONFIG,
+        )
+        client.upload_file(
+            thumbnail, S3_BUCKET, thumbnail_key, ExtraArgs={"ContentType": "image/jpeg"}
+        )
+
+
+class VideoJob(NamedTuple):
+    """A claimed job, as plain values that outlive the claiming session."""
+
+    message_id: UUID
+    video_id: str
+    # Original, transcoded and thumbnail keys; None if the video is gone.
+    keys: Optional[Tuple[str, str, str]]
+    lease_until: datetime
+
+
+class VideoDispatcher(OutboxDispatcher):
+    """
+    Runs the transcoding and thumbnail stage for completed uploads.
+
+    Jobs are outbox messages, so they survive restarts and are retried with
+    backoff. The encoding runs in a process pool: it is CPU bound and must
+    not compete with the request threads for the GIL. A batch holds one job
+    per pool process.
+
+    An encode takes minutes, so no transaction stays open while it runs:
+    jobs are claimed in a short transaction that marks them in progress
+    with a lease, and each result is recorded in a transaction of its own.
+    A job whose worker died is claimed again once its lease has expired.
+    """
+
+    thread_name = "video-dispatcher"
+
+    def __init__(
+        self,
+        session_factory,
+        workers: int = VIDEO_WORKERS,
+        lease_seconds: float = VIDEO_LEASE_SECONDS,
+    ):
+        super().__init__(session_factory, batch_size=workers)
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def topics(self) -> List[str]:
+        return [VIDEO_PROCESS_TOPIC]
+
+    def run_once(self) -> int:
+        jobs = self._claim()
+        if not jobs:
+            return 0
+
+        started = time.perf_counter()
+        futures = [
+            self.executor.submit(process_video, *job.keys) if job.keys else None
+            for job in jobs
+        ]
+        for job, future in zip(jobs, futures):
+            try:
+                if future is None:
+                    raise LookupError(f"Video {job.video_id} not found.")
+                future.result()
+            except Exception as e:
+                self._record(job, e)
+            else:
+                self._record(job, None)
+
+        metrics.set_gauge("outbox_batch_size", len(jobs))
+        metrics.set_gauge(
+            "outbox_batch_duration_seconds", time.perf_counter() - started
+        )
+        return len(jobs)
+
+    def _claim(self) -> List[VideoJob]:
+        """Lease a batch of due jobs, including those whose lease expired."""
+        db = self.session_factory()
+        try:
+            now = datetime.now(timezone.utc)
+            messages = db.scalars(
+                select(OutboxMessage)
+                .where(
+                    or_(
+                        OutboxMessage.status == OutboxStatusEnum.PENDING,
+                        OutboxMessage.status == OutboxStatusEnum.IN_PROGRESS,
+                    ),
+                    OutboxMessage.topic.in_(self.topics),
+                    OutboxMessage.available_at <= now,
+                )
+                .order_by(OutboxMessage.available_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+
+            lease_until = now + timedelta(seconds=self.lease_seconds)
+            jobs = []
+            for message in messages:
+                message.status = OutboxStatusEnum.IN_PROGRESS
+                message.available_at = lease_until
+                video = db.get(LapVideo, UUID(message.payload["video_id"]))
+                keys = None
+                if video is not None:
+                    prefix = video.s3_key.rsplit("/", 1)[0]
+                    keys = (
+                        video.s3_key,
+                        f"{prefix}/video.mp4",
+                        f"{prefix}/thumbnail.jpg",
+                    )
+                jobs.append(
+                    VideoJob(message.id, message.payload["video_id"], keys, lease_until)
+                )
+            db.commit()
+            return jobs
+
+        except Exception:
+            db.rollback()
+            raise
+
+        finally:
+            db.close()
+
+    def _record(self, job: VideoJob, error: Optional[Exception]) -> None:
+        db = self.session_factory()
+        try:
+            message = db.get(OutboxMessage, job.message_id, with_for_update=True)
+            # Our lease expired and another worker claimed the job meanwhile.
+            if (
+                message is None
+                or message.status != OutboxStatusEnum.IN_PROGRESS
+                or message.available_at != job.lease_until
+            ):
+                logger.warning("Lease on video job %s was lost.", job.message_id)
+                return
+
+            video = db.get(LapVideo, UUID(job.video_id))
+            if error is not None:
+                message.status = OutboxStatusEnum.PENDING
+                self._mark_failed(message, error)
+                if video is not None and message.status == OutboxStatusEnum.FAILED:
+                    video.status = VideoStatusEnum.FAILED
+            else:
+                _, video.transcoded_key, video.thumbnail_key = job.keys
+                video.status = VideoStatusEnum.READY
+                self._mark_sent(message)
+            db.commit()
+
+        except Exception:
+            db.rollback()
+            raise
+
+        finally:
+            db.close()
+
+    def start(self):
+        if self.executor is None:
+            # Spawned, not forked: the parent runs threads and open connections.
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        super().start()
+
+    def stop(self):
+        super().stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+def _build_dispatcher() -> VideoDispatcher:
+    from database.session import Session
+
+    return VideoDispatcher(Session)
+
+
+video_dispatcher = _build_dispatcher()
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Callable, List
+
+from fastapi import FastAPI
+from pydantic import TypeAdapter
+from sqlalchemy import text
+
+from core.config import WARMUP_DB_RETRY_SECONDS
+from crud.cars import CarRepository
+from crud.hotels import HotelRepository
+from database.session import Session, engine
+from schemas.car import CarResponse
+from schemas.hotel import HotelResponse
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Readiness flag of this worker, flipped once warm-up has finished.
+    """
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def mark_ready(self) -> None:
+        self._ready.set()
+
+    def reset(self) -> None:
+        self._ready.clear()
+        self._stopped.clear()
+
+    def stop(self) -> None:
+        """Ends a warm-up still waiting for the database (shutdown)."""
+        self._stopped.set()
+
+    def wait_stopped(self, timeout: float) -> bool:
+        return self._stopped.wait(timeout)
+
+
+readiness = Readiness()
+
+
+def warm_connection_pool() -> None:
+    """Open the pool's minimum number of connections so requests skip the handshake."""
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connection = engine.connect()
+            connection.execute(text("SELECT 1"))
+            connections.append(connection)
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def warm_catalog() -> None:
+    """Preload the car and hotel lists and their serializers."""
+    db = Session()
+    try:
+        cars = CarRepository(db_session=db).get_all()
+        hotels = HotelRepository(db_session=db).get_all()
+    finally:
+        db.close()
+
+    # Run the response serializers once so their first real use is hot.
+    TypeAdapter(List[CarResponse]).dump_json(cars)
+    TypeAdapter(List[HotelResponse]).dump_json(hotels)
+
+
+def warm_calendar() -> None:
+    """Fetch the next 30 days of calendar events into the snapshot cache."""
+    from utils.google_calendar import get_events
+
+    get_events()
+
+
+def _run_step(name: str, step: Callable[[], object]) -> bool:
+    step_started = time.perf_counter()
+    try:
+        step()
+    except Exception as e:
+        logger.error("Warm-up step %s failed: %s", name, e)
+        return False
+
+    duration = time.perf_counter() - step_started
+    metrics.set_gauge("warmup_step_duration_seconds", duration, step=name)
+    logger.info("Warm-up step %s finished in %.3fs", name, duration)
+    return True
+
+
+def warm_up(app: FastAPI, retry_seconds: float = WARMUP_DB_RETRY_SECONDS) -> None:
+    """
+    Run every warm-up step, then mark the worker as ready.
+
+    A worker that cannot reach the database cannot serve, so the connection
+    pool step is retried every `retry_seconds` until it succeeds and the
+    worker stays unready meanwhile. The other steps are best effort: a
+    failing step is logged and skipped so an unavailable upstream cannot
+    keep the worker out of rotation forever.
+    """
+    steps = (
+        ("catalog", warm_catalog),
+        ("calendar", warm_calendar),
+        ("openapi", app.openapi),
+    )
+
+    started = time.perf_counter()
+    while not _run_step("connection_pool", warm_connection_pool):
+        if readiness.wait_stopped(retry_seconds):
+            return
+
+    for name, step in steps:
+        _run_step(name, step)
+
+    duration = time.perf_counter() - started
+    metrics.set_gauge("warmup_duration_seconds", duration)
+    logger.info("Warm-up finished in %.3fs, worker is ready", duration)
+    readiness.mark_ready()
@@ -1,3 +1,129 @@
 import sys
 import os
-sys.path.insert(0, os.path.abspath("backend/src"))
\ No newline at end of file
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Tests that need Postgres run against the scratch database in
+# TEST_DATABASE_URL (its public schema is dropped) and are skipped without it. The variables are set before
+# any app module reads core.config.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://localhost/nurblife_test"
+os.environ.setdefault("CACHE_TRANSPORT", "memory")
+os.environ.setdefault("PAYMENT_PROVIDER", "fake")
+os.environ.setdefault("ALLOW_FAKE_PAYMENTS", "true")
+os.environ.setdefault("ADMIN_API_TOKEN", "test-admin-token")
+
+
+@pytest.fixture
+def database_url():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+def db_engine(database_url, request):
+    """
+    Engine on an emptied public schema holding the tables of the test
+    module's MODELS, with their partitions.
+    """
+    from sqlalchemy import create_engine, text
+
+    from database.partitions import ensure_partitions
+    from models.base import Base
+
+    engine = create_engine(database_url)
+    tables = [model.__table__ for model in request.module.MODELS]
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+        Base.metadata.create_all(connection, tables=tables)
+        for table in tables:
+            if table.info.get("partitioned_by_month"):
+                ensure_partitions(connection, table)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    from sqlalchemy.orm import sessionmaker
+
+    with sessionmaker(autoflush=False, bind=db_engine)() as session:
+        yield session
+
+
+@pytest.fixture
+def make_car(db):
+    """Insert a car; keyword arguments override the defaults."""
+    from models.car import Car
+    from models.enums import (
+        CarGearboxEnum,
+        DriveTypeEnum,
+        RollcageTypeEnum,
+        SeatsCountEnum,
+    )
+
+    numbers = iter(range(1, 1_000_000))
+
+    def make(**overrides):
+        number = next(numbers)
+        values = {
+            "image": f"car-{number}.jpg",
+            "make": "Test",
+            "model": f"Model {number}",
+            "engine_type": "2.0-4cyl turbo",
+            "hp": 200 + number,
+            "nm": 300,
+            "acceleration": 6.0,
+            "gearbox": CarGearboxEnum.MANUAL,
+            "drive": DriveTypeEnum.RWD,
+            "weight": 1200,
+            "suspension_type": "stock",
+            "brakes_type": "performance",
+            "wheels": "18x8",
+            "tyres_type": "NS2-R",
+            "seats_type": "bucket",
+            "harness_type": "4 point",
+            "rollcage_type": RollcageTypeEnum.SIX_POINT,
+            "price_for_lap": 250,
+            "seats_count": SeatsCountEnum.TWO_SEATS,
+            **overrides,
+        }
+        car = Car(**values)
+        db.add(car)
+        db.commit()
+        return car
+
+    return make
+
+
+@pytest.fixture
+def checkout_request(make_car):
+    """Checkout of two laps in a new car for a new customer."""
+    from datetime import date
+
+    from schemas.booking import CheckoutRequest
+    from schemas.user import CustomerDetails
+
+    car = make_car(price_for_lap=250)
+    return CheckoutRequest(
+        car_id=car.id,
+        track_date=date(2025, 6, 1),
+        laps=2,
+        package="base_package",
+        email="driver@example.com",
+        customer=CustomerDetails(
+            first_name="Ivan",
+            last_name="Petrov",
+            phone_number="0888 123 456",
+            country_code="+359",
+            date_of_birth=date(1990, 1, 1),
+            country="Bulgaria",
+            address="Vitosha 1",
+            postcode="1000",
+            town="Sofia",
+        ),
+    )
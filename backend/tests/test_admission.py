@@ -0,0 +1,66 @@
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from utils.admission import AdmissionControlMiddleware, RouteLimit
+
+
+def ok(request):
+    return PlainTextResponse("ok")
+
+
+def client(limits):
+    # Same order as main.py: CORS outside admission control.
+    app = Starlette(
+        routes=[Route("/{path:path}", ok, methods=["GET"])],
+        middleware=[
+            Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"]),
+            Middleware(AdmissionControlMiddleware, limits=limits),
+        ],
+    )
+    return TestClient(app)
+
+
+def test_prefix_matches_whole_path_segments():
+    middleware = AdmissionControlMiddleware(
+        None, {"/events": RouteLimit(1), "/check-date": RouteLimit(1)}
+    )
+
+    assert middleware._match("/events")[0] == "/events"
+    assert middleware._match("/events/2025")[0] == "/events"
+    assert middleware._match("/check-date/2025-06-01")[0] == "/check-date"
+    assert middleware._match("/eventsx") == (None, None)
+    assert middleware._match("/check-dates") == (None, None)
+
+
+def test_rate_limited_response_carries_cors_headers():
+    http = client({"/events": RouteLimit(1, rate=0.001, burst=1)})
+    headers = {"Origin": "https://nurblife.bg"}
+
+    assert http.get("/events", headers=headers).status_code == 200
+    shed = http.get("/events", headers=headers)
+
+    assert shed.status_code == 429
+    assert "Retry-After" in shed.headers
+    assert shed.headers["access-control-allow-origin"] == "*"
+
+
+def test_preflight_does_not_use_the_budget():
+    http = client({"/events": RouteLimit(1, rate=0.001, burst=1)})
+    preflight = {
+        "Origin": "https://nurblife.bg",
+        "Access-Control-Request-Method": "GET",
+    }
+
+    assert http.options("/events", headers=preflight).status_code == 200
+    assert http.get("/events").status_code == 200
+
+
+def test_unlimited_paths_pass_through():
+    http = client({"/events": RouteLimit(1, rate=0.001, burst=1)})
+
+    for _ in range(3):
+        assert http.get("/eventsx").status_code == 200
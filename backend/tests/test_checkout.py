@@ -0,0 +1,188 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from core.config import PACKAGE_PRICES
+from crud import payments
+from crud.booking import BookingRepository
+from models.booking import Booking, BookingIdempotencyKey
+from models.car import Car
+from models.enums import Package
+from models.hotel import Hotel
+from models.outbox import OutboxMessage
+from models.payments import Payments
+from models.transaction import Transaction, TransactionReference
+from models.user import User
+from models.voucher import Voucher
+from utils.payment_provider import FakePaymentProvider, build_payment_provider
+
+MODELS = [
+    Car,
+    Hotel,
+    User,
+    Voucher,
+    Transaction,
+    TransactionReference,
+    Booking,
+    BookingIdempotencyKey,
+    Payments,
+    OutboxMessage,
+]
+
+
+def count(db, model):
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def test_retry_with_same_key_returns_the_original_booking(db, checkout_request):
+    repo = BookingRepository(db_session=db)
+
+    booking = repo.checkout(checkout_request, idempotency_key="checkout-0001")
+    first_retry = repo.checkout(checkout_request, idempotency_key="checkout-0001")
+    second_retry = repo.checkout(checkout_request, idempotency_key="checkout-0001")
+
+    assert booking.total_amount == 500
+    assert first_retry == booking
+    assert second_retry == booking
+    assert count(db, Booking) == 1
+    assert count(db, Payments) == 1
+    assert count(db, OutboxMessage) == 1
+
+
+def test_same_key_for_a_different_checkout_is_rejected(db, checkout_request):
+    repo = BookingRepository(db_session=db)
+    repo.checkout(checkout_request, idempotency_key="checkout-0001")
+
+    changed = checkout_request.model_copy(update={"laps": 3})
+    with pytest.raises(HTTPException) as error:
+        repo.checkout(changed, idempotency_key="checkout-0001")
+
+    assert error.value.status_code == 409
+    assert count(db, Booking) == 1
+
+
+def test_new_key_creates_a_new_booking(db, checkout_request):
+    repo = BookingRepository(db_session=db)
+
+    first = repo.checkout(checkout_request, idempotency_key="checkout-0001")
+    second = repo.checkout(checkout_request, idempotency_key="checkout-0002")
+
+    assert first.id != second.id
+    assert first.user_id == second.user_id is not None
+    assert count(db, User) == 1
+
+
+def test_key_taken_in_another_partition_replays_that_booking(
+    db, checkout_request, monkeypatch
+):
+    # A UUID4 key lands in the default partition, the checkout in this
+    # month's: per-partition unique indexes would let both in.
+    total_amount = 250 * checkout_request.laps
+    original = Booking(
+        id=uuid4(),
+        **checkout_request.model_dump(),
+        total_amount=total_amount,
+        idempotency_key="checkout-0001",
+    )
+    db.add(original)
+    db.flush()
+    db.add(BookingIdempotencyKey(key="checkout-0001", booking_id=original.id))
+    db.commit()
+
+    repo = BookingRepository(db_session=db)
+    lookups = [lambda key: None, repo._get_by_idempotency_key]
+    # The retry does not see the original yet, as if it committed meanwhile.
+    monkeypatch.setattr(
+        repo, "_get_by_idempotency_key", lambda key: lookups.pop(0)(key)
+    )
+
+    replayed = repo.checkout(checkout_request, idempotency_key="checkout-0001")
+
+    assert replayed.id == original.id
+    assert count(db, Booking) == 1
+
+
+def test_provider_reference_is_recorded_once(db, checkout_request, monkeypatch):
+    BookingRepository(db_session=db).checkout(checkout_request, "checkout-0001")
+    earlier = Transaction(id=uuid4(), amount=500, provider_reference="ch_1")
+    db.add(earlier)
+    db.flush()
+    db.add(TransactionReference(reference="ch_1", transaction_id=earlier.id))
+    db.commit()
+    monkeypatch.setattr(payments.get_payment_provider(), "charge", lambda **_: "ch_1")
+
+    message = db.scalars(select(OutboxMessage)).one()
+    with pytest.raises(IntegrityError):
+        payments.handle_payment_charge(db, message)
+
+
+def test_total_includes_the_package_and_the_hotel(db, checkout_request, monkeypatch):
+    monkeypatch.setitem(PACKAGE_PRICES, "premium_package", 120)
+    hotel = Hotel(
+        image="hotel.jpg",
+        name="Dorint",
+        link_to_hotel="https://hotel.example.com",
+        distance_from_track=1.5,
+        price_per_night=90,
+    )
+    db.add(hotel)
+    db.commit()
+    request = checkout_request.model_copy(
+        update={"package": Package.PREMIUM_PACKAGE, "hotel_id": hotel.id}
+    )
+
+    booking = BookingRepository(db_session=db).checkout(request, "checkout-0001")
+
+    assert booking.total_amount == 500 + 120 + 90
+    assert db.scalars(select(Payments)).one().amount == 710
+
+
+def test_unknown_or_unpriced_hotel_is_rejected(db, checkout_request):
+    unpriced = Hotel(
+        image="hotel.jpg",
+        name="Dorint",
+        link_to_hotel="https://hotel.example.com",
+        distance_from_track=1.5,
+    )
+    db.add(unpriced)
+    db.commit()
+    repo = BookingRepository(db_session=db)
+
+    for hotel_id, status_code in ((uuid4(), 404), (unpriced.id, 400)):
+        request = checkout_request.model_copy(update={"hotel_id": hotel_id})
+        with pytest.raises(HTTPException) as error:
+            repo.checkout(request, idempotency_key=f"checkout-{status_code}")
+        assert error.value.status_code == status_code
+    assert count(db, Booking) == 0
+
+
+def test_checkout_without_a_payment_provider_is_unavailable(
+    db, checkout_request, monkeypatch
+):
+    monkeypatch.setattr(payments, "_payment_provider", None)
+    # As if PAYMENT_PROVIDER were not set.
+    monkeypatch.setattr(
+        payments, "build_payment_provider", lambda: build_payment_provider(None)
+    )
+
+    with pytest.raises(HTTPException) as error:
+        BookingRepository(db_session=db).checkout(checkout_request, "checkout-0001")
+
+    assert error.value.status_code == 503
+    assert count(db, Booking) == 0
+
+
+def test_payment_provider_fails_closed():
+    with pytest.raises(ValueError):
+        build_payment_provider(None, allow_fake=True)
+    with pytest.raises(ValueError):
+        build_payment_provider("fake", allow_fake=False)
+    with pytest.raises(ValueError):
+        build_payment_provider("stripe", allow_fake=True)
+
+    assert isinstance(
+        build_payment_provider("fake", allow_fake=True), FakePaymentProvider
+    )
@@ -0,0 +1,46 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.endpoints import dashboard
+from database.routing import get_read_db
+
+ADMIN = {"X-Admin-Token": "test-admin-token"}
+
+PATHS = [
+    "/api/v1/dashboard/revenue?start=2025-01-01&end=2025-12-31",
+    "/api/v1/dashboard/vouchers",
+    "/api/v1/dashboard/utilisation?start=2025-01-01&end=2025-12-31",
+]
+
+
+class NoQueries:
+    """Session stand-in: rejected requests must not reach the database."""
+
+    def execute(self, statement):
+        raise AssertionError("unexpected query")
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(dashboard.router, prefix="/api/v1/dashboard")
+    app.dependency_overrides[get_read_db] = NoQueries
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+def test_dashboard_needs_the_admin_token(client, path, headers):
+    assert client.get(path, headers=headers).status_code == 403
+
+
+@pytest.mark.parametrize("report", ["revenue", "utilisation"])
+def test_range_is_capped(client, report):
+    # 2024 is a leap year: 366 days pass, 367 do not.
+    response = client.get(
+        f"/api/v1/dashboard/{report}?start=2024-01-01&end=2025-01-01", headers=ADMIN
+    )
+
+    assert response.status_code == 400
+    assert "366 days" in response.json()["detail"]
@@ -0,0 +1,79 @@
+import asyncio
+
+from utils.events import RESYNC_EVENT, Event, EventBroadcaster
+from utils.invalidation import InMemoryTransport, InvalidationBus
+
+
+def worker(transport):
+    """A broadcaster fed by its own bus, like one uvicorn worker."""
+    broadcaster = EventBroadcaster()
+    bus = InvalidationBus(transport)
+    bus.subscribe_messages(
+        lambda message_id, namespace, key: broadcaster.publish(
+            "availability", {"key": key}, event_id=message_id
+        )
+    )
+    bus.start()
+    return bus, broadcaster
+
+
+def keys(events):
+    return [event.data.get("key") for event in events]
+
+
+def test_client_resumes_on_another_worker():
+    transport = InMemoryTransport()
+    (bus, first), (_, second) = worker(transport), worker(transport)
+    for key in ("1", "2", "3"):
+        bus.publish("car", key)
+
+    last_seen = first._history[0].id
+
+    assert keys(second._replay(last_seen)) == ["2", "3"]
+    assert second._replay(first._history[-1].id) == []
+
+
+def test_resume_follows_delivery_order_not_id_order():
+    broadcaster = EventBroadcaster()
+    # Sequence values drawn by concurrent transactions commit out of order.
+    for event_id, key in ((7, "a"), (5, "b"), (6, "c")):
+        broadcaster.publish("availability", {"key": key}, event_id=event_id)
+
+    assert keys(broadcaster._replay(7)) == ["b", "c"]
+    assert keys(broadcaster._replay(5)) == ["c"]
+
+
+def test_unknown_last_event_id_gets_a_resync():
+    broadcaster = EventBroadcaster(history_size=2)
+    for event_id in (1, 2, 3):
+        broadcaster.publish("availability", {}, event_id=event_id)
+
+    assert [event.type for event in broadcaster._replay(1)] == [RESYNC_EVENT]
+    assert [event.type for event in broadcaster._replay(0)] == [RESYNC_EVENT]
+    assert broadcaster._replay(None) == []
+
+
+def test_local_events_have_no_id_and_are_not_replayed():
+    broadcaster = EventBroadcaster()
+    broadcaster.publish("availability", {}, event_id=1)
+    broadcaster.publish(RESYNC_EVENT, {})
+
+    assert Event(None, RESYNC_EVENT, {}).encode() == b"event: resync\ndata: {}\n\n"
+    assert Event(4, "calendar", {}).encode().startswith(b"id: 4\n")
+    assert [event.id for event in broadcaster._history] == [1]
+
+
+def test_stream_sends_missed_events_first():
+    broadcaster = EventBroadcaster(heartbeat=0.01)
+    for event_id in (1, 2):
+        broadcaster.publish("availability", {}, event_id=event_id)
+
+    async def first_chunks():
+        stream = broadcaster.subscribe(1)
+        chunks = [await stream.__anext__() for _ in range(2)]
+        await stream.aclose()
+        return chunks
+
+    retry, missed = asyncio.run(first_chunks())
+    assert retry.startswith(b"retry:")
+    assert missed.startswith(b"id: 2\n")
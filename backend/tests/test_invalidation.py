@@ -0,0 +1,138 @@
+import threading
+
+from sqlalchemy import create_engine, text
+
+from utils.cache import ALL_KEY, EntityCache
+from utils.invalidation import (
+    InMemoryTransport,
+    InvalidationBus,
+    PostgresNotifyTransport,
+    decode_message,
+)
+
+
+def worker(transport):
+    """A bus and process cache of its own, like one uvicorn worker."""
+    cache = EntityCache()
+    bus = InvalidationBus(transport)
+    bus.subscribe(
+        lambda namespace, key: (
+            cache.clear()
+            if namespace == "*"
+            else cache.handle_invalidation(namespace, key)
+        )
+    )
+    bus.start()
+    return bus, cache
+
+
+def test_publish_evicts_entity_and_list_in_every_worker():
+    transport = InMemoryTransport()
+    (writer, writer_cache), (_, reader_cache) = worker(transport), worker(transport)
+    for cache in (writer_cache, reader_cache):
+        cache.set("car", "1", "car 1")
+        cache.set("car", "2", "car 2")
+        cache.set("car", ALL_KEY, ["car 1", "car 2"])
+        cache.set("hotel", "1", "hotel 1")
+
+    writer.publish("car", "1")
+
+    for cache in (writer_cache, reader_cache):
+        assert cache.get("car", "1") is None
+        assert cache.get("car", ALL_KEY) is None
+        assert cache.get("car", "2") == "car 2"
+        assert cache.get("hotel", "1") == "hotel 1"
+
+
+def test_wildcards_evict_namespace_and_everything():
+    bus, cache = worker(InMemoryTransport())
+    cache.set("car", "1", "car 1")
+    cache.set("hotel", "1", "hotel 1")
+
+    bus.publish("car")
+    assert cache.get("car", "1") is None
+    assert cache.get("hotel", "1") == "hotel 1"
+
+    bus.publish("*")
+    assert cache.get("hotel", "1") is None
+
+
+def test_stopped_bus_receives_nothing():
+    transport = InMemoryTransport()
+    bus, cache = worker(transport)
+    cache.set("car", "1", "car 1")
+
+    bus.stop()
+    bus.publish("car", "1")
+
+    assert cache.get("car", "1") == "car 1"
+
+
+def test_failing_handler_does_not_stop_the_others():
+    bus, cache = worker(InMemoryTransport())
+    bus._handlers.insert(0, lambda namespace, key: 1 / 0)
+    cache.set("car", "1", "car 1")
+
+    bus.publish("car", "1")
+
+    assert cache.get("car", "1") is None
+
+
+def test_load_overlapping_an_eviction_is_not_cached():
+    bus, cache = worker(InMemoryTransport())
+
+    def stale_load():
+        bus.publish("car", "1")  # another worker writes while we read
+        return "old car 1"
+
+    assert cache.get_or_load("car", "1", stale_load) == "old car 1"
+    assert cache.get("car", "1") is None
+    assert cache.get_or_load("car", "1", lambda: "car 1") == "car 1"
+    assert cache.get("car", "1") == "car 1"
+
+
+def test_messages_carry_one_id_for_every_worker():
+    transport = InMemoryTransport()
+    seen = []
+    for _ in range(2):
+        bus = InvalidationBus(transport)
+        bus.subscribe_messages(lambda *message: seen.append(message))
+        bus.start()
+
+    bus.publish("car", "1")
+    bus.publish("hotel")
+
+    assert seen == [
+        (1, "car", "1"),
+        (1, "car", "1"),
+        (2, "hotel", "*"),
+        (2, "hotel", "*"),
+    ]
+
+
+def test_postgres_notify_is_delivered_after_commit(database_url):
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE SEQUENCE IF NOT EXISTS invalidation_message_id")
+        )
+    received = []
+    connected, delivered = threading.Event(), threading.Event()
+
+    def on_payload(payload):
+        received.append(payload)
+        # The listener announces "*" once it is connected.
+        (connected if payload == "*" else delivered).set()
+
+    transport = PostgresNotifyTransport(engine, channel="nurblife_test_cache")
+    transport.start(on_payload)
+    try:
+        assert connected.wait(5)
+        transport.publish(None, "car:1")
+        assert delivered.wait(5)
+        assert received[0] == "*"
+        assert decode_message(received[1])[1] == "car:1"
+        assert decode_message(received[1])[0] > 0
+    finally:
+        transport.stop()
+        engine.dispose()
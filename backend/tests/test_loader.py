@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from crud.cars import CarRepository
+from models.booking import Booking
+from models.car import Car
+from models.enums import BookingStatus, Package
+from models.hotel import Hotel
+from models.outbox import OutboxMessage
+from models.user import User
+from models.voucher import Voucher
+from utils.loader import EntityLoader
+from utils.mailer import SMTPConnectionPool
+from utils.notifications import NotificationDispatcher
+
+MODELS = [Car, Hotel, User, Voucher, Booking]
+
+
+@contextmanager
+def count_queries(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def cars(make_car):
+    return [make_car() for _ in range(5)]
+
+
+@pytest.fixture
+def bookings(db, cars):
+    rows = [
+        Booking(
+            car_id=cars[number % len(cars)].id,
+            email=f"driver{number}@example.com",
+            package=Package.BASE_PACKAGE,
+            track_date=date(2025, 6, 1),
+            laps=2,
+            total_amount=500,
+            status=BookingStatus.CONFIRMED,
+            idempotency_key=f"checkout-{number}",
+        )
+        for number in range(20)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def test_loader_resolves_queued_ids_with_one_query(db, db_engine, cars):
+    loader = EntityLoader(db)
+    missing = uuid4()
+    loader.queue(Car, [car.id for car in cars] + [missing])
+    db.expunge_all()
+
+    with count_queries(db_engine) as statements:
+        first = loader.load(Car, cars[0].id)
+        rest = loader.load_many(Car, [car.id for car in cars[1:]])
+        assert loader.load(Car, missing) is None
+
+    assert len(statements) == 1
+    assert first.id == cars[0].id
+    assert [car.id for car in rest.values()] == [car.id for car in cars[1:]]
+
+
+def test_get_many_is_one_query(db, db_engine, cars):
+    ids = [car.id for car in cars]
+    db.expunge_all()
+
+    with count_queries(db_engine) as statements:
+        found = CarRepository(db).get_many(ids + [uuid4()])
+
+    assert len(statements) == 1
+    assert {car.id for car in found} == set(ids)
+
+
+def test_confirmation_batch_queries_do_not_grow_with_rows(db, db_engine, bookings):
+    dispatcher = NotificationDispatcher(None, SMTPConnectionPool(size=1))
+    messages = [
+        OutboxMessage(payload={"booking_id": str(booking.id)}) for booking in bookings
+    ]
+    messages.append(OutboxMessage(payload={"booking_id": str(uuid4())}))
+    db.expunge_all()
+
+    try:
+        with count_queries(db_engine) as statements:
+            jobs = dispatcher._build_jobs(db, messages)
+    finally:
+        dispatcher.stop()
+
+    # One query for the bookings and one for their cars, not one per row.
+    assert len(statements) == 2
+    assert len(jobs) == len(bookings) + 1
+    assert jobs[-1] is None
+    assert jobs[0]["email"] == "driver0@example.com"
@@ -0,0 +1,67 @@
+import json
+import logging
+import queue
+
+from core.logging_config import JsonFormatter, RateLimitFilter, RequestQueueHandler
+from utils.request_id import request_id_var
+
+
+def queued(log):
+    """Run `log(logger)` through a RequestQueueHandler, return the records."""
+    records = queue.SimpleQueue()
+    logger = logging.getLogger("test.queue")
+    logger.handlers = [RequestQueueHandler(records)]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    log(logger)
+    return [records.get_nowait() for _ in range(records.qsize())]
+
+
+def test_message_is_formatted_on_the_calling_thread():
+    details = {"laps": 2}
+    token = request_id_var.set("req-1")
+    try:
+        [record] = queued(lambda logger: logger.info("Booking %s: %s", 7, details))
+    finally:
+        request_id_var.reset(token)
+    details["laps"] = 3  # a later change must not reach the log line
+
+    assert record.msg == "Booking 7: {'laps': 2}"
+    assert record.args is None
+    assert record.request_id == "req-1"
+    assert json.loads(JsonFormatter().format(record))["message"] == record.msg
+
+
+def test_traceback_is_rendered_before_queueing():
+    def log(logger):
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("Charge %s failed", "p-1")
+
+    [record] = queued(log)
+
+    assert record.exc_info is None
+    assert "ZeroDivisionError" in record.exc_text
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Charge p-1 failed"
+    assert "ZeroDivisionError" in entry["exception"]
+    text = logging.Formatter("%(message)s").format(record)
+    assert "ZeroDivisionError" in text
+
+
+def test_rate_limit_counts_one_template_whatever_the_arguments():
+    limit = RateLimitFilter(limit=2, window=60)
+
+    def records(count):
+        return [
+            logging.makeLogRecord({"msg": "Car %s missing", "args": (number,)})
+            for number in range(count)
+        ]
+
+    assert [limit.filter(record) for record in records(4)] == [
+        True,
+        True,
+        False,
+        False,
+    ]
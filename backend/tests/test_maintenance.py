@@ -0,0 +1,191 @@
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from api.v1.endpoints import fleet
+from crud import maintenance
+from crud.cars import CarRepository
+from crud.maintenance import TRACK_TZ, MaintenanceRepository
+from database.routing import get_read_db
+from database.session import get_db
+from models.car import Car
+from models.maintenance import CarMaintenance
+from schemas.maintenance import MaintenanceCreate
+from utils.cache import entity_cache
+from utils.invalidation import invalidation_bus
+
+MODELS = [Car]
+
+
+@pytest.fixture(autouse=True)
+def maintenance_table(db_engine):
+    """The GiST exclusion constraint needs btree_gist, like `init_db`."""
+    with db_engine.begin() as connection:
+        available = connection.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'btree_gist'")
+        ).scalar()
+        if not available:
+            pytest.skip("btree_gist is not available")
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        CarMaintenance.__table__.create(connection)
+
+
+@pytest.fixture(autouse=True)
+def availability_cache():
+    entity_cache.clear()
+    maintenance._availability_day.clear()
+    invalidation_bus.start()
+    yield
+    invalidation_bus.stop()
+    entity_cache.clear()
+
+
+@pytest.fixture
+def repo(db):
+    return MaintenanceRepository(db_session=db)
+
+
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(fleet.router, prefix="/api/v1/fleet")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_read_db] = lambda: db
+    return TestClient(app)
+
+
+def at(day: date, hour: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, tzinfo=TRACK_TZ)
+
+
+def window(car, starts_at, ends_at):
+    return MaintenanceCreate(car_id=car.id, starts_at=starts_at, ends_at=ends_at)
+
+
+def freeze_now(monkeypatch, now: datetime):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz)
+
+    monkeypatch.setattr(maintenance, "datetime", FrozenDatetime)
+
+
+def test_add_window(repo, make_car):
+    car = make_car()
+    created = repo.add(window(car, at(date(2030, 6, 1)), at(date(2030, 6, 3))))
+
+    assert created.car_id == car.id
+    assert created.starts_at == at(date(2030, 6, 1))
+    assert [w.id for w in repo.get_for_car(car.id)] == [created.id]
+
+
+def test_overlapping_window_is_rejected(repo, make_car):
+    car, other_car = make_car(), make_car()
+    repo.add(window(car, at(date(2030, 6, 1)), at(date(2030, 6, 3))))
+
+    with pytest.raises(HTTPException) as error:
+        repo.add(window(car, at(date(2030, 6, 2)), at(date(2030, 6, 4))))
+    assert error.value.status_code == 409
+
+    # Windows are half-open, and other cars are not affected.
+    repo.add(window(car, at(date(2030, 6, 3)), at(date(2030, 6, 4))))
+    repo.add(window(other_car, at(date(2030, 6, 2)), at(date(2030, 6, 4))))
+    assert len(repo.get_for_car(car.id)) == 2
+
+
+def test_unknown_car_is_not_found(repo, monkeypatch):
+    missing = MaintenanceCreate(
+        car_id=uuid4(), starts_at=at(date(2030, 6, 1)), ends_at=at(date(2030, 6, 2))
+    )
+    with pytest.raises(HTTPException) as error:
+        repo.add(missing)
+    assert error.value.status_code == 404
+
+    # A car deleted after the lookup trips the foreign key instead.
+    monkeypatch.setattr(CarRepository, "get_car_by_id", lambda self, car_id: None)
+    with pytest.raises(HTTPException) as error:
+        repo.add(missing)
+    assert error.value.status_code == 404
+
+
+def test_available_cars(client, repo, make_car):
+    free, busy = make_car(), make_car()
+    in_shop = make_car(in_repair_shop=True)
+    repo.add(window(busy, at(date(2030, 6, 2)), at(date(2030, 6, 3))))
+
+    def available(starts_at, ends_at):
+        response = client.get(
+            "/api/v1/fleet/available",
+            params={"starts_at": starts_at.isoformat(), "ends_at": ends_at.isoformat()},
+        )
+        assert response.status_code == 200
+        return set(response.json()["available_car_ids"])
+
+    # The repair shop flag only applies to periods that have already started.
+    future = available(at(date(2030, 6, 1)), at(date(2030, 6, 5)))
+    assert future == {str(free.id), str(in_shop.id)}
+    now = datetime.now(timezone.utc)
+    current = available(now - timedelta(hours=1), now + timedelta(hours=1))
+    assert current == {str(free.id), str(busy.id)}
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"starts_at": "2030-06-01T00:00:00", "ends_at": "2030-06-02T00:00:00+02:00"},
+        {"starts_at": "2030-06-01T00:00:00+02:00", "ends_at": "2030-06-02T00:00:00"},
+    ],
+)
+def test_available_cars_needs_timezones(client, params):
+    assert client.get("/api/v1/fleet/available", params=params).status_code == 422
+
+
+def test_month_availability(client, repo, make_car):
+    car = make_car()
+    repo.add(window(car, at(date(2030, 6, 15), 8), at(date(2030, 6, 16), 8)))
+
+    response = client.get("/api/v1/fleet/availability/2030/6")
+
+    assert response.status_code == 200
+    days = response.json()["days"]
+    assert len(days) == 30
+    busy_days = {day for day, car_ids in days.items() if str(car.id) not in car_ids}
+    assert busy_days == {"2030-06-15", "2030-06-16"}
+
+
+@pytest.mark.parametrize("year", [0, 1999, 2101, 9999, 10000])
+def test_month_availability_bounds_the_year(client, year):
+    response = client.get(f"/api/v1/fleet/availability/{year}/12")
+    assert response.status_code == 422
+
+
+def test_month_availability_follows_the_track_day(repo, make_car, monkeypatch):
+    car = make_car(in_repair_shop=True)
+
+    def free_days():
+        days = repo.get_month_availability(2030, 6).days
+        return {day for day, car_ids in days.items() if car.id in car_ids}
+
+    freeze_now(monkeypatch, at(date(2030, 6, 10), 12))
+    assert free_days() == {date(2030, 6, day) for day in range(1, 10)}
+
+    # The cached view of June 10 must not be served on June 20.
+    freeze_now(monkeypatch, at(date(2030, 6, 20), 12))
+    assert free_days() == {date(2030, 6, day) for day in range(1, 20)}
+
+
+def test_month_availability_is_evicted_on_writes(repo, make_car):
+    car = make_car()
+    assert all(
+        car.id in ids for ids in repo.get_month_availability(2030, 6).days.values()
+    )
+
+    repo.add(window(car, at(date(2030, 6, 15)), at(date(2030, 6, 16))))
+
+    days = repo.get_month_availability(2030, 6).days
+    assert car.id not in days[date(2030, 6, 15)]
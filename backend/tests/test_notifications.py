@@ -0,0 +1,177 @@
+import email
+import socketserver
+import threading
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from models.booking import Booking
+from models.car import Car
+from models.enums import BookingStatus, OutboxStatusEnum, Package
+from models.hotel import Hotel
+from models.outbox import OutboxMessage
+from models.user import User
+from models.voucher import Voucher
+from utils.mailer import SMTPConnectionPool
+from utils.notifications import NotificationDispatcher, enqueue_booking_confirmation
+
+MODELS = [Car, Hotel, User, Voucher, Booking, OutboxMessage]
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib; answers 451 to the first `reject` DATA."""
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 stub ESMTP")
+        for raw in self.rfile:
+            command = raw.decode().strip().upper()
+            if command.startswith("EHLO") or command.startswith("HELO"):
+                self.reply("250 stub")
+            elif command == "DATA":
+                self.reply("354 end with <CR><LF>.<CR><LF>")
+                lines = []
+                for data in self.rfile:
+                    if data == b".\r\n":
+                        break
+                    lines.append(data[1:] if data.startswith(b"..") else data)
+                with server.lock:
+                    rejected = server.reject > 0
+                    server.reject -= rejected
+                    if not rejected:
+                        server.messages.append(b"".join(lines))
+                self.reply("451 try again later" if rejected else "250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 ok")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.messages = []
+    server.reject = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def dispatcher(db_engine, smtp_server):
+    pool = SMTPConnectionPool(
+        host="127.0.0.1", port=smtp_server.server_address[1], size=2, timeout=5
+    )
+    dispatcher = NotificationDispatcher(
+        sessionmaker(bind=db_engine), pool, workers=2, batch_size=10
+    )
+    yield dispatcher
+    dispatcher.stop()
+
+
+@pytest.fixture
+def confirmed_bookings(db, make_car):
+    """Confirmed bookings of one car, each with its confirmation queued."""
+    car = make_car(make="Porsche", model="GT3")
+
+    def create(count: int):
+        bookings = []
+        for number in range(count):
+            booking = Booking(
+                car_id=car.id,
+                email=f"driver{number}@example.com",
+                package=Package.PREMIUM_PACKAGE,
+                track_date=date(2025, 6, 1),
+                laps=2,
+                total_amount=500,
+                status=BookingStatus.CONFIRMED,
+                idempotency_key=f"checkout-{number:04d}",
+            )
+            db.add(booking)
+            db.flush()
+            enqueue_booking_confirmation(db, booking.id)
+            bookings.append(booking)
+        db.commit()
+        return bookings
+
+    return create
+
+
+def outbox_statuses(db):
+    db.expire_all()
+    return [message.status for message in db.scalars(select(OutboxMessage))]
+
+
+def test_confirmations_share_pooled_connections(
+    db, dispatcher, smtp_server, confirmed_bookings
+):
+    bookings = confirmed_bookings(6)
+
+    assert dispatcher.run_once() == 6
+
+    recipients = {email.message_from_bytes(raw)["To"] for raw in smtp_server.messages}
+    assert recipients == {booking.email for booking in bookings}
+    assert smtp_server.connections <= 2
+    assert outbox_statuses(db) == [OutboxStatusEnum.SENT] * 6
+
+
+def test_confirmation_carries_the_track_day_as_ics(
+    dispatcher, smtp_server, confirmed_bookings
+):
+    (booking,) = confirmed_bookings(1)
+
+    dispatcher.run_once()
+
+    message = email.message_from_bytes(smtp_server.messages[0])
+    assert "2025-06-01" in message["Subject"]
+    (attachment,) = [
+        part for part in message.walk() if part.get_content_type() == "text/calendar"
+    ]
+    assert attachment.get_filename() == "nurburgring-track-day.ics"
+    ics = attachment.get_payload(decode=True).decode()
+    assert "DTSTART;VALUE=DATE:20250601" in ics
+    assert f"UID:{booking.id}@nurblife.bg" in ics
+    assert "Porsche GT3" in ics
+
+
+def test_failed_send_is_retried(db, dispatcher, smtp_server, confirmed_bookings):
+    confirmed_bookings(1)
+    smtp_server.reject = 1
+
+    dispatcher.run_once()
+
+    message = db.scalars(select(OutboxMessage)).one()
+    assert message.status == OutboxStatusEnum.PENDING
+    assert message.attempts == 1
+    assert "try again later" in message.last_error
+    assert message.available_at > datetime.now(timezone.utc)
+    assert smtp_server.messages == []
+
+    message.available_at = datetime.now(timezone.utc)
+    db.commit()
+    dispatcher.run_once()
+
+    assert outbox_statuses(db) == [OutboxStatusEnum.SENT]
+    assert len(smtp_server.messages) == 1
+
+
+def test_stop_shuts_the_workers_down(dispatcher, confirmed_bookings):
+    confirmed_bookings(1)
+    dispatcher.run_once()
+
+    dispatcher.stop()
+
+    with pytest.raises(RuntimeError):
+        dispatcher.executor.submit(print)
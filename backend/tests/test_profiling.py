@@ -0,0 +1,58 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from utils import profiling
+from utils.profiling import (
+    PROFILE_ID_PATTERN,
+    ProfiledRoute,
+    ProfileStore,
+    ProfilingMiddleware,
+)
+from utils.request_id import RequestIDMiddleware
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ProfileStore(directory=str(tmp_path), max_files=10)
+    monkeypatch.setattr(profiling, "profile_store", store)
+    return store
+
+
+@pytest.fixture
+def client(store):
+    router = APIRouter(route_class=ProfiledRoute)
+    router.get("/ping")(lambda: {"pong": True})
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ProfilingMiddleware, sample_rate=1.0)
+    app.add_middleware(RequestIDMiddleware)
+    return TestClient(app)
+
+
+def test_profile_is_stored_under_a_server_generated_id(client, store, tmp_path):
+    response = client.get("/ping", headers={"X-Request-ID": "chosen-by-client"})
+
+    profile_id = response.headers["X-Profile-ID"]
+    assert PROFILE_ID_PATTERN.match(profile_id)
+    assert response.headers["X-Request-ID"] == "chosen-by-client"
+    assert store.load(profile_id) is not None
+    assert store.load("chosen-by-client") is None
+    assert [path.name for path in tmp_path.iterdir()] == [
+        f"{profile_id}.speedscope.json"
+    ]
+
+
+def test_same_request_id_never_overwrites_a_profile(client, store):
+    headers = {"X-Request-ID": "chosen-by-client"}
+
+    first = client.get("/ping", headers=headers).headers["X-Profile-ID"]
+    second = client.get("/ping", headers=headers).headers["X-Profile-ID"]
+
+    assert first != second
+    assert store.load(first) is not None and store.load(second) is not None
+
+
+@pytest.mark.parametrize("profile_id", ["../../etc/passwd", "ABC", "0" * 31])
+def test_load_rejects_anything_but_profile_ids(store, profile_id):
+    assert store.load(profile_id) is None
@@ -0,0 +1,187 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from models.booking import Booking
+from models.car import Car
+from models.enums import (
+    BookingStatus,
+    Package,
+    PaymentStatusEnum,
+    VoucherStatusEnum,
+)
+from models.hotel import Hotel
+from models.payments import Payments
+from models.rollups import RevenueRollup, RollupWatermark, VoucherRollup
+from models.transaction import Transaction
+from models.user import User
+from models.voucher import Voucher
+from utils.rollups import refresh_rollups
+
+MODELS = [
+    Car,
+    Hotel,
+    User,
+    Voucher,
+    Transaction,
+    Booking,
+    Payments,
+    RevenueRollup,
+    VoucherRollup,
+    RollupWatermark,
+]
+
+TRACK_DAY = date(2025, 6, 1)
+
+
+@pytest.fixture
+def refresh(db_engine):
+    factory = sessionmaker(autoflush=False, bind=db_engine)
+    return lambda: refresh_rollups(factory)
+
+
+@pytest.fixture
+def confirm(db, make_car):
+    car = make_car()
+
+    def confirm(amount: int, number: int) -> Booking:
+        booking = Booking(
+            car_id=car.id,
+            email="driver@example.com",
+            package=Package.BASE_PACKAGE,
+            track_date=TRACK_DAY,
+            laps=2,
+            total_amount=amount,
+            status=BookingStatus.CONFIRMED,
+            idempotency_key=f"checkout-{number}",
+        )
+        transaction = Transaction(amount=amount, provider_reference=f"ref-{number}")
+        db.add_all([booking, transaction])
+        db.flush()
+        db.add(
+            Payments(
+                booking_id=booking.id,
+                transaction_id=transaction.id,
+                amount=amount,
+                status=PaymentStatusEnum.SUCCEEDED,
+                idempotency_key=f"payment:{booking.id}",
+            )
+        )
+        db.commit()
+        return booking
+
+    return confirm
+
+
+def revenue(db):
+    db.expire_all()
+    return db.execute(
+        select(RevenueRollup.bookings_count, RevenueRollup.revenue).where(
+            RevenueRollup.day == TRACK_DAY
+        )
+    ).all()
+
+
+def test_reruns_do_not_count_twice(db, refresh, confirm):
+    confirm(500, 1)
+    confirm(300, 2)
+
+    assert refresh()
+    assert refresh()
+
+    assert revenue(db) == [(2, 800)]
+
+
+def test_late_commit_with_an_older_timestamp_is_counted(db, refresh, confirm):
+    refresh()
+    booking = confirm(500, 1)
+    # As if its transaction had started before the previous run.
+    db.execute(
+        update(Booking)
+        .where(Booking.id == booking.id)
+        .values(updated_at=datetime.now(timezone.utc) - timedelta(seconds=30))
+    )
+    db.commit()
+
+    refresh()
+
+    assert revenue(db) == [(1, 500)]
+
+
+def test_cancellations_and_refunds_are_subtracted(db, refresh, confirm):
+    cancelled = confirm(500, 1)
+    refunded = confirm(300, 2)
+    confirm(200, 3)
+    refresh()
+    assert revenue(db) == [(3, 1000)]
+
+    cancelled.status = BookingStatus.CANCELLED
+    db.commit()
+    refresh()
+    assert revenue(db) == [(2, 500)]
+
+    refunded.status = BookingStatus.REFUNDED
+    db.commit()
+    refresh()
+    assert revenue(db) == [(1, 200)]
+
+
+def test_voucher_figures_follow_redemptions_and_expiry(db, refresh):
+    now = datetime.now()
+    issued = now - timedelta(days=200)
+    db.add_all(
+        [
+            Voucher(
+                code="used",
+                amount=100,
+                issued_at=issued,
+                expiration_data=now - timedelta(days=1),
+                status=VoucherStatusEnum.USED_VOUCHER,
+                used_on=now - timedelta(days=2),
+            ),
+            Voucher(
+                code="expired",
+                amount=50,
+                issued_at=issued,
+                expiration_data=now - timedelta(hours=1),
+                status=VoucherStatusEnum.ACTIVE_VOUCHER,
+                used_on=issued,
+            ),
+            Voucher(
+                code="active",
+                amount=30,
+                issued_at=issued,
+                expiration_data=now + timedelta(days=10),
+                status=VoucherStatusEnum.ACTIVE_VOUCHER,
+                used_on=issued,
+            ),
+        ]
+    )
+    db.commit()
+
+    refresh()
+    refresh()
+
+    assert db.execute(
+        select(VoucherRollup.issued_count, VoucherRollup.issued_amount).where(
+            VoucherRollup.day == issued.date()
+        )
+    ).one() == (3, 180)
+    assert (
+        db.scalar(
+            select(VoucherRollup.redeemed_amount).where(
+                VoucherRollup.day == (now - timedelta(days=2)).date()
+            )
+        )
+        == 100
+    )
+    assert (
+        db.scalar(
+            select(VoucherRollup.expired_amount).where(
+                VoucherRollup.day == (now - timedelta(hours=1)).date()
+            )
+        )
+        == 50
+    )
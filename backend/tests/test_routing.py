@@ -0,0 +1,110 @@
+import time
+from uuid import UUID
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from database import routing
+from database.routing import (
+    PIN_COOKIE,
+    ReadYourWritesMiddleware,
+    Replica,
+    ReplicaRouter,
+    get_read_db,
+)
+from models.base import Base
+from models.car import Car
+
+MODELS = [Car]
+
+
+@pytest.fixture
+def replica(database_url, db_engine, monkeypatch):
+    """
+    A second local database standing in for a replica that has not
+    replayed anything yet: same schema as the primary, no rows.
+    """
+    url = make_url(database_url).set(database="nurb_replica")
+    with db_engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = 'nurb_replica'")
+        ).scalar()
+        if not exists:
+            connection.execute(text("CREATE DATABASE nurb_replica"))
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+        Base.metadata.create_all(connection, tables=[Car.__table__])
+
+    replica = Replica("replica1", engine, max_staleness=10)
+    replica.lag = 0
+    monkeypatch.setattr(routing, "replica_router", ReplicaRouter([replica]))
+    yield replica
+    engine.dispose()
+
+
+@pytest.fixture
+def app(replica, make_car):
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window=10)
+
+    @app.post("/cars")
+    def create_car():
+        return {"id": str(make_car().id)}
+
+    @app.get("/cars/{car_id}")
+    def get_car(car_id: UUID, db=Depends(get_read_db)):
+        if db.get(Car, car_id) is None:
+            raise HTTPException(status_code=404)
+        return {"id": str(car_id)}
+
+    return app
+
+
+def test_writer_reads_its_write_from_the_primary(app):
+    writer, other = TestClient(app), TestClient(app)
+
+    response = writer.post("/cars")
+    car_id = response.json()["id"]
+
+    assert PIN_COOKIE in response.cookies
+    assert writer.get(f"/cars/{car_id}").status_code == 200
+    # Clients that did not write still read from the (stale) replica.
+    assert other.get(f"/cars/{car_id}").status_code == 404
+
+
+def test_expired_pin_reads_from_the_replica(app):
+    client = TestClient(app)
+    car_id = client.post("/cars").json()["id"]
+
+    client.cookies.set(PIN_COOKIE, str(int(time.time()) - 1))
+
+    assert client.get(f"/cars/{car_id}").status_code == 404
+
+
+def test_lagging_replica_is_skipped(app, replica):
+    client = TestClient(app)
+    car_id = client.post("/cars").json()["id"]
+    client.cookies.clear()
+
+    replica.lag = 60
+
+    assert client.get(f"/cars/{car_id}").status_code == 200
+
+
+def test_failed_write_does_not_pin():
+    async def fail(scope, receive, send):
+        await send({"type": "http.response.start", "status": 409, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    response = TestClient(ReadYourWritesMiddleware(fail, window=10)).post("/")
+
+    assert response.status_code == 409
+    assert PIN_COOKIE not in response.cookies
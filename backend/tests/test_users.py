@@ -0,0 +1,182 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from api.v1.endpoints import users
+from crud.users import UserRepository
+from database.routing import get_read_db
+from models.booking import Booking
+from models.car import Car
+from models.enums import BookingStatus, Package
+from models.hotel import Hotel
+from models.user import User
+from models.voucher import Voucher
+from schemas.user import UserCreate
+from utils.contacts import normalize_phone
+from utils.user_dedup import dedup_users, find_duplicates
+
+MODELS = [Car, Hotel, User, Voucher, Booking]
+
+ADMIN = {"X-Admin-Token": "test-admin-token"}
+
+CUSTOMER = {
+    "first_name": "Ivan",
+    "last_name": "Petrov",
+    "phone_number": "0888 123 456",
+    "country_code": "+359",
+    "date_of_birth": date(1990, 1, 1),
+    "country": "Bulgaria",
+    "address": "1 Vitosha Blvd",
+    "postcode": "1000",
+    "town": "Sofia",
+}
+
+
+class NoUsers:
+    """Session stand-in: the guard has to reject requests before any query."""
+
+    def get(self, model, key):
+        return None
+
+    def scalars(self, statement):
+        return []
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api/v1/users")
+    app.dependency_overrides[get_read_db] = NoUsers
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/v1/users/lookup?email=driver@example.com", f"/api/v1/users/{uuid4()}"],
+)
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}])
+def test_customer_data_needs_the_admin_token(client, path, headers):
+    assert client.get(path, headers=headers).status_code == 403
+
+
+def test_admin_passes_the_guard(client):
+    assert client.get(f"/api/v1/users/{uuid4()}", headers=ADMIN).status_code == 404
+    assert client.get("/api/v1/users/lookup", headers=ADMIN).status_code == 400
+
+
+@pytest.mark.parametrize(
+    "phone_number, country_code, expected",
+    [
+        ("+359 888 123 456", "+359", "+359888123456"),
+        ("00359 888-123-456", "+44", "+359888123456"),
+        ("0888 123 456", "+359", "+359888123456"),
+        ("888123456", "359", "+359888123456"),
+        ("+44 (0)20 7946 0958", "+359", "+442079460958"),
+        ("0044 ( 0 ) 20 7946 0958", "+359", "+442079460958"),
+        ("(0)20 7946 0958", "+44", "+442079460958"),
+        ("+1 (212) 555-0100", "+359", "+12125550100"),
+        ("0888 123 456", "", None),
+        ("123", "+359", None),
+        ("+1234567890123456", "+359", None),
+        ("", "+359", None),
+        (None, "+359", None),
+    ],
+)
+def test_normalize_phone(phone_number, country_code, expected):
+    assert normalize_phone(phone_number, country_code) == expected
+
+
+def test_find_duplicates_chains_matches():
+    a, b, c, d, e = (UUID(int=number) for number in range(1, 6))
+    rows = [
+        (a, "ann@example.com", "+359888000001", "Ann", "Lee"),
+        # Same email as a
+        (b, "ann@example.com", "+359888000002", "Ann", "Lee"),
+        # Same phone and name as b, so merged with a as well
+        (c, "lee@example.com", "+359888000002", " ann", "LEE "),
+        # Same phone as b, other name
+        (d, "bob@example.com", "+359888000002", "Bob", "Lee"),
+        (e, "eve@example.com", None, "Ann", "Lee"),
+    ]
+
+    assert find_duplicates(rows) == {b: a, c: a}
+
+
+def test_concurrent_find_or_create_creates_one_customer(db_engine):
+    sessions = sessionmaker(bind=db_engine)
+    start = threading.Barrier(8)
+
+    def checkout(number: int):
+        email = "Ivan.Petrov@Example.com" if number % 2 else " ivan.petrov@example.com"
+        with sessions() as db:
+            start.wait()
+            user = UserRepository(db_session=db).find_or_create(
+                UserCreate(email=email, **CUSTOMER)
+            )
+            db.commit()
+            return user.id
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = set(executor.map(checkout, range(8)))
+
+    with sessions() as db:
+        assert db.scalar(select(func.count()).select_from(User)) == 1
+        assert ids == {db.scalar(select(User.id))}
+
+
+def test_dedup_moves_bookings_to_the_survivor(db_engine, db, make_car):
+    # Databases from before the unique normalized email hold duplicates.
+    with db_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_user_email_normalized"))
+    car = make_car()
+    a, b, c, d = (UUID(int=number) for number in range(1, 5))
+    customers = [
+        (a, "ann@example.com", "0888 000 001", "Ann"),
+        (b, "ANN@example.com", "0888 000 002", "Ann"),
+        (c, "lee@example.com", "+359 888 000 002", "Ann"),
+        (d, "bob@example.com", "+359 888 000 002", "Bob"),
+    ]
+    for user_id, email, phone_number, first_name in customers:
+        details = {
+            **CUSTOMER,
+            "phone_number": phone_number,
+            "first_name": first_name,
+            "last_name": "Lee",
+        }
+        db.add(User(id=user_id, email=email, **details))
+    db.flush()
+    for number, (user_id, email, _, _) in enumerate(customers):
+        db.add(
+            Booking(
+                car_id=car.id,
+                user_id=user_id,
+                email=email,
+                package=Package.BASE_PACKAGE,
+                track_date=date(2025, 6, 1),
+                laps=1,
+                total_amount=250,
+                status=BookingStatus.CONFIRMED,
+                idempotency_key=f"checkout-{number:04d}",
+            )
+        )
+    db.commit()
+
+    result = dedup_users(db_engine, batch_size=2)
+
+    assert (result.users, result.merged) == (4, 2)
+    db.expire_all()
+    assert set(db.scalars(select(User.id))) == {a, d}
+    owners = {booking.email: booking.user_id for booking in db.scalars(select(Booking))}
+    assert owners == {
+        "ann@example.com": a,
+        "ANN@example.com": a,
+        "lee@example.com": a,
+        "bob@example.com": d,
+    }
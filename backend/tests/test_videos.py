@@ -0,0 +1,249 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import boto3
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from moto import mock_aws
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from api.v1.endpoints import videos
+from core.config import S3_BUCKET, S3_REGION
+from crud.booking import BookingRepository
+from database.routing import get_read_db
+from database.session import get_db
+from models.booking import Booking, BookingIdempotencyKey
+from models.car import Car
+from models.enums import OutboxStatusEnum, VideoStatusEnum
+from models.hotel import Hotel
+from models.outbox import OutboxMessage
+from models.payments import Payments
+from models.transaction import Transaction
+from models.user import User
+from models.video import LapVideo
+from models.voucher import Voucher
+from utils import storage, video_processing
+from utils.video_processing import VIDEO_PROCESS_TOPIC, VideoDispatcher
+
+MODELS = [
+    Car,
+    Hotel,
+    User,
+    Voucher,
+    Transaction,
+    Booking,
+    BookingIdempotencyKey,
+    Payments,
+    OutboxMessage,
+    LapVideo,
+]
+
+# Two parts: one of the S3 minimum size and a short last one.
+SIZE = storage.MIN_PART_SIZE + 10
+CONTENT = bytes(range(256)) * (SIZE // 256) + bytes(SIZE % 256)
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
+        monkeypatch.setenv(name, "testing")
+    with mock_aws():
+        monkeypatch.setattr(storage, "_client", None)
+        monkeypatch.setattr(
+            storage,
+            "part_size_for",
+            functools.partial(storage.part_size_for, preferred=storage.MIN_PART_SIZE),
+        )
+        client = boto3.client("s3", region_name=S3_REGION)
+        client.create_bucket(
+            Bucket=S3_BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": S3_REGION},
+        )
+        yield client
+
+
+@pytest.fixture
+def client(db, s3):
+    def session():
+        yield db
+
+    app = FastAPI()
+    app.include_router(videos.router, prefix="/videos")
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_read_db] = session
+    return TestClient(app)
+
+
+@pytest.fixture
+def video(db, client, checkout_request):
+    booking = BookingRepository(db_session=db).checkout(
+        checkout_request, idempotency_key="checkout-video"
+    )
+    response = client.post(
+        "/videos/",
+        json={"booking_id": str(booking.id), "filename": "lap.mp4", "size": SIZE},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def put_part(client, video, number):
+    start = (number - 1) * video["part_size"]
+    return client.put(
+        f"/videos/{video['id']}/parts/{number}",
+        content=CONTENT[start : start + video["part_size"]],
+    )
+
+
+def test_interrupted_upload_resumes_from_the_missing_parts(client, video, s3):
+    assert video["part_count"] == 2
+    assert put_part(client, video, 2).status_code == 200
+
+    progress = client.get(f"/videos/{video['id']}/parts").json()
+    assert progress["missing_parts"] == [1]
+    assert client.post(f"/videos/{video['id']}/complete").status_code == 409
+
+    # A retried part replaces the first copy.
+    assert put_part(client, video, 1).status_code == 200
+    assert put_part(client, video, 1).status_code == 200
+    completed = client.post(f"/videos/{video['id']}/complete")
+
+    assert completed.status_code == 200
+    assert completed.json()["status"] == "processing"
+    key = f"lap-videos/{video['booking_id']}/{video['id']}/original"
+    stored = s3.get_object(Bucket=S3_BUCKET, Key=key)["Body"].read()
+    assert stored == CONTENT
+
+
+def test_part_of_the_wrong_size_is_rejected(client, video):
+    response = client.put(f"/videos/{video['id']}/parts/2", content=b"short")
+
+    assert response.status_code == 400
+    assert client.get(f"/videos/{video['id']}/parts").json()["missing_parts"] == [1, 2]
+
+
+def test_aborted_upload_frees_its_parts(client, video, s3):
+    put_part(client, video, 1)
+
+    assert client.delete(f"/videos/{video['id']}").status_code == 200
+    assert "Uploads" not in s3.list_multipart_uploads(Bucket=S3_BUCKET)
+    assert client.get(f"/videos/{video['id']}").status_code == 404
+
+
+@pytest.fixture
+def uploaded(client, video):
+    """A completed upload waiting for its video.process job."""
+    for number in (1, 2):
+        put_part(client, video, number)
+    assert client.post(f"/videos/{video['id']}/complete").status_code == 200
+    return video
+
+
+@pytest.fixture
+def dispatchers(db_engine):
+    """Video dispatchers encoding in a thread instead of a process pool."""
+    created = []
+
+    def create():
+        dispatcher = VideoDispatcher(sessionmaker(bind=db_engine), lease_seconds=60)
+        dispatcher.executor = ThreadPoolExecutor(max_workers=1)
+        created.append(dispatcher)
+        return dispatcher
+
+    yield create
+    for dispatcher in created:
+        dispatcher.executor.shutdown()
+
+
+def job_state(db, video):
+    db.expire_all()
+    message = db.scalars(
+        select(OutboxMessage).where(OutboxMessage.topic == VIDEO_PROCESS_TOPIC)
+    ).one()
+    return message, db.get(LapVideo, UUID(video["id"]))
+
+
+def test_job_is_committed_as_leased_before_encoding(
+    db, db_engine, uploaded, dispatchers, monkeypatch
+):
+    seen = []
+
+    def process_video(source_key, transcoded_key, thumbnail_key):
+        # No transaction of the dispatcher holds the message meanwhile.
+        with sessionmaker(bind=db_engine)() as other:
+            message = other.scalars(
+                select(OutboxMessage)
+                .where(OutboxMessage.topic == VIDEO_PROCESS_TOPIC)
+                .with_for_update(nowait=True)
+            ).one()
+            seen.append((message.status, source_key))
+
+    monkeypatch.setattr(video_processing, "process_video", process_video)
+
+    assert dispatchers().run_once() == 1
+
+    prefix = f"lap-videos/{uploaded['booking_id']}/{uploaded['id']}"
+    assert seen == [(OutboxStatusEnum.IN_PROGRESS, f"{prefix}/original")]
+    message, lap_video = job_state(db, uploaded)
+    assert message.status == OutboxStatusEnum.SENT
+    assert lap_video.status == VideoStatusEnum.READY
+    assert lap_video.transcoded_key == f"{prefix}/video.mp4"
+    assert lap_video.thumbnail_key == f"{prefix}/thumbnail.jpg"
+
+
+def test_failed_encode_is_retried(db, uploaded, dispatchers, monkeypatch):
+    def process_video(*keys):
+        raise RuntimeError("ffmpeg exited with 1")
+
+    monkeypatch.setattr(video_processing, "process_video", process_video)
+
+    dispatchers().run_once()
+
+    message, lap_video = job_state(db, uploaded)
+    assert message.status == OutboxStatusEnum.PENDING
+    assert message.attempts == 1
+    assert message.available_at > datetime.now(timezone.utc)
+    assert lap_video.status == VideoStatusEnum.PROCESSING
+
+
+def test_expired_lease_passes_the_job_on(db, uploaded, dispatchers, monkeypatch):
+    monkeypatch.setattr(video_processing, "process_video", lambda *keys: None)
+    crashed, other = dispatchers(), dispatchers()
+    (job,) = crashed._claim()
+    assert other.run_once() == 0
+
+    message, _ = job_state(db, uploaded)
+    message.available_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.commit()
+    assert other.run_once() == 1
+
+    # The first worker comes back late: its result is dropped.
+    crashed._record(job, RuntimeError("late failure"))
+    message, lap_video = job_state(db, uploaded)
+    assert message.status == OutboxStatusEnum.SENT
+    assert message.attempts == 1
+    assert lap_video.status == VideoStatusEnum.READY
+
+
+@pytest.mark.parametrize(
+    "filename, header",
+    [
+        ("lap.mp4", "attachment; filename=\"lap.mp4\"; filename*=UTF-8''lap.mp4"),
+        (
+            'Nürburgring "best".mp4',
+            'attachment; filename="Nurburgring _best_.mp4";'
+            " filename*=UTF-8''N%C3%BCrburgring%20%22best%22.mp4",
+        ),
+        (
+            "../a\r\nSet-Cookie: x.mp4",
+            'attachment; filename="aSet-Cookie_ x.mp4";'
+            " filename*=UTF-8''aSet-Cookie%3A%20x.mp4",
+        ),
+    ],
+)
+def test_download_name_is_sanitised(filename, header):
+    assert storage.content_disposition(filename) == header
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+
+from models.car import Car
+from models.hotel import Hotel
+from utils import warmup
+from utils.warmup import readiness, warm_up
+
+MODELS = [Car, Hotel]
+
+
+@pytest.fixture(autouse=True)
+def fresh_readiness():
+    readiness.reset()
+    yield
+    readiness.stop()
+
+
+def test_worker_is_not_ready_until_the_database_answers(db_engine, monkeypatch):
+    unreachable = create_engine("postgresql://nobody@/missing?host=/nonexistent")
+    monkeypatch.setattr(warmup, "engine", unreachable)
+    worker = threading.Thread(target=warm_up, args=(FastAPI(), 0.01))
+    worker.start()
+
+    worker.join(0.3)
+    assert worker.is_alive()
+    assert not readiness.is_ready
+
+    monkeypatch.setattr(warmup, "engine", db_engine)
+    worker.join(5)
+    assert readiness.is_ready
+
+
+def test_failing_optional_steps_do_not_block_readiness(db_engine, monkeypatch):
+    def fail():
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(warmup, "engine", db_engine)
+    monkeypatch.setattr(warmup, "warm_catalog", fail)
+    monkeypatch.setattr(warmup, "warm_calendar", fail)
+
+    warm_up(FastAPI())
+
+    assert readiness.is_ready
+
+
+def test_shutdown_ends_a_waiting_warm_up(monkeypatch):
+    unreachable = create_engine("postgresql://nobody@/missing?host=/nonexistent")
+    monkeypatch.setattr(warmup, "engine", unreachable)
+    worker = threading.Thread(target=warm_up, args=(FastAPI(), 10))
+    worker.start()
+
+    readiness.stop()
+    worker.join(5)
+
+    assert not worker.is_alive()
+    assert not readiness.is_ready
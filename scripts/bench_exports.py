@@ -0,0 +1,94 @@
+"""
+Benchmark: export memory use stays flat regardless of table size.
+
+Inserts synthetic users into DATABASE_URL (use a scratch database) until
+each checkpoint is reached, exports the table in every format and reports
+the time and the peak memory allocated by Python during the export.
+
+    python scripts/bench_exports.py [max_rows]   # default 1,000,000
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from database.session import engine  # noqa: E402
+from models.user import User  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+from utils.exports import iter_export  # noqa: E402
+
+INSERT_BATCH = 10_000
+
+
+def fill_users(target: int) -> None:
+    with engine.begin() as connection:
+        current = connection.execute(select(func.count()).select_from(User)).scalar()
+        while current < target:
+            size = min(INSERT_BATCH, target - current)
+            connection.execute(
+                insert(User),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "first_name": f"First{current + i}",
+                        "last_name": f"Last{current + i}",
+                        "email": f"user{current + i}@example.com",
+                        "email_normalized": f"user{current + i}@example.com",
+                        "phone_number": f"{8_000_000 + current + i}",
+                        "country_code": "+359",
+                        "date_of_birth": date(1990, 1, 1),
+                        "country": "Bulgaria",
+                        "address": "Synthetic str. 1",
+                        "postcode": "1000",
+                        "town": "Sofia",
+                    }
+                    for i in range(size)
+                ],
+            )
+            current += size
+
+
+def measure(export_format: str, gzip: bool):
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = sum(
+        len(chunk) for chunk in iter_export(engine, "users", export_format, gzip)
+    )
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return written, elapsed, peak
+
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    checkpoints = [rows for rows in (10_000, 100_000, 1_000_000) if rows < max_rows]
+    checkpoints.append(max_rows)
+
+    for rows in checkpoints:
+        fill_users(rows)
+        for export_format, gzip in (
+            ("csv", False),
+            ("csv", True),
+            ("ndjson", False),
+            ("parquet", False),
+        ):
+            try:
+                written, elapsed, peak = measure(export_format, gzip)
+            except Exception as e:  # e.g. pyarrow missing
+                print(f"{rows:>9} rows {export_format:<8} skipped: {e}")
+                continue
+            label = export_format + (".gz" if gzip else "")
+            print(
+                f"{rows:>9} rows {label:<10} {written / 1e6:8.1f} MB "
+                f"{elapsed:6.1f} s  peak {peak / 1e6:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark: car picker searches in the fleet index vs the equivalent SQL.
+
+Inserts synthetic cars into DATABASE_URL (use a scratch database) until
+each checkpoint is reached, then runs the same searches through
+`FleetIndex.query` and through `select_cars_matching`, checks both return
+the same cars in the same order, and reports the time per search and the
+index rebuild time. Needs numpy.
+
+    python scripts/bench_fleet_filter.py [checkpoints]   # default 10000,100000
+"""
+
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from crud.cars import select_cars_matching  # noqa: E402
+from database.session import Session, engine  # noqa: E402
+from models.car import Car  # noqa: E402
+from models.enums import (  # noqa: E402
+    CarGearboxEnum,
+    DriveTypeEnum,
+    RollcageTypeEnum,
+    SeatsCountEnum,
+)
+from schemas.car import CarResponse, CarSearch  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+from utils.fleet_index import FleetIndex  # noqa: E402
+
+INSERT_BATCH = 10_000
+ITERATIONS = 20
+
+SEARCHES = {
+    "hp range": CarSearch(min_hp=300, max_hp=500),
+    "4 ranges + enums": CarSearch(
+        min_hp=250,
+        max_acceleration=5.5,
+        max_weight=1500,
+        max_price_for_lap=300,
+        drive=[DriveTypeEnum.RWD, DriveTypeEnum.AWD],
+        gearbox=[CarGearboxEnum.MANUAL],
+        available_only=True,
+    ),
+    "top 20 power/weight": CarSearch(
+        sort_by="power_to_weight", descending=True, limit=20
+    ),
+    "filtered top 10 cheap": CarSearch(
+        min_power_to_weight=200,
+        rollcage_type=[RollcageTypeEnum.SIX_POINT, RollcageTypeEnum.EIGHT_POINT],
+        sort_by="price_for_lap",
+        limit=10,
+    ),
+    "sort all by 0-100": CarSearch(sort_by="acceleration"),
+}
+
+
+def synthetic_car(number: int) -> dict:
+    hp = random.randint(90, 800)
+    return {
+        "id": uuid.uuid4(),
+        "image": f"bench-car-{number}-{uuid.uuid4().hex[:8]}.jpg",
+        "make": "Bench",
+        "model": f"Model {number}",
+        "engine_type": "2.0-4cyl turbo",
+        "hp": hp,
+        "nm": hp + random.randint(0, 400),
+        "acceleration": round(random.uniform(2.5, 12.0), 1),
+        "gearbox": random.choice(list(CarGearboxEnum)),
+        "drive": random.choice(list(DriveTypeEnum)),
+        "weight": random.randint(900, 2200),
+        "suspension_type": "stock",
+        "brakes_type": "performance",
+        "wheels": "18x8",
+        "tyres_type": "NS2-R",
+        "seats_type": "bucket",
+        "harness_type": "4 point",
+        "rollcage_type": random.choice(list(RollcageTypeEnum)),
+        "price_for_lap": random.randint(100, 600),
+        "seats_count": random.choice(list(SeatsCountEnum)),
+        "in_repair_shop": random.random() < 0.05,
+    }
+
+
+def fill_cars(target: int) -> None:
+    with engine.begin() as connection:
+        current = connection.execute(select(func.count()).select_from(Car)).scalar()
+        while current < target:
+            size = min(INSERT_BATCH, target - current)
+            connection.execute(
+                insert(Car), [synthetic_car(current + i) for i in range(size)]
+            )
+            current += size
+
+
+def timed(func):
+    func()  # warm up the connection, statement cache and snapshot
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        result = func()
+    return result, (time.perf_counter() - started) / ITERATIONS
+
+
+def sql_search(search: CarSearch):
+    with Session() as db:
+        return [
+            CarResponse.model_validate(car)
+            for car in db.scalars(select_cars_matching(search))
+        ]
+
+
+def main():
+    checkpoints = (
+        [int(value) for value in sys.argv[1].split(",")]
+        if len(sys.argv) > 1
+        else [10_000, 100_000]
+    )
+    index = FleetIndex(Session, enabled=True)
+    if not index.enabled:
+        sys.exit("numpy is not installed.")
+
+    for target in checkpoints:
+        fill_cars(target)
+        index.invalidate()
+        started = time.perf_counter()
+        snapshot = index.snapshot()
+        build = time.perf_counter() - started
+        print(f"\n{len(snapshot)} cars, index rebuild {build * 1000:.0f} ms")
+        print(f"{'search':<24}{'rows':>8}{'SQL ms':>10}{'index ms':>10}{'mask us':>10}")
+
+        for label, search in SEARCHES.items():
+            expected, sql_seconds = timed(lambda: sql_search(search))
+            actual, index_seconds = timed(lambda: index.query(search))
+            # Row selection alone, without building the response list
+            _, select_seconds = timed(lambda: snapshot.select(search))
+            same = [car.id for car in actual] == [car.id for car in expected]
+            print(
+                f"{label:<24}{len(actual):>8}{sql_seconds * 1000:>10.2f}"
+                f"{index_seconds * 1000:>10.3f}{select_seconds * 1e6:>10.0f}"
+                f"{'' if same else '   MISMATCH'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: partner hotel availability search against local stub servers.
+
+Starts one stub HTTP server per hotel, each answering after its own
+delay; a few are slower than the per-source timeout and a few fail.
+Then runs the aggregator and compares the search time with the sum of
+all delays (what asking the hotels one by one would cost), checks that
+slow and failing sources come back as partial results, and repeats the
+search to show the per hotel x date cache.
+
+    python scripts/bench_hotel_availability.py [hotels]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from schemas.hotel import HotelResponse  # noqa: E402
+from utils.hotel_availability import HotelAvailabilityAggregator  # noqa: E402
+
+TIMEOUT = 1.0
+
+
+def stub_handler(delay: float, fail: bool):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay)
+            if fail:
+                self.send_response(500)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = json.dumps(
+                {"available": True, "rooms": random.randint(1, 9), "price": 129.0}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_stubs(count: int):
+    hotels, delays, servers = [], [], []
+    for index in range(count):
+        # Mostly 50-600 ms, every 10th slower than the timeout, every 17th failing.
+        delay = TIMEOUT * 2 if index % 10 == 9 else random.uniform(0.05, 0.6)
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), stub_handler(delay, index % 17 == 16)
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        delays.append(delay)
+        hotels.append(
+            HotelResponse(
+                id=uuid4(),
+                image=f"hotel{index}.jpg",
+                name=f"Hotel {index}",
+                link=f"https://hotel{index}.example",
+                distance_from_track=random.uniform(1, 30),
+                availability_url=f"http://127.0.0.1:{server.server_port}/availability",
+            )
+        )
+    return hotels, delays, servers
+
+
+async def timed_search(aggregator, hotels, track_date):
+    started = time.perf_counter()
+    result = await aggregator.search(hotels, track_date)
+    return result, time.perf_counter() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    hotels, delays, servers = start_stubs(count)
+    aggregator = HotelAvailabilityAggregator(timeout=TIMEOUT, ttl=60, concurrency=count)
+    track_date = date.today()
+
+    try:
+        first, first_seconds = asyncio.run(timed_search(aggregator, hotels, track_date))
+        second, second_seconds = asyncio.run(
+            timed_search(aggregator, hotels, track_date)
+        )
+    finally:
+        aggregator.close()
+        for server in servers:
+            server.shutdown()
+
+    statuses = {}
+    for hotel in first.hotels:
+        statuses[hotel.status] = statuses.get(hotel.status, 0) + 1
+    cached = sum(hotel.cached for hotel in second.hotels)
+
+    print(f"hotels                    {count}")
+    print(f"sum of source delays      {sum(delays):8.2f} s")
+    print(f"slowest answering source  {max(d for d in delays if d < TIMEOUT):8.2f} s")
+    print(
+        f"parallel search           {first_seconds:8.2f} s   {statuses}, complete={first.complete}"
+    )
+    print(
+        f"repeated search           {second_seconds:8.3f} s   {cached} answers from cache"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: request throughput during a 404 flood, by logging setup.
+
+Calls a sync endpoint that logs a warning and raises a 404, in-process
+through the ASGI interface (no network, no database), and compares:
+  - the old setup: f-string messages through a StreamHandler writing
+    synchronously on the request thread,
+  - setup_logging(): %-style messages through the queue handler, the
+    rate limit filter and the background JSON writer.
+
+Log output goes to a file so the terminal does not dominate the timing.
+
+    python scripts/bench_logging_404_flood.py [requests] [log-file]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from fastapi import FastAPI, HTTPException  # noqa: E402
+from utils.request_id import RequestIDMiddleware  # noqa: E402
+
+logger = logging.getLogger("bench.cars")
+
+
+def build_app(lazy_messages: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/cars/{car_id}")
+    def get_car(car_id: int):
+        if lazy_messages:
+            logger.warning("Car with ID %s does not exist.", car_id)
+        else:
+            logger.warning(f"Car with ID {car_id} does not exist.")
+        raise HTTPException(
+            status_code=404, detail=f"Car with ID {car_id} does not exist."
+        )
+
+    app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+async def call(app, path: str):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, requests: int, concurrency: int = 32) -> float:
+    async def client(offset: int):
+        for i in range(offset, requests, concurrency):
+            await call(app, f"/cars/{i}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(offset) for offset in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    log_file = sys.argv[2] if len(sys.argv) > 2 else "bench_404_flood.log"
+    stream = open(log_file, "w")
+    root = logging.getLogger()
+
+    # Old setup: synchronous writes on the request thread.
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    )
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+    old = asyncio.run(measure(build_app(lazy_messages=False), requests))
+
+    # New setup, writing to the same file.
+    sys.stderr = stream
+    from core.logging_config import setup_logging
+
+    setup_logging()
+    new = asyncio.run(measure(build_app(lazy_messages=True), requests))
+    sys.stderr = sys.__stderr__
+
+    print(f"{'synchronous StreamHandler':<28} {old:10.0f} requests/s")
+    print(
+        f"{'queue + rate limit + JSON':<28} {new:10.0f} requests/s  {(new / old - 1) * 100:+6.1f} %"
+    )
+
+
+if __name__ == "__main__":
+    main()
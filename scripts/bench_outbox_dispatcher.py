@@ -0,0 +1,107 @@
+"""
+Benchmark: outbox dispatcher throughput and checkout-to-charge latency.
+
+Creates N checkouts against DATABASE_URL (needs at least one car), drains the
+outbox with the fake payment provider and reports messages per second and
+the latency percentiles between checkout and charge. Then replays every
+checkout to check that no payment is charged twice.
+
+    PAYMENT_PROVIDER=fake python scripts/bench_outbox_dispatcher.py [count] [batch_size]
+"""
+
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from crud.booking import BookingRepository  # noqa: E402
+from crud.cars import SELECT_ALL_CARS  # noqa: E402
+from crud.payments import get_payment_provider  # noqa: E402
+from database.session import Session  # noqa: E402
+from models.enums import OutboxStatusEnum, Package  # noqa: E402
+from models.outbox import OutboxMessage  # noqa: E402
+from schemas.booking import CheckoutRequest  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from utils.outbox import OutboxDispatcher  # noqa: E402
+
+
+def checkout_all(requests):
+    db = Session()
+    try:
+        repo = BookingRepository(db_session=db)
+        for key, request in requests:
+            repo.checkout(request=request, idempotency_key=key)
+    finally:
+        db.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    db = Session()
+    car_id = db.scalars(SELECT_ALL_CARS).first().id
+    db.close()
+
+    run = uuid.uuid4().hex[:8]
+    requests = [
+        (
+            f"bench-{run}-{i}",
+            CheckoutRequest(
+                car_id=car_id,
+                track_date=date.today() + timedelta(days=30),
+                laps=1 + i % 4,
+                package=Package.BASE_PACKAGE,
+            ),
+        )
+        for i in range(count)
+    ]
+
+    started = time.perf_counter()
+    checkout_all(requests)
+    print(f"checkout: {count / (time.perf_counter() - started):8.0f} bookings/s")
+
+    dispatcher = OutboxDispatcher(Session, batch_size=batch_size)
+    started = time.perf_counter()
+    while dispatcher.run_once():
+        pass
+    elapsed = time.perf_counter() - started
+    print(f"dispatch: {count / elapsed:8.0f} messages/s (batch size {batch_size})")
+
+    db = Session()
+    latencies = sorted(
+        (message.processed_at - message.created_at).total_seconds() * 1000
+        for message in db.scalars(
+            select(OutboxMessage).where(
+                OutboxMessage.status == OutboxStatusEnum.SENT,
+                OutboxMessage.idempotency_key.in_(
+                    select(OutboxMessage.idempotency_key)
+                    .order_by(OutboxMessage.created_at.desc())
+                    .limit(count)
+                ),
+            )
+        )
+    )
+    db.close()
+    if latencies:
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(
+            f"latency:  p50 {statistics.median(latencies):.0f} ms, "
+            f"p95 {p95:.0f} ms, max {latencies[-1]:.0f} ms"
+        )
+
+    payment_provider = get_payment_provider()
+    charges = len(payment_provider.charges)
+    checkout_all(requests)
+    while dispatcher.run_once():
+        pass
+    assert len(payment_provider.charges) == charges, "replayed checkout charged twice"
+    print(f"replay:   {count} retried checkouts, 0 extra charges")
+
+
+if __name__ == "__main__":
+    main()
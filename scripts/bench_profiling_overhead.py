@@ -0,0 +1,91 @@
+"""
+Benchmark: cost of the profiling hooks on requests that are not profiled.
+
+Calls a small sync endpoint in-process through the ASGI interface (no
+network, no database) and compares:
+  - plain FastAPI routes, what the app uses when profiling is not configured,
+  - ProfiledRoute without the middleware,
+  - ProfiledRoute with ProfilingMiddleware installed at sample rate 0,
+  - the same with every request profiled, for reference.
+
+    python scripts/bench_profiling_overhead.py [requests]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from fastapi import APIRouter, FastAPI  # noqa: E402
+from utils.profiling import ProfiledRoute, ProfilingMiddleware  # noqa: E402
+
+
+def build_app(route_class=None, sample_rate=None) -> FastAPI:
+    router = APIRouter(route_class=route_class) if route_class else APIRouter()
+
+    @router.get("/cars/{car_id}")
+    def get_car(car_id: int):
+        return {"id": car_id, "make": "BMW", "model": "M2", "hp": 460}
+
+    app = FastAPI()
+    app.include_router(router)
+    if sample_rate is not None:
+        app.add_middleware(ProfilingMiddleware, sample_rate=sample_rate)
+    return app
+
+
+async def call(app, path: str):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app, requests: int) -> float:
+    for _ in range(200):  # warm-up
+        await call(app, "/cars/1")
+    started = time.perf_counter()
+    for i in range(requests):
+        await call(app, f"/cars/{i}")
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    cases = (
+        ("plain routes", build_app()),
+        ("ProfiledRoute, no middleware", build_app(ProfiledRoute)),
+        ("ProfiledRoute + middleware, rate 0", build_app(ProfiledRoute, 0.0)),
+        ("every request profiled", build_app(ProfiledRoute, 1.0)),
+    )
+
+    baseline = None
+    for label, app in cases:
+        per_request = asyncio.run(measure(app, requests))
+        baseline = baseline or per_request
+        overhead = (per_request / baseline - 1) * 100
+        print(f"{label:<36} {per_request:8.1f} us/request  {overhead:+6.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Microbenchmark: per-query CPU time of the car/hotel lookups.
+
+Compares the old `db.query(Model).filter(...).first()` pattern with the cached
+`lambda_stmt`/`select()` constructs used by the repositories. Runs against
+DATABASE_URL and needs at least one car and one hotel in the tables.
+
+    python scripts/bench_repository_queries.py [iterations]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from crud.cars import SELECT_ALL_CARS, select_car_by_id  # noqa: E402
+from crud.hotels import SELECT_ALL_HOTELS, select_hotel_by_id  # noqa: E402
+from database.session import Session  # noqa: E402
+from models.car import Car  # noqa: E402
+from models.hotel import Hotel  # noqa: E402
+
+
+def measure(label, func, iterations):
+    func()  # populate caches and the connection
+    started = time.process_time()
+    for _ in range(iterations):
+        func()
+    per_query = (time.process_time() - started) / iterations * 1e6
+    print(f"{label:<32} {per_query:8.1f} us CPU/query")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    db = Session()
+    try:
+        car_id = db.scalars(SELECT_ALL_CARS).first().id
+        hotel_id = db.scalars(SELECT_ALL_HOTELS).first().id
+
+        cases = (
+            (
+                "car by id / query()",
+                lambda: db.query(Car).filter(Car.id == car_id).first(),
+            ),
+            (
+                "car by id / lambda_stmt",
+                lambda: db.scalars(select_car_by_id(car_id)).first(),
+            ),
+            ("cars list / query()", lambda: db.query(Car).all()),
+            ("cars list / cached select", lambda: db.scalars(SELECT_ALL_CARS).all()),
+            (
+                "hotel by id / query()",
+                lambda: db.query(Hotel).filter(Hotel.id == hotel_id).first(),
+            ),
+            (
+                "hotel by id / lambda_stmt",
+                lambda: db.scalars(select_hotel_by_id(hotel_id)).first(),
+            ),
+            ("hotels list / query()", lambda: db.query(Hotel).all()),
+            (
+                "hotels list / cached select",
+                lambda: db.scalars(SELECT_ALL_HOTELS).all(),
+            ),
+        )
+        for label, func in cases:
+            measure(label, func, iterations)
+            db.expunge_all()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark: development server vs the production launcher.
+
+Starts the app once as `uvicorn main:app --reload` (one process, file
+watcher, default loop and parser) and once through `server.py`, then
+drives each with keep-alive HTTP/1.1 connections and reports requests per
+second and latency percentiles. Needs the app's usual environment
+(.env, Google service account); the default path /metrics needs no
+database.
+
+    python scripts/bench_server_modes.py [path] [connections] [seconds]
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "src")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start(mode: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, SERVER_HOST="127.0.0.1", SERVER_PORT=str(port))
+    if mode == "dev":
+        command = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--reload",
+            "--port",
+            str(port),
+        ]
+    else:
+        command = [sys.executable, "server.py"]
+    return subprocess.Popen(command, cwd=SRC, env=env, stdout=subprocess.DEVNULL)
+
+
+async def wait_until_up(port: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+async def read_response(reader: asyncio.StreamReader) -> None:
+    headers = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in headers.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+
+
+async def client(
+    port: int, path: str, until: float, latencies: list, resets: list
+) -> None:
+    request = f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+    while time.monotonic() < until:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            while time.monotonic() < until:
+                started = time.perf_counter()
+                writer.write(request)
+                await read_response(reader)
+                latencies.append(time.perf_counter() - started)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # A recycled worker (SERVER_MAX_REQUESTS) closes its
+            # connections; reconnect like a load balancer would.
+            resets.append(time.monotonic())
+        finally:
+            writer.close()
+
+
+async def load(port: int, path: str, connections: int, seconds: float):
+    await wait_until_up(port)
+    # Let all workers finish starting up before measuring.
+    await asyncio.sleep(3)
+    latencies: list = []
+    resets: list = []
+    until = time.monotonic() + seconds
+    await asyncio.gather(
+        *(client(port, path, until, latencies, resets) for _ in range(connections))
+    )
+    latencies.sort()
+    return (
+        len(latencies) / seconds,
+        latencies[len(latencies) // 2] * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000,
+        len(resets),
+    )
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "/metrics"
+    connections = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 15
+
+    for mode in ("dev", "prod"):
+        port = free_port()
+        process = start(mode, port)
+        try:
+            rps, p50, p99, resets = asyncio.run(load(port, path, connections, seconds))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        print(
+            f"{mode:<6} {rps:10.0f} requests/s   p50 {p50:7.2f} ms"
+            f"   p99 {p99:7.2f} ms   {resets} reconnects"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Benchmark: customer lookup latency and dedup throughput.
+
+Inserts synthetic users into DATABASE_URL (use a scratch database, migrated
+with scripts/migrate.py) up to the target count; about 1% are repeat
+customers who used another email with the same phone and name, typed in a
+different notation. Then reports:
+  - lookup latency by email (any case) and phone through the normalized,
+    indexed columns, next to the same lookups on the raw columns,
+  - that concurrent find_or_create calls for one new customer create one row,
+  - dedup throughput of the in-memory pass and of the whole job.
+
+    python scripts/bench_user_lookup.py [users]   # default 1,000,000
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from crud.users import UserRepository  # noqa: E402
+from database.session import Session, engine  # noqa: E402
+from models.user import User  # noqa: E402
+from schemas.user import UserCreate  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+from utils.contacts import normalize_email, normalize_phone  # noqa: E402
+from utils.user_dedup import dedup_users, find_duplicates  # noqa: E402
+
+INSERT_BATCH = 10_000
+LOOKUPS = 2_000
+SCAN_LOOKUPS = 20
+
+
+def synthetic_user(number: int) -> dict:
+    phone = f"0888{number:07d}"
+    first_name, last_name = f"First{number}", f"Last{number}"
+    email = f"user{number}@example.com"
+    if number % 100 == 99:
+        # Repeat customer of `number - 1`: other email, same phone and name
+        original = number - 1
+        phone = f"+359 888 {original:07d}"
+        first_name, last_name = f"first{original}", f"LAST{original}"
+        email = f"User{original}.Work@Example.com"
+    return {
+        "id": uuid.uuid4(),
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "email_normalized": normalize_email(email),
+        "phone_number": phone,
+        "country_code": "+359",
+        "phone_e164": normalize_phone(phone, "+359"),
+        "date_of_birth": date(1990, 1, 1),
+        "country": "Bulgaria",
+        "address": "Synthetic str. 1",
+        "postcode": "1000",
+        "town": "Sofia",
+    }
+
+
+def fill_users(target: int) -> int:
+    with engine.begin() as connection:
+        current = connection.execute(select(func.count()).select_from(User)).scalar()
+        while current < target:
+            size = min(INSERT_BATCH, target - current)
+            connection.execute(
+                insert(User), [synthetic_user(current + i) for i in range(size)]
+            )
+            current += size
+    return current
+
+
+def latency(label: str, lookup, users: int, count: int):
+    timings = []
+    with Session() as db:
+        for number in random.sample(range(users), count):
+            started = time.perf_counter()
+            lookup(db, number)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(
+        f"{label:<36} p50 {statistics.median(timings):8.3f} ms"
+        f"   p99 {timings[int(len(timings) * 0.99) - 1]:8.3f} ms"
+    )
+
+
+def concurrent_find_or_create(threads: int = 16) -> int:
+    details = synthetic_user(10**9)
+    details["email"] = f"new-{uuid.uuid4().hex}@example.com"
+    customer = UserCreate(**details)
+
+    def checkout(_):
+        with Session() as db:
+            user_id = UserRepository(db_session=db).find_or_create(customer).id
+            db.commit()
+            return user_id
+
+    with ThreadPoolExecutor(threads) as pool:
+        return len(set(pool.map(checkout, range(threads))))
+
+
+def main():
+    target = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    started = time.perf_counter()
+    users = fill_users(target)
+    print(f"{users:,} users ready in {time.perf_counter() - started:.0f} s\n")
+
+    latency(
+        "email, normalized index",
+        lambda db, n: UserRepository(db).find_by_email(f"USER{n}@Example.com"),
+        users,
+        LOOKUPS,
+    )
+    latency(
+        "email, lower(email) scan",
+        lambda db, n: db.scalars(
+            select(User).where(func.lower(User.email) == f"user{n}@example.com")
+        ).first(),
+        users,
+        SCAN_LOOKUPS,
+    )
+    latency(
+        "phone, E.164 index",
+        lambda db, n: UserRepository(db).find_by_phone(f"0888 {n:07d}", "+359"),
+        users,
+        LOOKUPS,
+    )
+    latency(
+        "phone, raw column scan",
+        lambda db, n: db.scalars(
+            select(User).where(User.phone_number == f"0888{n:07d}")
+        ).all(),
+        users,
+        SCAN_LOOKUPS,
+    )
+
+    created = concurrent_find_or_create()
+    print(f"\n16 concurrent find_or_create, same new customer: {created} row(s)")
+
+    keys = ("id", "email_normalized", "phone_e164", "first_name", "last_name")
+    rows = [
+        tuple(user[key] for key in keys)
+        for user in (synthetic_user(number) for number in range(users))
+    ]
+    rows.sort(key=lambda row: row[0])
+    started = time.perf_counter()
+    merges = find_duplicates(rows)
+    seconds = time.perf_counter() - started
+    print(
+        f"in-memory dedup pass: {len(rows):,} users, {len(merges):,} duplicates,"
+        f" {len(rows) / seconds:,.0f} users/s"
+    )
+
+    result = dedup_users(engine)
+    print(
+        f"dedup job: {result.users:,} users, {result.merged:,} merged,"
+        f" {result.users / result.seconds:,.0f} users/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
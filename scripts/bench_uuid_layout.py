@@ -0,0 +1,130 @@
+"""
+Benchmark: insert throughput and index size of UUID4 vs UUIDv7 keys.
+
+Creates three scratch tables shaped like `transaction` in DATABASE_URL (use
+a scratch database): random UUID4 keys (the old layout), UUIDv7 keys, and
+UUIDv7 keys with monthly partitions. Inserts the same rows into each in
+batches and reports the throughput of the first and last tenth of the
+rows, the total time and the size of the table and its indexes. UUID4
+inserts slow down once the key index outgrows shared_buffers, because
+every insert touches a random leaf page.
+
+    python scripts/bench_uuid_layout.py [rows]   # default 2,000,000
+"""
+
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from database.partitions import ensure_partitions  # noqa: E402
+from database.session import engine  # noqa: E402
+from models.base import monthly_partitions, uuid7  # noqa: E402
+from sqlalchemy import (  # noqa: E402
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    insert,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID  # noqa: E402
+
+BATCH = 10_000
+
+metadata = MetaData()
+
+
+def bench_table(name: str, partitioned: bool) -> Table:
+    # Same columns and indexes as BaseMixin + Transaction
+    return Table(
+        name,
+        metadata,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("amount", Integer, nullable=False),
+        Column("provider_reference", String, nullable=False, unique=not partitioned),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Index(f"ix_{name}_id", "id", unique=True),
+        **(monthly_partitions("provider_reference") if partitioned else {}),
+    )
+
+
+LAYOUTS = (
+    ("uuid4", bench_table("bench_keys_uuid4", False), uuid.uuid4),
+    ("uuid7", bench_table("bench_keys_uuid7", False), uuid7),
+    ("uuid7 partitioned", bench_table("bench_keys_uuid7_part", True), uuid7),
+)
+
+
+def sizes(connection, table: Table):
+    # pg_partition_tree returns nothing for a plain table, so the table
+    # itself is added; a partitioned parent has no storage of its own.
+    return connection.execute(
+        text(
+            "SELECT CAST(sum(pg_table_size(relid)) AS bigint),"
+            " CAST(sum(pg_indexes_size(relid)) AS bigint)"
+            " FROM (SELECT relid FROM pg_partition_tree(:name)"
+            " UNION SELECT CAST(:name AS regclass)) AS tree"
+        ),
+        {"name": table.name},
+    ).one()
+
+
+def run(table: Table, make_id, rows: int):
+    batches = rows // BATCH
+    tenth = max(1, batches // 10)
+    durations = []
+    for number in range(batches):
+        values = [
+            {
+                "id": make_id(),
+                "amount": 100 + number % 500,
+                "provider_reference": f"ref_{uuid.uuid4().hex}",
+            }
+            for _ in range(BATCH)
+        ]
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(insert(table), values)
+        durations.append(time.perf_counter() - started)
+
+    first = tenth * BATCH / sum(durations[:tenth])
+    last = tenth * BATCH / sum(durations[-tenth:])
+    return first, last, sum(durations)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        for _, table, _ in LAYOUTS:
+            if table.info.get("partitioned_by_month"):
+                ensure_partitions(connection, table, months_ahead=1)
+
+    print(f"{rows:,} rows in batches of {BATCH:,}")
+    print(
+        f"{'layout':<20}{'first 10% rows/s':>18}{'last 10% rows/s':>18}"
+        f"{'total s':>10}{'table MB':>10}{'index MB':>10}"
+    )
+    try:
+        for label, table, make_id in LAYOUTS:
+            first, last, total = run(table, make_id, rows)
+            with engine.begin() as connection:
+                table_size, index_size = sizes(connection, table)
+            print(
+                f"{label:<20}{first:>18,.0f}{last:>18,.0f}{total:>10.1f}"
+                f"{table_size / 1e6:>10.1f}{index_size / 1e6:>10.1f}"
+            )
+    finally:
+        metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: memory use of the lap video upload path.
+
+Pushes a synthetic video through the same steps as `PUT /videos/{id}/parts/{n}`
+(request body chunks -> spooled temporary file -> S3 upload_part), several
+parts in parallel, then completes the upload and checks a ranged GET on the
+presigned link. Reports throughput, the peak Python heap and the peak RSS,
+which should stay flat whatever the file size.
+
+Runs against S3_ENDPOINT_URL, e.g. a local MinIO or moto server:
+
+    docker run -p 9000:9000 minio/minio server /data    # or: moto_server -p 9000
+    S3_ENDPOINT_URL=http://127.0.0.1:9000 AWS_ACCESS_KEY_ID=minioadmin \\
+        AWS_SECRET_ACCESS_KEY=minioadmin python scripts/bench_video_upload.py [GiB] [parallel]
+"""
+
+import asyncio
+import os
+import resource
+import sys
+import time
+import tracemalloc
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from core.config import S3_BUCKET, S3_REGION  # noqa: E402
+from utils import storage  # noqa: E402
+
+# Size of the body chunks an ASGI server hands to the application
+CHUNK = os.urandom(64 * 1024)
+
+
+async def body(size: int):
+    sent = 0
+    while sent < size:
+        chunk = CHUNK[: min(len(CHUNK), size - sent)]
+        sent += len(chunk)
+        yield chunk
+        await asyncio.sleep(0)
+
+
+async def upload_part(key, upload_id, part_number, size, limit):
+    async with limit:
+        spool, received, md5 = await storage.spool_stream(body(size))
+        try:
+            await asyncio.to_thread(
+                storage.upload_part, key, upload_id, part_number, spool, received, md5
+            )
+        finally:
+            spool.close()
+
+
+async def upload(size: int, parallel: int):
+    key = f"bench/{int(time.time())}/original"
+    part_size = storage.part_size_for(size)
+    part_count = -(-size // part_size)
+    upload_id = storage.create_multipart_upload(key, "video/mp4")
+
+    limit = asyncio.Semaphore(parallel)
+    sizes = [min(part_size, size - offset) for offset in range(0, size, part_size)]
+    await asyncio.gather(
+        *(
+            upload_part(key, upload_id, number, part, limit)
+            for number, part in enumerate(sizes, start=1)
+        )
+    )
+    storage.complete_multipart_upload(
+        key, upload_id, storage.list_parts(key, upload_id)
+    )
+    return key, part_size, part_count
+
+
+def main():
+    gibibytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    parallel = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    size = int(gibibytes * 1024**3)
+
+    client = storage.s3_client()
+    try:
+        client.create_bucket(
+            Bucket=S3_BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": S3_REGION},
+        )
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    key, part_size, part_count = asyncio.run(upload(size, parallel))
+    elapsed = time.perf_counter() - started
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stored = client.head_object(Bucket=S3_BUCKET, Key=key)["ContentLength"]
+    request = urllib.request.Request(
+        storage.presigned_url(key, filename="Nordschleife 7:02 – Ωmega.mp4"),
+        headers={"Range": "bytes=100-199"},
+    )
+    with urllib.request.urlopen(request) as response:
+        ranged = (response.status, len(response.read()))
+        disposition = response.headers["Content-Disposition"]
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(f"uploaded          {size / 1024**2:10.0f} MiB in {part_count} parts")
+    print(f"part size         {part_size / 1024**2:10.0f} MiB")
+    print(f"stored size ok    {stored == size}")
+    print(f"ranged GET        status {ranged[0]}, {ranged[1]} bytes")
+    print(f"disposition       {disposition}")
+    print(f"throughput        {size / 1024**2 / elapsed:10.1f} MiB/s")
+    print(
+        f"peak Python heap  {heap_peak / 1024**2:10.1f} MiB  ({parallel} parts in flight)"
+    )
+    print(f"peak RSS          {max_rss:10.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Check of the read-replica routing against two local databases.
+
+The first database stands in for the primary, the second for a replica;
+no streaming replication is needed. Each gets a marker table so a query
+shows which database it ran on. Checks, in order:
+  - reads go to the replica,
+  - a pinned client (recent write) reads from the primary,
+  - a replica lagging over the threshold is skipped,
+  - least-connections picks the replica with fewer checked out connections.
+
+    python scripts/check_replica_routing.py postgresql://localhost/nurblife_primary \
+        postgresql://localhost/nurblife_replica
+"""
+
+import os
+import sys
+import time
+
+PRIMARY_URL, REPLICA_URL = sys.argv[1], sys.argv[2]
+os.environ["DATABASE_URL"] = PRIMARY_URL
+os.environ["DB_REPLICA_URLS"] = REPLICA_URL
+os.environ["CACHE_TRANSPORT"] = "memory"
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from database.routing import (  # noqa: E402
+    PIN_COOKIE,
+    Replica,
+    ReplicaRouter,
+    get_read_db,
+    replica_router,
+)
+
+
+def mark(url: str, name: str):
+    with create_engine(url).begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS routing_marker"))
+        connection.execute(text("CREATE TABLE routing_marker (name text)"))
+        connection.execute(
+            text("INSERT INTO routing_marker VALUES (:name)"), {"name": name}
+        )
+
+
+def request(cookie: str = "") -> Request:
+    headers = [(b"cookie", cookie.encode())] if cookie else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def read_from(req: Request) -> str:
+    dependency = get_read_db(req)
+    db = next(dependency)
+    try:
+        return db.execute(text("SELECT name FROM routing_marker")).scalar()
+    finally:
+        dependency.close()
+
+
+def check(label: str, actual, expected):
+    status = "ok" if actual == expected else "FAILED"
+    print(f"{label:<44} {actual!s:<10} {status}")
+    if actual != expected:
+        sys.exit(1)
+
+
+def main():
+    mark(PRIMARY_URL, "primary")
+    mark(REPLICA_URL, "replica")
+
+    replica_router.check_lag()
+    check(
+        "lag of a database that is not replicating", replica_router.replicas[0].lag, 0.0
+    )
+    check("read without a recent write", read_from(request()), "replica")
+
+    pinned = f"{PIN_COOKIE}={int(time.time()) + 10}"
+    check("read right after a write", read_from(request(pinned)), "primary")
+    expired = f"{PIN_COOKIE}={int(time.time()) - 1}"
+    check("read after the pin expired", read_from(request(expired)), "replica")
+
+    replica_router.replicas[0].lag = replica_router.max_lag + 1
+    check("read while the replica lags", read_from(request()), "primary")
+    replica_router.check_lag()
+
+    busy = Replica("busy", create_engine(REPLICA_URL), 0)
+    idle = Replica("idle", create_engine(REPLICA_URL), 0)
+    busy.lag = idle.lag = 0
+    router = ReplicaRouter([busy, idle], strategy="least_connections")
+    held = busy.engine.connect()
+    try:
+        check("least connections", router.choose().name, "idle")
+    finally:
+        held.close()
+
+    round_robin = ReplicaRouter([busy, idle], strategy="round_robin")
+    picks = [round_robin.choose().name for _ in range(4)]
+    check("round robin", picks, ["busy", "idle", "busy", "idle"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Merge duplicate customers in DATABASE_URL (see utils/user_dedup.py).
+
+    python scripts/dedup_users.py [--dry-run]
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from database.session import engine  # noqa: E402
+from utils.user_dedup import dedup_users  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only count the duplicates"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    dedup_users(engine, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Export a table to a file with constant memory use.
+
+    python scripts/export_tables.py users users.csv
+    python scripts/export_tables.py bookings bookings.parquet --format parquet
+    python scripts/export_tables.py vouchers vouchers.ndjson.gz --format ndjson --gzip
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from database.session import engine  # noqa: E402
+from utils.exports import EXPORT_FORMATS, EXPORTABLE_TABLES, iter_export  # noqa: E402
+
+
+def export(table: str, output: str, export_format: str, gzip: bool) -> int:
+    written = 0
+    with open(output, "wb") as file:
+        for chunk in iter_export(engine, table, export_format, gzip=gzip):
+            file.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("table", choices=sorted(EXPORTABLE_TABLES))
+    parser.add_argument("output", help="Output file, '-' for stdout")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--gzip", action="store_true", help="Compress on the fly")
+    args = parser.parse_args()
+
+    if args.output == "-":
+        for chunk in iter_export(engine, args.table, args.format, gzip=args.gzip):
+            sys.stdout.buffer.write(chunk)
+        return
+
+    written = export(args.table, args.output, args.format, args.gzip)
+    print(f"Wrote {written} bytes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Apply pending schema migrations to DATABASE_URL.
+
+    python scripts/migrate.py            # apply pending migrations
+    python scripts/migrate.py --status   # list migrations and whether applied
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "src"))
+
+from database.migrations import MIGRATIONS, applied_versions, migrate  # noqa: E402
+from database.session import engine  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--status", action="store_true", help="Only list migrations")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.status:
+        with engine.begin() as connection:
+            applied = set(applied_versions(connection))
+        for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+            state = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version}  {state:<8} {migration.description}")
+        return
+
+    applied = migrate(engine)
+    print(
+        f"Applied {len(applied)} migration(s){': ' + ', '.join(applied) if applied else ''}."
+    )
+
+
+if __name__ == "__main__":
+    main()